@@ -3,14 +3,17 @@
 # Time   : 02/12/2020 10:25 pm
 # Desc   : Base class holds all the methods to interact with web applications
 from ui_automation_core.helpers.actions.action import Actions
-from ui_automation_core.helpers.actions.mouse_action import ClickMethod, MouseAction
+from ui_automation_core.helpers.actions.mouse_action import ClickMethod, DragMethod, MouseAction
 from ui_automation_core.helpers.browser.alert_action_type import AlertActionType
 from ui_automation_core.helpers.browser.browser_cookie import BrowserCookie
 from ui_automation_core.helpers.browser.browser_navigation import BrowserINavigation
 from ui_automation_core.helpers.browser.browser_window import BrowserWindow
-from ui_automation_core.helpers.scroll.scroll import Scroll
+from ui_automation_core.helpers.browser.page_ready_state import PageReadyState
+from ui_automation_core.helpers.browser.storage_state import StorageState
+from ui_automation_core.helpers.scroll.scroll import Scroll, ScrollAlignment, ScrollBehavior
 from ui_automation_core.helpers.select.select import SelectAction
 from ui_automation_core.helpers.select.select_method import SelectMethod
+from ui_automation_core.helpers.verification.element_check import ElementCheck
 from ui_automation_core.helpers.verification.verify import Verify
 from ui_automation_core.helpers.web_element.locator import Locator, ElementWaitState
 
@@ -26,16 +29,44 @@ class BasePage:
         self.context = context
         self.browser_navigation = BrowserINavigation(self.context)
 
-    def open_browser(self, url: str) -> None:
+    def open_browser(self, url: str, ready_state: PageReadyState = None, locator: str = None,
+                     timeout: int = None) -> None:
         """
-        Launches the selected webdriver with the application URL
+        Launches the selected webdriver with the application URL.
+        If `context.driver_pool` is set and the context has no driver yet, a warm driver is taken from the pool.
 
                 :param
                 -> url: application url under test
+                -> ready_state: if given, returns as soon as the page is ready according to the PageReadyState
+                        instead of waiting for the page load strategy of the driver.
+                -> locator: The string pattern of the element to wait for with PageReadyState.LOCATOR.
+                -> timeout: wait time before throwing any exception. If None, timeout defaults to 30 seconds.
                 :return:
                 -> None
         """
-        self.browser_navigation.launch_browser_with_url(url)
+        driver_pool = getattr(self.context, 'driver_pool', None)
+        if driver_pool is not None and getattr(self.context, 'driver', None) is None:
+            driver_pool.acquire(self.context)
+        if ready_state is None:
+            self.browser_navigation.launch_browser_with_url(url)
+        else:
+            self.browser_navigation.navigate(url, ready_state, locator, timeout)
+
+    def navigate_to(self, url: str, ready_state: PageReadyState = PageReadyState.LOAD, locator: str = None,
+                    timeout: int = None, idle_time: float = 0.5) -> float:
+        """
+            Navigates to the URL and waits until the page is ready according to the ready state.
+
+            :param url: URL to navigate to.
+            :param ready_state: Choose the condition from PageReadyState class. Defaults to PageReadyState.LOAD.
+                    The states other than LOAD do not wait for the `load` event and require a driver launched with
+                    the page load strategy `eager` or `none`, e.g. by DriverFactory.
+            :param locator: The string pattern of the element to wait for with PageReadyState.LOCATOR.
+            :param timeout: wait time before throwing any exception. If None, timeout defaults to 30 seconds.
+            :param idle_time: seconds without network activity for PageReadyState.NETWORK_IDLE.
+            :return: the time the navigation took in seconds
+        """
+        return self.browser_navigation.navigate(url, ready_state, locator, timeout, idle_time)
 
     def close_browser(self, all_windows: bool = False) -> None:
         """
@@ -43,11 +74,15 @@ class BasePage:
 
         :param all_windows:
                 if `True`: Quits all the browser sessions along with all the associated browser windows, tabs and pop-ups.
+                        A driver taken from `context.driver_pool` is reset and returned to the pool instead.
                 `False':  Close the current browser window having focus.
         :return:
         """
+        driver_pool = getattr(self.context, 'driver_pool', None)
         if not all_windows:
             self.browser_navigation.close_browser_active_window()
+        elif driver_pool is not None and driver_pool.owns(self.context.driver):
+            driver_pool.release(self.context)
         else:
             self.browser_navigation.close_browser_all_windows()
 
@@ -155,15 +190,61 @@ class BasePage:
          """
         return BrowserCookie(self.context).get_a_cookie(cookie_name)
 
-    def get_cookies(self) -> dict:
+    def get_cookies(self, predicate=None) -> list:
         """
         Returns a set of dictionaries, corresponding to cookies visible in the current session.
 
+        :param predicate: function taking a cookie dictionary and returning True to keep it.
+                If None, all cookies are returned.
         :return:  set of dictionaries
-        Usage:	driver.get_all_cookie()
+        Usage:	driver.get_cookies(lambda cookie: cookie[‘name’].startswith(‘ab_’))
+        """
+
+        if predicate is None:
+            return BrowserCookie(self.context).get_all_cookies()
+        return BrowserCookie(self.context).get_cookies(predicate)
+
+    def add_cookies(self, cookies):
+        """
+        Adds many cookies to the current session, in a single call on Chromium drivers.
+
+        :param cookies: iterable of cookie dictionaries with required keys - “name” and “value”
+        :return: number of cookies added
+        """
+        return BrowserCookie(self.context).add_cookies(cookies)
+
+    def delete_cookies(self, names):
+        """
+        Deletes the cookies with the given names that are visible to the current page.
+
+        :param names: iterable of cookie names
+        :return: number of cookie names deleted
+        """
+        return BrowserCookie(self.context).delete_cookies(names)
+
+    def save_storage_state(self, user, role, max_age=None, auth_cookie=None):
+        """
+                Saves the cookies, localStorage and sessionStorage of the current origin for the user and role,
+                so that later scenarios can restore them instead of logging in.
+
+                :param user: user name the state belongs to.
+                :param role: role of the user, e.g. 'admin'.
+                :param max_age: seconds the state is valid for. If None, defaults to 3600 seconds.
+                :param auth_cookie: name of the session cookie, its expiry caps the validity of the state.
+                :return: the saved state
+                """
+        return StorageState(self.context).save(user, role, max_age, auth_cookie)
+
+    def restore_storage_state(self, user, role, reload=True):
         """
+                Restores the saved state of the user and role into the browser.
 
-        return BrowserCookie(self.context).get_all_cookies()
+                :param user: user name the state belongs to.
+                :param role: role of the user.
+                :param reload: True to reload the page so that the application picks up the restored state.
+                :return: True if a valid state was restored, False if there is none or it expired
+                """
+        return StorageState(self.context).restore(user, role, reload)
 
     def get_current_window_handle(self):
         """
@@ -173,11 +254,36 @@ class BasePage:
                 """
         return BrowserWindow(self.context).get_current_window_handle()
 
-    def scroll_to_bottom(self):
+    def scroll_to_bottom(self, max_iterations=100, max_time=60, settle_time=0.3):
+        """
+                Simulates the scroll to the bottom of the page, waiting for lazily loaded content to settle
+                after each scroll.
+
+                :param max_iterations: maximum number of scrolls.
+                :param max_time: maximum time in seconds spent scrolling.
+                :param settle_time: time in seconds without network activity and DOM changes after which a load
+                        is considered complete.
+                :return: A dictionary with the keys loads, iterations, height, reached_end and elapsed
+        """
+        return Scroll(self.context).scroll_to_page_end(max_iterations, max_time, settle_time)
+
+    def iter_list_items(self, container_locator, item_locator, key_attr=None, max_items=None, timeout=None):
         """
-                Simulates the scroll to the bottom of the page
+                Harvests the rows of a virtualized or infinite list by scrolling the container step by step.
+                Rows are deduplicated by key and yielded as they arrive.
+
+                :param container_locator: web element or a locator string of the scrollable container.
+                        None to scroll the page.
+                :param item_locator: locator string of the rows, resolved within the container.
+                :param key_attr: attribute that identifies a row. If None, the row text and its offset in the list
+                        are used as the key.
+                :param max_items: maximum number of rows to yield. None for no limit.
+                :param timeout: wait time for the container before throwing any exception.
+                        If None, timeout defaults to 20 seconds.
+                :return: generator of dictionaries with the keys key, text and cells
         """
-        Scroll(self.context).scroll_to_page_end()
+        return Scroll(self.context).iter_items(container_locator, item_locator, key_attr, max_items=max_items,
+                                               timeout=timeout)
 
     def scroll_to_start(self):
         """
@@ -185,17 +291,20 @@ class BasePage:
         """
         Scroll(self.context).scroll_to_page_start()
 
-    def scroll_element_into_view(self, locator, js=True, timeout=None):
+    def scroll_element_into_view(self, locator, js=True, timeout=None, behavior=ScrollBehavior.INSTANT,
+                                 alignment=ScrollAlignment.START):
         """
-         Find element and scroll the element into view
+         Find element and scroll the element into view, unless it is already in the viewport.
 
-            :param locator:  String to find the element on webpage
+            :param locator: Web element or a locator string to find the element on webpage
             :param js: True if to perform action using execute_javascript(default), for native methods set it as False
             :param timeout: The timeout to find the element.
-                    If None, timeout defaults to 30 seconds.
-            :return: None
+                    If None, timeout defaults to 20 seconds.
+            :param behavior: Choose the animation from ScrollBehavior class, INSTANT or SMOOTH.
+            :param alignment: Choose the vertical alignment from ScrollAlignment class, e.g. ScrollAlignment.CENTER.
+            :return: True if the page was scrolled, False if the element was already in the viewport
                 """
-        Scroll(self.context).scroll_element_into_view(locator, js, timeout)
+        return Scroll(self.context).scroll_element_into_view(locator, js, timeout, behavior, alignment)
 
     def get_element(self, pattern, wait_state=ElementWaitState.PRESENT,
                     throw_exception=True, timeout=None):
@@ -351,6 +460,20 @@ class BasePage:
                 """
         return Actions(self.context).get_location(locator, wait_state, timeout)
 
+    def get_geometry(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None, use_cache=False):
+        """
+                Gets the size, location, viewport visibility and the page scroll offsets of the element
+                in a single call.
+                :param locator:  Web element or a locator string on which the action need to be performed.
+                :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+                :param timeout: wait time before throwing any exception. If None, timeout defaults to 20 seconds.
+                :param use_cache: True to reuse the geometry read earlier for the same locator string as long as
+                        there was no scroll, resize or DOM change since then.
+                :return: A dictionary with x, y, width, height, viewport_x, viewport_y, in_viewport,
+                 scroll_x and scroll_y of the element.
+                """
+        return Actions(self.context).get_geometry(locator, wait_state, timeout, use_cache)
+
     def take_screenshot(self, file_path=None, locator=None, wait_state=ElementWaitState.PRESENT,
                         timeout=None):
         """
@@ -380,6 +503,7 @@ class BasePage:
                 API_CLICK
                 JAVA_SCRIPT_CLICK
                 ACTION_CHAIN_CLICK
+                AUTO
             :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
             :param timeout: wait time before throwing any exception.
                             If None, timeout defaults to 20 seconds.
@@ -449,7 +573,8 @@ class BasePage:
         return MouseAction(self.context).move_cursor_to_element_by_offset(locator, x_offset, y_offset, wait_state,
                                                                           timeout)
 
-    def drag_and_drop(self, source, target, wait_state=ElementWaitState.PRESENT, timeout=None):
+    def drag_and_drop(self, source, target, wait_state=ElementWaitState.PRESENT, timeout=None,
+                      drag_method=DragMethod.ACTION_CHAIN):
         """
                 Drag an object and drop it onto another object. Holds down the left mouse button on the source element,
                 then moves to the target element and releases the mouse button.
@@ -459,12 +584,15 @@ class BasePage:
                 :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
                 :param timeout: wait time before throwing any exception.
                             If None, timeout defaults to 20 seconds.
+                :param drag_method: DragMethod.ACTION_CHAIN (default) to drag with the mouse,
+                            DragMethod.HTML5 for `draggable` elements using the HTML5 drag and drop events.
                 :return: self
                 """
-        return MouseAction(self.context).drag_and_drop_to_object(source, target, wait_state, timeout)
+        return MouseAction(self.context).drag_and_drop_to_object(source, target, wait_state, timeout, drag_method)
 
     def drag_and_drop_by_offset(self, src_locator, x_offset, y_offset,
-                                wait_state=ElementWaitState.PRESENT, timeout=None):
+                                wait_state=ElementWaitState.PRESENT, timeout=None,
+                                drag_method=DragMethod.ACTION_CHAIN):
         """
                Drag an object and drop it to an offset location. Holds down the left mouse button on the source element,
                then moves to the target offset and releases the mouse button.
@@ -473,11 +601,29 @@ class BasePage:
                :param x_offset: X offset to move to
                :param y_offset: Y offset to move to.
                :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+               :param timeout: wait time before throwing any exception.
+                           If None, timeout defaults to 20 seconds.
+               :param drag_method: DragMethod.ACTION_CHAIN (default) to drag with the mouse,
+                           DragMethod.HTML5 for `draggable` elements using the HTML5 drag and drop events.
+               :return: self
+               """
+        return MouseAction(self.context).drag_and_drop_by_offset(src_locator, x_offset, y_offset, wait_state, timeout,
+                                                                 drag_method)
+
+    def play_gesture(self, gesture, locator=None, speed=1.0, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+               Replays a recorded pointer gesture as a single batched action sequence.
+
+               :param gesture: Gesture instance or the path of a gesture file written by Gesture.save.
+               :param locator: Web element or a locator string whose centre is the gesture origin.
+                           If None, the gesture starts at the current mouse position.
+               :param speed: Replay speed factor. 2.0 replays twice as fast, 0 replays without pauses.
+               :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
                :param timeout: wait time before throwing any exception.
                            If None, timeout defaults to 20 seconds.
                :return: self
                """
-        return MouseAction(self.context).drag_and_drop_by_offset(src_locator, x_offset, y_offset, wait_state, timeout)
+        return MouseAction(self.context).play_gesture(gesture, locator, speed, wait_state, timeout)
 
     def select_checkbox(self, locator, is_select, wait_state=ElementWaitState.PRESENT,
                         timeout=None):
@@ -494,8 +640,21 @@ class BasePage:
                """
         return SelectAction(self.context).select_checkbox(locator, is_select, wait_state, timeout)
 
+    def set_checkboxes(self, states, timeout=None):
+        """
+               Bring many checkboxes to the requested state, clicking only the ones whose state differs.
+
+               :param states: A dictionary of web element or locator string to the boolean state to set.
+               :param timeout: wait time for all checkboxes to be present before throwing any exception.
+                           If None, timeout defaults to 20 seconds.
+               :return: self
+
+               USAGE: set_checkboxes({'#read': True, '#write': False})
+               """
+        return SelectAction(self.context).set_checkboxes(states, timeout)
+
     def select_option(self, locator, select_by, is_select, values=None,
-                      wait_state=ElementWaitState.PRESENT, timeout=None):
+                      wait_state=ElementWaitState.PRESENT, timeout=None, bulk=False):
         """
                 Select an option or list of options at the given index, value or visible text.
 
@@ -506,6 +665,8 @@ class BasePage:
                 :param values: A list of single or multiple indices, values or visible texts.
                 :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
                 :param timeout: wait time before throwing any exception. If None, timeout defaults to 20 seconds.
+                :param bulk: True to select/deselect all the values browser-side in one pass with a single
+                 `change` event. If any value matches no option, nothing is changed and an error is raised.
                 :return: self
 
                 USAGE:  select_dropdown('#dropdown', SelectMethod.VALUE, True, ['Option One'])\n
@@ -513,7 +674,7 @@ class BasePage:
                         select_dropdown('#dropdown', SelectMethod.INDEX, True, [1, 2])
                 """
         return SelectAction(self.context).select_dropdown(locator, select_by, is_select, values,
-                                                          wait_state, timeout)
+                                                          wait_state, timeout, bulk)
 
     def select_option_by_index(self, locator, is_select, values=None, select_by=SelectMethod.INDEX,
                                wait_state=ElementWaitState.PRESENT, timeout=None):
@@ -583,6 +744,18 @@ class BasePage:
                 """
         return SelectAction(self.context).get_all_dropdown_options(locator, wait_state, timeout)
 
+    def get_dropdown_options_details(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+                Get the text, value, index, selected and disabled state of all options belonging to this select tag
+                in a single call.
+
+                :param locator:  Web element or a locator string on which the action need to be performed.
+                :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+                :param timeout: wait time before throwing any exception. If None, timeout defaults to 20 seconds.
+                :return: Returns a list of dictionaries with the keys text, value, index, selected and disabled
+                """
+        return SelectAction(self.context).get_dropdown_options_details(locator, wait_state, timeout)
+
     def get_dropdown_first_option_selected(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None):
         """
                 Get the first dropdown option selected
@@ -618,19 +791,19 @@ class BasePage:
 
     def verify_alert_not_present(self, timeout=None):
         """
-               Verify if alert does not present
+               Verify if alert does not present. The check returns immediately when there is no grace period.
 
-               :param timeout: wait time before throwing any exception.
-                           If None, timeout is set to default timeout.
+               :param timeout: grace period in seconds during which an alert showing up fails the check.
+                           If None, there is no grace period.
                :return: True if alert does not present else False.
                """
         return Verify(self.context).is_alert_not_present(timeout)
 
     def verify_alert_present(self, timeout=None):
         """
-               Verify if alert does present
+               Verify if alert does present. The check returns as soon as the alert is found.
 
-               :param timeout: wait time before throwing any exception.
+               :param timeout: wait time for the alert to show up.
                            If None, timeout is set to default timeout.
                :return: True if alert does present else False.
                """
@@ -688,6 +861,66 @@ class BasePage:
                """
         return Verify(self.context).are_all_links_accessible()
 
+    def get_links_status_report(self):
+        """
+               Checks all links (URLs) on the current page concurrently and reports the status of each of them.
+               :return: A dictionary of normalized URL to a dictionary with the keys status_code, ok, method,
+                error and elapsed
+               """
+        return Verify(self.context).get_links_status_report()
+
+    def verify_all(self, expectations, timeout=None):
+        """
+                Verify many element expectations at once, evaluated browser-side in a single call per poll
+                until they all pass or the timeout expires.
+
+                :param expectations: list of (locator, check, expected) tuples, check is an instance of
+                        ElementCheck enum class e.g. ElementCheck.VISIBLE, ElementCheck.TEXT
+                :param timeout: wait time for all expectations to pass.
+                            If None, timeout is set to default timeout.
+                :return: A dictionary with the keys passed, polls, elapsed and results (one per expectation)
+                """
+        return Verify(self.context).check_all(expectations, timeout)
+
+    def verify_layout_matches_baseline(self, scope_locator, baseline_path, position_tolerance=2, size_tolerance=2,
+                                       update=False, timeout=None):
+        """
+                Verify that the layout (rects, visibility and key styles) of the elements under the scope
+                matches the baseline file. The baseline is written if it does not exist yet.
+
+                :param scope_locator: web element or a locator string of the element whose subtree is compared.
+                :param baseline_path: Path+filename.npz of the baseline.
+                :param position_tolerance: allowed difference of x and y in pixels.
+                :param size_tolerance: allowed difference of width and height in pixels.
+                :param update: True to overwrite the baseline with the current layout.
+                :param timeout: wait time before throwing any exception.
+                            If None, timeout is set to default timeout.
+                :return: True if the layout matches the baseline else False.
+                """
+        return Verify(self.context).layout_matches_baseline(scope_locator, baseline_path, position_tolerance,
+                                                            size_tolerance, update, timeout)
+
+    def verify_screenshot_matches(self, baseline_path, locator=None, ignore_locators=None, tolerance=0,
+                                  max_diff_ratio=0.0, diff_path=None, update=False, timeout=None):
+        """
+                Verify that the screenshot of the page or of an element matches the baseline image.
+                The baseline is written if it does not exist yet.
+
+                :param baseline_path: Path+filename.png of the baseline.
+                :param locator: web element or a locator string whose screenshot is compared.
+                        Default: None - To compare the screenshot of the page.
+                :param ignore_locators: list of web elements or locator strings of regions to ignore.
+                :param tolerance: allowed difference per channel, a number or a (red, green, blue) tuple.
+                :param max_diff_ratio: allowed ratio of differing pixels, 0.0 to 1.0.
+                :param diff_path: Path+filename.png where the diff heatmap is saved when the check fails.
+                :param update: True to overwrite the baseline with the current screenshot.
+                :param timeout: wait time before throwing any exception.
+                            If None, timeout is set to default timeout.
+                :return: True if the screenshot matches the baseline else False.
+                """
+        return Verify(self.context).screenshot_matches(baseline_path, locator, ignore_locators, tolerance,
+                                                       max_diff_ratio, diff_path, update, timeout)
+
     def verify_element_text(self, locator, text, timeout=None):
         """
                 Verify text of an element.
@@ -5,7 +5,9 @@ from pathlib import Path
 from selenium.webdriver import ActionChains
 from selenium.webdriver.remote.webelement import WebElement
 
-from ui_automation_core.helpers.web_element.locator import Locator
+from ui_automation_core.helpers.actions.geometry import GeometryCache
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.web_element.stale_retry import StaleElementRetry
 from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
 
 
@@ -31,15 +33,8 @@ class Actions:
 
         outer_html = None
         try:
-
-            if isinstance(locator, WebElement):
-                outer_html = locator.get_attribute('outerHTML')
-                element_text = locator.text
-
-            else:
-                element = Locator(self.context).get_element(locator, wait_state, True, timeout)
-                outer_html = element.get_attribute('outerHTML')
-                element_text = element.text
+            outer_html, element_text = StaleElementRetry(self.context).run(
+                locator, lambda element: (element.get_attribute('outerHTML'), element.text), wait_state, timeout)
 
             self.context.logger.info(f'Successfully performed get text on `{outer_html}` html.'
                                      f'Text obtained `{element_text}` ')
@@ -66,22 +61,18 @@ class Actions:
         :return: self
         """
         field_name = None
+
+        def _set_text(element):
+            nonlocal field_name
+            field_name = element.get_attribute('name')
+            if clear_text:
+                element.clear()
+                self.context.logger.info(
+                    f'Successfully cleared the text from input field `Input Field Name: {field_name}`.')
+            element.send_keys(text)
+
         try:
-            if isinstance(locator, WebElement):
-                field_name = locator.get_attribute('name')
-                if clear_text:
-                    locator.clear()
-                    self.context.logger.info(
-                        f'Successfully cleared the text from input field `Input Field Name: {field_name}`.')
-                locator.send_keys(text)
-            else:
-                element = Locator(self.context).get_element(locator, wait_state, True, timeout)
-                field_name = element.get_attribute('name')
-                if clear_text:
-                    element.clear()
-                    self.context.logger.info(
-                        f'Successfully cleared the text from input field `Input Field Name: {field_name}`.')
-                element.send_keys(text)
+            StaleElementRetry(self.context).run(locator, _set_text, wait_state, timeout)
             self.context.logger.info(
                 f'Successfully entered the text \'{text}\' in the input field `Input Field Name:{field_name}`')
             return self
@@ -107,10 +98,8 @@ class Actions:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            element.submit()
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(locator, lambda element: element.submit(), wait_state, timeout)
             self.context.logger.info('Successfully performed a submit action on the element '
                                      f'{element_to_log}')
             return self
@@ -136,10 +125,8 @@ class Actions:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            element.clear()
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(locator, lambda element: element.clear(), wait_state, timeout)
             self.context.logger.info('Successfully cleared the text from the input field '
                                      f'`{element_to_log}`')
             return self
@@ -172,10 +159,9 @@ class Actions:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
             if attribute is None:
                 raise ValueError('Please provide the valid attribute  to perform an action.')
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            value = element.get_attribute(attribute)
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            value = StaleElementRetry(self.context).run(
+                locator, lambda element: element.get_attribute(attribute), wait_state, timeout)
             self.context.logger.info(f'Successfully performed get attribute call for \'{attribute}\' '
                                      f'on the element {element_to_log}. The value obtained is: `{value}`')
             return value
@@ -207,10 +193,9 @@ class Actions:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
             if name is None:
                 raise ValueError('Please provide the valid property name to perform an action.')
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            value = element.get_property(name)
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            value = StaleElementRetry(self.context).run(
+                locator, lambda element: element.get_property(name), wait_state, timeout)
             self.context.logger.info(f'Successfully performed get property call for \'{name}\' '
                                      f'on the element {element_to_log}. The retrieved value is `{value}.')
             return value
@@ -240,10 +225,8 @@ class Actions:
         try:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            size = element.size
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            size = StaleElementRetry(self.context).run(locator, lambda element: element.size, wait_state, timeout)
             self.context.logger.info(f'Successfully performed get size call on the '
                                      f'element {element_to_log} and the value is {size}')
             return size
@@ -272,10 +255,8 @@ class Actions:
         try:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            loc = element.location
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            loc = StaleElementRetry(self.context).run(locator, lambda element: element.location, wait_state, timeout)
             self.context.logger.info(f'Successfully performed get location call on the '
                                      f'element {element_to_log}. The value is `{loc}`')
 
@@ -305,10 +286,8 @@ class Actions:
         try:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            size = element.rect
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            size = StaleElementRetry(self.context).run(locator, lambda element: element.rect, wait_state, timeout)
             self.context.logger.info(f'Successfully performed get rect call on the '
                                      f'element {element_to_log}. The value is `{size}`.')
             return size
@@ -324,6 +303,53 @@ class Actions:
             raise Exception(
                 f'Unable to perform get rect on the element {element_to_log}. Error: {ex}')
 
+    def get_geometry(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None, use_cache=False):
+        """
+        Gets the size, location, viewport visibility and the page scroll offsets of the element in a single call.
+
+        :param locator:  Web element or a locator string on which the action need to be performed.
+        :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+        :param timeout: wait time before throwing any exception. If None, timeout is set to default timeout.
+        :param use_cache: True to reuse the geometry read earlier for the same locator string as long as
+                there was no scroll, resize or DOM change since then. Defaults to False.
+        :return: A dictionary with the keys x, y, width, height (document coordinates), viewport_x, viewport_y,
+                in_viewport, scroll_x and scroll_y.
+        """
+        element_to_log = None
+        try:
+            if locator is None:
+                raise ValueError('Please provide the string pattern or a web element to perform an action.')
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            cache = GeometryCache.for_context(self.context) \
+                if use_cache and not isinstance(locator, WebElement) else None
+            if cache is not None:
+                generation = JsExecutor(self.context).call('geometry', None)['generation']
+                geometry = cache.get(locator, generation)
+                if geometry is not None:
+                    self.context.logger.info(f'Reused the cached geometry of the element {element_to_log}. '
+                                             f'The value is `{geometry}`.')
+                    return geometry
+            geometry = StaleElementRetry(self.context).run(
+                locator, lambda element: JsExecutor(self.context).call('geometry', element),
+                wait_state, timeout)
+            generation = geometry.pop('generation')
+            if cache is not None:
+                cache.put(locator, generation, geometry)
+            self.context.logger.info(f'Successfully performed get geometry call on the '
+                                     f'element {element_to_log}. The value is `{geometry}`.')
+            return geometry
+        except ValueError as val_ex:
+            self.context.logger.error(
+                f'ValueError occurred.')
+            self.context.logger.exception(val_ex)
+            raise ValueError
+
+        except Exception as ex:
+            self.context.logger.error(f'Unable to get geometry of the element {element_to_log}.')
+            self.context.logger.exception(ex)
+            raise Exception(
+                f'Unable to get geometry of the element {element_to_log}. Error: {ex}')
+
     def take_screenshot(self, file_path=None, locator=None, wait_state=ElementWaitState.PRESENT,
                         timeout=None):
 
@@ -358,15 +384,12 @@ class Actions:
                                           'Please provide a valid path !!')
                 raise FileNotFoundError(f'The parent directory `{parent_dir}` does not exist, '
                                         'Please provide a valid path !!')
-            if isinstance(locator, WebElement):
-                element, element_to_log = locator, locator.get_attribute('outerHTML')
-            else:
-                element, element_to_log = Locator(self.context).get_element(locator, wait_state, True, timeout) \
-                                              if locator is not None else None, locator
-            if element is None:
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            if locator is None:
                 status = self.context.driver.save_screenshot(file_path)
             else:
-                status = element.screenshot(file_path)
+                status = StaleElementRetry(self.context).run(
+                    locator, lambda element: element.screenshot(file_path), wait_state, timeout)
             self.context.logger.info(f'Successfully captured the screenshot of the '
                                      f'{"element " + element_to_log if element_to_log is not None else "entire page"} '
                                      f'to the file {file_path}')
@@ -395,16 +418,19 @@ class Actions:
         element_to_log = None
         try:
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout)
-                      if locator is not None else None, locator)
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
 
-            ActionChains(self.context.driver)\
-                .key_down(modifier_value, element)\
-                .send_keys(key)\
-                .key_up(modifier_value, element)\
-                .perform()
+            def _key_press_and_release(element):
+                ActionChains(self.context.driver)\
+                    .key_down(modifier_value, element)\
+                    .send_keys(key)\
+                    .key_up(modifier_value, element)\
+                    .perform()
+
+            if locator is None:
+                _key_press_and_release(None)
+            else:
+                StaleElementRetry(self.context).run(locator, _key_press_and_release, wait_state, timeout)
 
             self.context.logger.info(f'Successfully performed key press and release '
                                      f'{(modifier_value, key)} on element {element_to_log}')
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+
+
+class ClickStrategyStore:
+    """
+    Remembers, per locator string, the click method that last succeeded for ClickMethod.AUTO and
+    persists the table to a JSON file so later runs start with the right method.
+
+    USAGE: ClickStrategyStore.remember('#submit', 'JAVA_SCRIPT_CLICK')
+    """
+    store_path = os.path.join('.ui_automation', 'click_strategies.json')
+    _strategies = None
+
+    @classmethod
+    def _read(cls):
+        try:
+            with open(cls.store_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _load(cls):
+        if cls._strategies is None:
+            cls._strategies = cls._read()
+        return cls._strategies
+
+    @classmethod
+    def get(cls, locator):
+        """
+        Returns the name of the click method that last succeeded for the locator, None if unknown.
+
+        :param locator: The locator string.
+        """
+        return cls._load().get(locator)
+
+    @classmethod
+    def remember(cls, locator, method_name):
+        """
+        Stores the click method that succeeded for the locator and writes the table to `store_path`
+        if it changed.
+
+        :param locator: The locator string.
+        :param method_name: Name of the ClickMethod member that succeeded.
+        """
+        strategies = cls._load()
+        if strategies.get(locator) == method_name:
+            return
+        # Parallel workers share the file, so the entries they saved since it was loaded are merged in
+        strategies.update(cls._read())
+        strategies[locator] = method_name
+        parent_dir = os.path.dirname(cls.store_path) or '.'
+        os.makedirs(parent_dir, exist_ok=True)
+        # A temp file of this process, so that concurrent saves never write to the same file
+        with tempfile.NamedTemporaryFile('w', dir=parent_dir, suffix='.tmp', delete=False) as f:
+            json.dump(strategies, f, indent=1, sort_keys=True)
+        try:
+            os.replace(f.name, cls.store_path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    @classmethod
+    def reset(cls):
+        """
+        Forgets the loaded table so that it is read again from `store_path` on next use.
+        """
+        cls._strategies = None
@@ -0,0 +1,79 @@
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Returns the rect of the element together with the viewport flag and the scroll offsets.
+# The first call on a document installs listeners that bump the layout generation on scroll, resize and
+# DOM mutation, so a cached geometry can be validated with a single call that does not touch the element.
+JsExecutor.register('geometry', """function (element) {
+var state = window.__uiacGeometry;
+if (!state) {
+    state = window.__uiacGeometry = {id: Math.random().toString(36).slice(2), generation: 0};
+    var bump = function () { state.generation++; };
+    window.addEventListener('scroll', bump, true);
+    window.addEventListener('resize', bump);
+    new MutationObserver(bump).observe(document.documentElement,
+        {attributes: true, childList: true, subtree: true, characterData: true});
+}
+var token = state.id + ':' + state.generation;
+if (!element) {
+    return {generation: token};
+}
+var rect = element.getBoundingClientRect();
+var scrollX = window.pageXOffset, scrollY = window.pageYOffset;
+var viewWidth = window.innerWidth || document.documentElement.clientWidth;
+var viewHeight = window.innerHeight || document.documentElement.clientHeight;
+return {
+    generation: token,
+    x: rect.left + scrollX,
+    y: rect.top + scrollY,
+    width: rect.width,
+    height: rect.height,
+    viewport_x: rect.left,
+    viewport_y: rect.top,
+    in_viewport: rect.bottom > 0 && rect.right > 0 && rect.top < viewHeight && rect.left < viewWidth,
+    scroll_x: scrollX,
+    scroll_y: scrollY
+};
+}""")
+
+
+class GeometryCache:
+    """
+    Holds the geometry of elements looked up by locator string, tagged with the layout generation of the
+    document it was read from. An entry is only valid while the generation is unchanged i.e. no scroll,
+    resize or DOM change happened since it was read.
+
+    USAGE: GeometryCache.for_context(context).get('#header', generation)
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def for_context(context):
+        """
+        Returns the cache attached to the context, creating it on first use.
+
+        :param context: Holds contextual information
+        :return: GeometryCache
+        """
+        if getattr(context, 'geometry_cache', None) is None:
+            context.geometry_cache = GeometryCache()
+        return context.geometry_cache
+
+    def get(self, locator, generation):
+        """
+        Returns a copy of the cached geometry of the locator if it was read in the given generation, else None.
+        """
+        entry = self._entries.get(locator)
+        if entry is not None and entry[0] == generation:
+            return dict(entry[1])
+        return None
+
+    def put(self, locator, generation, geometry):
+        """
+        Caches a copy of the geometry of the locator read in the given generation.
+        """
+        self._entries[locator] = (generation, dict(geometry))
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,153 @@
+import json
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.web_element.locator import Locator
+
+# Starts recording pointer events on the window. Coordinates are taken relative to the centre of the
+# origin element if given, else relative to the first recorded event.
+JsExecutor.register('gestureRecordStart', """function (origin) {
+    var state = window.__uiacGesture;
+    if (state) {
+        state.stop();
+    }
+    var events = [], start = null, originX = null, originY = null;
+    if (origin) {
+        var rect = origin.getBoundingClientRect();
+        originX = rect.left + rect.width / 2;
+        originY = rect.top + rect.height / 2;
+    }
+    var kinds = {pointermove: 'm', pointerdown: 'd', pointerup: 'u'};
+    var listener = function (event) {
+        var now = performance.now();
+        if (start === null) {
+            start = now;
+            if (originX === null) {
+                originX = event.clientX;
+                originY = event.clientY;
+            }
+        }
+        events.push([kinds[event.type], Math.round(event.clientX - originX), Math.round(event.clientY - originY),
+                     Math.round(now - start)]);
+    };
+    Object.keys(kinds).forEach(function (type) { window.addEventListener(type, listener, true); });
+    window.__uiacGesture = {
+        events: events,
+        stop: function () {
+            Object.keys(kinds).forEach(function (type) { window.removeEventListener(type, listener, true); });
+            window.__uiacGesture = null;
+            return events;
+        }
+    };
+}""")
+JsExecutor.register('gestureRecordStop', """function () {
+    var state = window.__uiacGesture;
+    return state ? state.stop() : [];
+}""")
+
+
+class Gesture:
+    """
+    A pointer path made of points (kind, x, y, t). `kind` is 'm' for move, 'd' for button down and 'u' for
+    button up, x and y are pixels relative to the gesture origin and t is the time in milliseconds since
+    the first point.
+
+    USAGE: Gesture.load('gestures/draw_circle.json')
+    """
+    MOVE = 'm'
+    DOWN = 'd'
+    UP = 'u'
+
+    def __init__(self, points=None):
+        self.points = [tuple(point) for point in points] if points else []
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, kind, x, y, t):
+        """
+        Appends a point to the gesture.
+        """
+        if kind not in (self.MOVE, self.DOWN, self.UP):
+            raise ValueError(f'Unsupported gesture point kind `{kind}`.')
+        self.points.append((kind, int(x), int(y), int(t)))
+        return self
+
+    def save(self, file_path):
+        """
+        Writes the gesture to a compact JSON file.
+
+        :param file_path: Path+filename.json where the gesture should be saved.
+        """
+        with open(file_path, 'w') as f:
+            json.dump({'version': 1, 'points': self.points}, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Reads a gesture written by `save`.
+
+        :param file_path: Path+filename.json of the gesture.
+        :return: Gesture
+        """
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != 1:
+            raise ValueError(f'Unsupported gesture file version `{data.get("version")}` in {file_path}.')
+        return cls(data['points'])
+
+    def steps(self, speed=1.0):
+        """
+        Converts the points into relative steps for replay.
+
+        :param speed: Replay speed factor. 2.0 replays twice as fast, 0 replays without pauses.
+        :return: list of (kind, x_offset, y_offset, pause_in_seconds) where the pause is taken before the step
+        """
+        if speed < 0:
+            raise ValueError('The replay speed must not be negative.')
+        steps = []
+        last_x, last_y, last_t = 0, 0, 0
+        for kind, x, y, t in self.points:
+            pause = (t - last_t) / 1000 / speed if speed and t > last_t else 0
+            steps.append((kind, x - last_x, y - last_y, pause))
+            last_x, last_y, last_t = x, y, t
+        return steps
+
+
+class GestureRecorder:
+    """
+    Records the pointer events happening on the current page, e.g. while a gesture is performed manually or
+    by a slow step-by-step script, so that it can be saved and replayed later.
+
+    USAGE: recorder = GestureRecorder(context).start('#canvas')\n
+           ...\n
+           recorder.stop().save('gestures/draw_circle.json')
+    """
+
+    def __init__(self, context):
+        self.context = context
+
+    def start(self, origin=None):
+        """
+        Starts recording.
+
+        :param origin: Web element or a locator string whose centre is used as the gesture origin.
+                If None, the first recorded point is used as the origin.
+        :return: self
+        """
+        element = origin if origin is None or isinstance(origin, WebElement) \
+            else Locator(self.context).get_element(origin)
+        JsExecutor(self.context).call('gestureRecordStart', element)
+        self.context.logger.info('Started recording the pointer gesture.')
+        return self
+
+    def stop(self):
+        """
+        Stops recording.
+
+        :return: the recorded Gesture
+        """
+        gesture = Gesture(JsExecutor(self.context).call('gestureRecordStop'))
+        self.context.logger.info(f'Stopped recording the pointer gesture with {len(gesture)} points.')
+        return gesture
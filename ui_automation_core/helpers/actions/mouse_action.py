@@ -1,10 +1,15 @@
 from enum import Enum, auto
 
+from selenium.common.exceptions import ElementClickInterceptedException, ElementNotInteractableException
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.interaction import POINTER
 from selenium.webdriver.remote.webelement import WebElement
 
-from ui_automation_core.helpers import js_executor
-from ui_automation_core.helpers.web_element.locator import Locator
+from ui_automation_core.helpers.actions.click_strategy import ClickStrategyStore
+from ui_automation_core.helpers.actions.gesture import Gesture
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.web_element.stale_retry import StaleElementRetry
 from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
 
 
@@ -12,6 +17,60 @@ class ClickMethod(Enum):
     API_CLICK = auto()
     ACTION_CHAIN_CLICK = auto()
     JAVA_SCRIPT_CLICK = auto()
+    # Tries the methods above in order, starting with the one that last worked for the locator
+    AUTO = auto()
+
+
+class DragMethod(Enum):
+    # Native mouse down, move and up through ActionChains
+    ACTION_CHAIN = auto()
+    # Browser-side dragstart, dragenter, dragover, drop and dragend with a shared DataTransfer,
+    # for targets using the HTML5 drag and drop API
+    HTML5 = auto()
+
+
+JsExecutor.register('click', 'function (element) { element.click(); }')
+# Dispatches the HTML5 drag and drop event sequence. When no target is given, the drop target is the element
+# found at the centre of the source moved by the offset. Returns whether the target accepted the drop.
+JsExecutor.register('html5DragAndDrop', """function (source, target, offsetX, offsetY) {
+    var srcRect = source.getBoundingClientRect();
+    var clientX = srcRect.left + srcRect.width / 2, clientY = srcRect.top + srcRect.height / 2;
+    if (target) {
+        var trgRect = target.getBoundingClientRect();
+        clientX = trgRect.left + trgRect.width / 2;
+        clientY = trgRect.top + trgRect.height / 2;
+    } else {
+        clientX += offsetX;
+        clientY += offsetY;
+        target = document.elementFromPoint(clientX, clientY);
+        if (!target) {
+            throw new Error('No element found at the drop position (' + clientX + ', ' + clientY + ')');
+        }
+    }
+    var dataTransfer = new DataTransfer();
+    var fire = function (element, type, x, y) {
+        var event;
+        try {
+            event = new DragEvent(type, {bubbles: true, cancelable: true, clientX: x, clientY: y,
+                                         dataTransfer: dataTransfer});
+        } catch (e) {
+            event = document.createEvent('Event');
+            event.initEvent(type, true, true);
+        }
+        if (event.dataTransfer !== dataTransfer) {
+            Object.defineProperty(event, 'dataTransfer', {value: dataTransfer});
+        }
+        element.dispatchEvent(event);
+        return event;
+    };
+    var srcX = srcRect.left + srcRect.width / 2, srcY = srcRect.top + srcRect.height / 2;
+    fire(source, 'dragstart', srcX, srcY);
+    fire(target, 'dragenter', clientX, clientY);
+    var accepted = fire(target, 'dragover', clientX, clientY).defaultPrevented;
+    fire(target, 'drop', clientX, clientY);
+    fire(source, 'dragend', clientX, clientY);
+    return accepted;
+}""")
 
 
 class MouseAction:
@@ -19,10 +78,43 @@ class MouseAction:
     MouseAction class is a collection of Mouse Actions that you want to perform on an web element.
 
     """
+    # Order in which ClickMethod.AUTO tries the click methods
+    auto_click_order = (ClickMethod.API_CLICK, ClickMethod.ACTION_CHAIN_CLICK, ClickMethod.JAVA_SCRIPT_CLICK)
 
     def __init__(self, context):
         self.context = context
 
+    def _perform_click(self, element, click_method):
+        if click_method is ClickMethod.API_CLICK:
+            element.click()
+        if click_method is ClickMethod.JAVA_SCRIPT_CLICK:
+            JsExecutor(self.context).call('click', element)
+        if click_method is ClickMethod.ACTION_CHAIN_CLICK:
+            ActionChains(self.context.driver).click(element).perform()
+
+    def _auto_click(self, element, locator):
+        """
+        Clicks the element with the first click method that is not intercepted, starting with the method
+        learned for the locator string and remembering the one that worked.
+        """
+        learned = ClickStrategyStore.get(locator) if isinstance(locator, str) else None
+        methods = list(self.auto_click_order)
+        if learned in ClickMethod.__members__ and ClickMethod[learned] in methods:
+            methods.remove(ClickMethod[learned])
+            methods.insert(0, ClickMethod[learned])
+        for click_method in methods:
+            try:
+                self._perform_click(element, click_method)
+            except (ElementClickInterceptedException, ElementNotInteractableException) as ex:
+                self.context.logger.warning(f'{click_method.name} did not reach the element `{locator}`, '
+                                            f'trying the next click method. Error: {ex}')
+                if click_method is methods[-1]:
+                    raise
+                continue
+            if isinstance(locator, str):
+                ClickStrategyStore.remember(locator, click_method.name)
+            return click_method
+
     def click_web_element(self, locator=None, click_method=ClickMethod.API_CLICK,
                           wait_state=ElementWaitState.PRESENT, timeout=None):
         """
@@ -34,39 +126,32 @@ class MouseAction:
             API_CLICK
             JAVA_SCRIPT_CLICK
             ACTION_CHAIN_CLICK
+            AUTO - tries the methods above in order, starting with the one that last worked for the locator
         :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
         :param timeout: wait time before throwing any exception.
                     If None, timeout defaults to 20 seconds.
         :return: self
         """
+        if not isinstance(click_method, ClickMethod):
+            self.context.logger.error(f'`{click_method}` must be an instance of ClickMethod')
+            raise TypeError(f'`{click_method}` must be an instance of ClickMethod.')
         element_to_log = None
         try:
-            if not isinstance(click_method, ClickMethod):
-                raise TypeError(f'`{click_method}` must be an instance of ClickMethod.')
-
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform a click')
 
-            if isinstance(locator, WebElement):
-                element, element_to_log = locator, locator.get_attribute('outerHTML')
-            else:
-                element, element_to_log = Locator(self.context).get_element(locator, wait_state, True, timeout), locator
-            if click_method is ClickMethod.API_CLICK:
-                element.click()
-                self.context.logger.info(
-                    f'Successfully clicked on the element {element_to_log}')
-            if click_method is ClickMethod.JAVA_SCRIPT_CLICK:
-                js_executor.execute_javascript('arguments[0].click();', element)
-                self.context.logger.info(
-                    f'Successfully clicked on the element {element_to_log}')
-            if click_method is ClickMethod.ACTION_CHAIN_CLICK:
-                ActionChains(self.context.driver).click(element).perform()
-                self.context.logger.info(
-                    f'Successfully clicked on the element {element_to_log}')
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+
+            def _click(element):
+                if click_method is ClickMethod.AUTO:
+                    self._auto_click(element, locator)
+                else:
+                    self._perform_click(element, click_method)
+
+            StaleElementRetry(self.context).run(locator, _click, wait_state, timeout)
+            self.context.logger.info(
+                f'Successfully clicked on the element {element_to_log}')
             return self
-        except TypeError:
-            self.context.logger.error(f'`{click_method}` must be an instance of ClickMethod')
-            raise TypeError
         except ValueError:
             self.context.logger.error('String pattern is None. Please provide a valid pattern to locate the element.')
             raise ValueError
@@ -93,13 +178,10 @@ class MouseAction:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform a double click.')
 
-            if isinstance(locator, WebElement):
-                element, element_to_log = locator, locator.get_attribute('outerHTML')
-
-            else:
-                element, element_to_log = Locator(self.context).get_element(locator, wait_state, True, timeout) \
-                                              if locator is not None else None, locator
-            ActionChains(self.context.driver).double_click(element).perform()
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(
+                locator, lambda element: ActionChains(self.context.driver).double_click(element).perform(),
+                wait_state, timeout)
             self.context.logger.info(
                 f'Successfully double clicked on element {element_to_log}')
             return self
@@ -130,12 +212,10 @@ class MouseAction:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform a right click.')
 
-            if isinstance(locator, WebElement):
-                element, element_to_log = locator, locator.get_attribute('outerHTML')
-            else:
-                element, element_to_log = Locator(self.context).get_element(locator, wait_state, True, timeout) \
-                                              if locator is not None else None, locator
-            ActionChains(self.context.driver).context_click(element).perform()
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(
+                locator, lambda element: ActionChains(self.context.driver).context_click(element).perform(),
+                wait_state, timeout)
             self.context.logger.info(
                 f'Successfully right clicked on element {element_to_log}')
             return self
@@ -167,12 +247,10 @@ class MouseAction:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action.')
 
-            if isinstance(locator, WebElement):
-                element, element_to_log = locator, locator.get_attribute('outerHTML')
-            else:
-                element, element_to_log = Locator(self.context).get_element(locator, wait_state, True, timeout) \
-                                              if locator is not None else None, locator
-            ActionChains(self.context.driver).move_to_element(element).perform()
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(
+                locator, lambda element: ActionChains(self.context.driver).move_to_element(element).perform(),
+                wait_state, timeout)
 
             self.context.logger.info(
                 f'Successfully moved the cursor on to the element {element_to_log}')
@@ -226,11 +304,12 @@ class MouseAction:
         element_to_log = None
         try:
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-
-            (ActionChains(self.context.driver).move_to_element_with_offset(element, x_offset, y_offset).perform())
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            StaleElementRetry(self.context).run(
+                locator,
+                lambda element: ActionChains(self.context.driver)
+                .move_to_element_with_offset(element, x_offset, y_offset).perform(),
+                wait_state, timeout)
 
             self.context.logger.info(f'Successfully moved mouse pointer by an offset {x_offset, y_offset} '
                                      f'on the element {element_to_log}')
@@ -242,7 +321,14 @@ class MouseAction:
             raise Exception(f'Unable to move by an offset {x_offset, y_offset} to the '
                             f'element {element_to_log}. Error: {ex}')
 
-    def drag_and_drop_to_object(self, source, target, wait_state=ElementWaitState.PRESENT, timeout=None):
+    def _html5_drag_and_drop(self, src_element, trg_element, x_offset=0, y_offset=0):
+        accepted = JsExecutor(self.context).call('html5DragAndDrop', src_element, trg_element, x_offset, y_offset)
+        if not accepted:
+            self.context.logger.warning('The drop target did not cancel `dragover`, '
+                                        'so it may not accept the dropped element.')
+
+    def drag_and_drop_to_object(self, source, target, wait_state=ElementWaitState.PRESENT, timeout=None,
+                                drag_method=DragMethod.ACTION_CHAIN):
         """
         Drag an object and drop it onto another object. Holds down the left mouse button on the source element,
         then moves to the target element and releases the mouse button.
@@ -252,9 +338,13 @@ class MouseAction:
         :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
         :param timeout: wait time before throwing any exception.
                     If None, timeout defaults to 20 seconds.
+        :param drag_method: DragMethod.ACTION_CHAIN (default) to drag with the mouse,
+                    DragMethod.HTML5 for `draggable` elements using the HTML5 drag and drop events.
         :return: self
         """
-        trg_element = None
+        if not isinstance(drag_method, DragMethod):
+            self.context.logger.error(f'`{drag_method}` must be an instance of DragMethod')
+            raise TypeError(f'`{drag_method}` must be an instance of DragMethod.')
         trg_element_to_log = None
         src_element_to_log = None
         try:
@@ -264,18 +354,16 @@ class MouseAction:
             if target is None:
                 raise ValueError(
                     'Please provide the `target` string pattern or a web element to perform a drag and drop.')
-            if isinstance(source, WebElement):
-                src_element, src_element_to_log = source, source.get_attribute('outerHTML')
-            else:
-                src_element, src_element_to_log = Locator(self.context).get_element(source, wait_state, True,
-                                                                                    timeout), source
-            if isinstance(target, WebElement):
-                src_element, trg_element_to_log = target, target.get_attribute('outerHTML')
-            else:
-                trg_element, trg_element_to_log = Locator(self.context).get_element(target, wait_state, True,
-                                                                                    timeout), target
+            src_element_to_log = source.get_attribute('outerHTML') if isinstance(source, WebElement) else source
+            trg_element_to_log = target.get_attribute('outerHTML') if isinstance(target, WebElement) else target
+
+            def _drag_and_drop(src_element, trg_element):
+                if drag_method is DragMethod.HTML5:
+                    self._html5_drag_and_drop(src_element, trg_element)
+                else:
+                    ActionChains(self.context.driver).drag_and_drop(src_element, trg_element).perform()
 
-            (ActionChains(self.context.driver).drag_and_drop(src_element, trg_element).perform())
+            StaleElementRetry(self.context).run_all([source, target], _drag_and_drop, wait_state, timeout)
             self.context.logger.info(f'Successfully dragged from the source element '
                                      f'{src_element_to_log} and dropped onto target element {trg_element_to_log}')
             return self
@@ -294,7 +382,8 @@ class MouseAction:
                             f'and {trg_element_to_log}. Error: {ex}')
 
     def drag_and_drop_by_offset(self, src_locator, x_offset, y_offset,
-                                wait_state=ElementWaitState.PRESENT, timeout=None):
+                                wait_state=ElementWaitState.PRESENT, timeout=None,
+                                drag_method=DragMethod.ACTION_CHAIN):
         """
         Drag an object and drop it to an offset location. Holds down the left mouse button on the source element,
         then moves to the target offset and releases the mouse button.
@@ -305,9 +394,14 @@ class MouseAction:
         :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
         :param timeout: wait time before throwing any exception.
                     If None, timeout defaults to 20 seconds.
+        :param drag_method: DragMethod.ACTION_CHAIN (default) to drag with the mouse,
+                    DragMethod.HTML5 to drop onto the element found at the offset using the HTML5 drag and drop events.
         :return: self
         """
 
+        if not isinstance(drag_method, DragMethod):
+            self.context.logger.error(f'`{drag_method}` must be an instance of DragMethod')
+            raise TypeError(f'`{drag_method}` must be an instance of DragMethod.')
         element_to_log = None
         try:
 
@@ -315,13 +409,18 @@ class MouseAction:
                 raise ValueError(
                     'Please provide the `source` string pattern or a web element to perform drag and drop.')
 
-            if isinstance(src_locator, WebElement):
-                element, element_to_log = src_locator, src_locator.get_attribute('outerHTML')
+            element_to_log = src_locator.get_attribute('outerHTML') \
+                if isinstance(src_locator, WebElement) else src_locator
+            if drag_method is DragMethod.HTML5:
+                StaleElementRetry(self.context).run(
+                    src_locator, lambda element: self._html5_drag_and_drop(element, None, x_offset, y_offset),
+                    wait_state, timeout)
             else:
-                element, element_to_log = Locator(self.context).get_element(src_locator, wait_state, True, timeout), \
-                                          src_locator
-            (ActionChains(self.context.driver)
-             .drag_and_drop_by_offset(element, x_offset, y_offset).perform())
+                StaleElementRetry(self.context).run(
+                    src_locator,
+                    lambda element: ActionChains(self.context.driver)
+                    .drag_and_drop_by_offset(element, x_offset, y_offset).perform(),
+                    wait_state, timeout)
             self.context.logger.info(
                 f'Successfully moved the source element {element_to_log} by an offset {x_offset, y_offset}')
             return self
@@ -337,3 +436,67 @@ class MouseAction:
             self.context.logger.exception(ex)
             raise Exception(
                 f'Unable to move the source element {element_to_log} by an offset {x_offset, y_offset}. Error: {ex}')
+
+    def _replay_gesture(self, element, steps):
+        if self.context.driver.w3c:
+            # Each step becomes a pointer move lasting as long as the recorded interval,
+            # so the whole gesture is sent to the driver as one action sequence.
+            builder = ActionBuilder(self.context.driver)
+            pointer = builder.pointer_action
+            if element is not None:
+                pointer.move_to(element)
+            for kind, x_offset, y_offset, pause in steps:
+                if x_offset or y_offset or pause:
+                    pointer.source.create_pointer_move(duration=int(pause * 1000), x=x_offset, y=y_offset,
+                                                       origin=POINTER)
+                if kind == Gesture.DOWN:
+                    pointer.pointer_down()
+                elif kind == Gesture.UP:
+                    pointer.pointer_up()
+            builder.perform()
+        else:
+            chain = ActionChains(self.context.driver)
+            if element is not None:
+                chain.move_to_element(element)
+            for kind, x_offset, y_offset, pause in steps:
+                if pause:
+                    chain.pause(pause)
+                if x_offset or y_offset:
+                    chain.move_by_offset(x_offset, y_offset)
+                if kind == Gesture.DOWN:
+                    chain.click_and_hold()
+                elif kind == Gesture.UP:
+                    chain.release()
+            chain.perform()
+
+    def play_gesture(self, gesture, locator=None, speed=1.0, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+        Replays a recorded pointer gesture as a single batched action sequence.
+
+        :param gesture: Gesture instance or the path of a gesture file written by Gesture.save.
+        :param locator: Web element or a locator string whose centre is the gesture origin.
+                    If None, the gesture starts at the current mouse position.
+        :param speed: Replay speed factor. 2.0 replays twice as fast, 0 replays without pauses. Defaults to 1.0.
+        :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+        :param timeout: wait time before throwing any exception.
+                    If None, timeout defaults to 20 seconds.
+        :return: self
+        """
+        element_to_log = None
+        try:
+            if not isinstance(gesture, Gesture):
+                gesture = Gesture.load(gesture)
+            steps = gesture.steps(speed)
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            if locator is None:
+                self._replay_gesture(None, steps)
+            else:
+                StaleElementRetry(self.context).run(
+                    locator, lambda element: self._replay_gesture(element, steps), wait_state, timeout)
+            self.context.logger.info(f'Successfully replayed the gesture of {len(steps)} points '
+                                     f'at speed {speed} from the element {element_to_log}')
+            return self
+        except Exception as ex:
+            self.context.logger.error(f'Unable to replay the gesture from the element {element_to_log}.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to replay the gesture from the element {element_to_log}. Error: {ex}')
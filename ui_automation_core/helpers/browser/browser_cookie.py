@@ -3,6 +3,11 @@
 # Time    : 03/12/2020 12:45 pm
 # Desc: BrowserCookie holds all the methods to manipulate cookies
 
+# Keys of a WebDriver cookie and the matching CDP Network.CookieParam keys
+_CDP_COOKIE_KEYS = {'name': 'name', 'value': 'value', 'domain': 'domain', 'path': 'path', 'secure': 'secure',
+                    'httpOnly': 'httpOnly', 'sameSite': 'sameSite', 'expiry': 'expires'}
+
+
 class BrowserCookie:
     def __init__(self, context):
         self.context = context
@@ -51,15 +56,16 @@ class BrowserCookie:
             driver.add_cookie({‘name’ : ‘foo’, ‘value’ : ‘bar’, ‘path’ : ‘/’})
             driver.add_cookie({‘name’ : ‘foo’, ‘value’ : ‘bar’, ‘path’ : ‘/’, ‘secure’:True})
         """
+        # Cookie values are often session secrets, only the name is logged
         try:
             self.context.driver.add_cookie(cookie_dict)
             self.context.logger.info(
-                f'Successfully added a cookie {cookie_dict["name"]}:{cookie_dict["value"]}.')
+                f'Successfully added a cookie {cookie_dict["name"]}.')
         except Exception as ex:
-            self.context.logger.error(f'Unable to add a cookie {cookie_dict["name"]}:{cookie_dict["value"]}.')
+            self.context.logger.error(f'Unable to add a cookie {cookie_dict["name"]}.')
             self.context.logger.exception(ex)
             raise Exception(
-                f'Unable to deleted a cookie{cookie_dict["name"]}:{cookie_dict["value"]}. Error: {ex}')
+                f'Unable to add a cookie {cookie_dict["name"]}. Error: {ex}')
 
     def get_a_cookie(self, name: str):
         """
@@ -90,11 +96,93 @@ class BrowserCookie:
         try:
             cookies = self.context.driver.get_cookies()
             self.context.logger.info(
-                f'Successfully retrieved all the cookies.')
-            self.context.logger.info(cookies)
+                f'Successfully retrieved all the {len(cookies)} cookies.')
             return cookies
         except Exception as ex:
             self.context.logger.error(f'Unable to retrieve all the cookies.')
             self.context.logger.exception(ex)
             raise Exception(
                 f'Unable to retrieve all cookies. Error: {ex}')
+
+    def _supports_cdp(self):
+        return hasattr(self.context.driver, 'execute_cdp_cmd')
+
+    def add_cookies(self, cookies):
+        """
+        Adds many cookies to the current session. On Chromium drivers all the cookies are set in a single
+        DevTools call, other drivers add them one by one. Cookies without a domain get the domain of the
+        current page.
+        :param cookies: iterable of cookie dictionaries, see add_a_cookie
+        :return: number of cookies added
+
+        Usage:
+            add_cookies([{‘name’ : ‘foo’, ‘value’ : ‘bar’}, {‘name’ : ‘theme’, ‘value’ : ‘dark’, ‘path’ : ‘/’}])
+        """
+        cookies = list(cookies)
+        try:
+            if not cookies:
+                return 0
+            if self._supports_cdp():
+                current_url = self.context.driver.current_url
+                params = []
+                for cookie in cookies:
+                    param = {cdp_key: cookie[key] for key, cdp_key in _CDP_COOKIE_KEYS.items() if key in cookie}
+                    if 'domain' not in param:
+                        param['url'] = current_url
+                    params.append(param)
+                self.context.driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+            else:
+                for cookie in cookies:
+                    self.context.driver.add_cookie(cookie)
+            self.context.logger.info(f'Successfully added {len(cookies)} cookies.')
+            return len(cookies)
+        except Exception as ex:
+            self.context.logger.error(f'Unable to add {len(cookies)} cookies.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to add {len(cookies)} cookies. Error: {ex}')
+
+    def delete_cookies(self, names):
+        """
+        Deletes the cookies with the given names that are visible to the current page. On Chromium drivers the
+        cookies are deleted through DevTools, other drivers delete them one by one.
+        :param names: iterable of cookie names
+        :return: number of cookie names deleted
+
+        Usage:
+            delete_cookies([‘session’, ‘theme’])
+        """
+        names = list(names)
+        try:
+            if self._supports_cdp():
+                current_url = self.context.driver.current_url
+                for name in names:
+                    self.context.driver.execute_cdp_cmd('Network.deleteCookies', {'name': name, 'url': current_url})
+            else:
+                for name in names:
+                    self.context.driver.delete_cookie(name)
+            self.context.logger.info(f'Successfully deleted {len(names)} cookies.')
+            return len(names)
+        except Exception as ex:
+            self.context.logger.error(f'Unable to delete {len(names)} cookies.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to delete {len(names)} cookies. Error: {ex}')
+
+    def get_cookies(self, predicate=None):
+        """
+        Returns the cookies visible in the current session, filtered by the predicate.
+        :param predicate: function taking a cookie dictionary and returning True to keep it.
+                If None, all cookies are returned.
+        :return: list of cookie dictionaries
+
+        Usage:
+            get_cookies(lambda cookie: cookie[‘name’].startswith(‘ab_’))
+        """
+        try:
+            cookies = self.context.driver.get_cookies()
+            matching = cookies if predicate is None else [cookie for cookie in cookies if predicate(cookie)]
+            self.context.logger.info(f'Successfully retrieved {len(matching)} of {len(cookies)} cookies.')
+            return matching
+        except Exception as ex:
+            self.context.logger.error('Unable to retrieve the cookies.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to retrieve the cookies. Error: {ex}')
@@ -1,8 +1,39 @@
+import time
+import weakref
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from ui_automation_core.helpers.browser.page_ready_state import PageReadyState
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.network_tracker import NETWORK_TRACKER, NETWORK_TRACKER_ON_NEW_DOCUMENT
+from ui_automation_core.helpers.web_element.locator import Locator
+
+# Starts a navigation without waiting for it. The marker tells the readiness polls that the old document is
+# still the current one.
+_NAVIGATE_SCRIPT = 'window.__uiacLeaving = true; window.location.assign(arguments[0]);'
+
+# Returns the readyState of the new document, null while the old document is still the current one.
+_READY_STATE_SCRIPT = 'return window.__uiacLeaving ? null : document.readyState;'
+
+JsExecutor.register('pageReady', """function (condition, idleMs, query) {
+    if (condition === 'locator') {
+        return window.__uiac.fns.findAll(query[0], query[1]).length > 0;
+    }
+    var tracker = window.__uiac.fns.""" + NETWORK_TRACKER + """();
+    return tracker.pending === 0 && performance.now() - tracker.lastActivity >= idleMs;
+}""")
+
+
 class BrowserINavigation:
 
     def __init__(self, context):
         self.context = context
 
+    default_navigation_timeout = 30
+    navigation_poll_interval = 0.1
+    # Drivers that install the network tracker in every new document
+    _early_tracker_drivers = weakref.WeakSet()
+
     def launch_browser_with_url(self, url):
         """
                 Launches the selected webdriver with the application URL
@@ -15,11 +46,103 @@ class BrowserINavigation:
         try:
             self.context.driver.get(url)
             self.context.logger.info(f'Successfully launched the browser with URL:`{url}`.')
+            self._capture_page_metrics()
         except Exception as ex:
             self.context.logger.error('Unable to launched the browser.')
             self.context.logger.exception(ex)
             raise Exception(f'Unable to launched the browser. Error: {str(ex)}')
 
+    def navigate(self, url, ready_state=PageReadyState.LOAD, locator=None, timeout=None, idle_time=0.5):
+        """
+        Navigates to the URL and returns as soon as the page is ready according to the ready state.
+        With LOAD the navigation blocks in the driver as `driver.get` does. With the other states the
+        navigation is started by script and readiness is polled, so the call does not wait for the `load`
+        event, e.g. for tracking pixels or late images. The URL must load a new document, i.e. not only
+        change the fragment.
+        The other states require a driver launched with the page load strategy 'eager' or 'none' (the
+        DriverFactory presets), with 'normal' the driver waits for the `load` event before every command.
+        NETWORK_IDLE counts the fetch/XHR requests the page sends while bootstrapping on Chromium drivers only,
+        other drivers count the requests sent after the document was parsed.
+        :param url: URL to navigate to.
+        :param ready_state: Choose the condition from PageReadyState class. Defaults to PageReadyState.LOAD.
+        :param locator: The string pattern of the element to wait for with PageReadyState.LOCATOR.
+        :param timeout: wait time before throwing any exception. If None, timeout defaults to 30 seconds.
+        :param idle_time: seconds without network activity for PageReadyState.NETWORK_IDLE.
+        :return: the time the navigation took in seconds
+        """
+        timeout = self.default_navigation_timeout if timeout is None else timeout
+        try:
+            if not isinstance(ready_state, PageReadyState):
+                raise TypeError(f'{repr(ready_state)} must be an instance of PageReadyState enum class.')
+            if ready_state == PageReadyState.LOCATOR and locator is None:
+                raise ValueError('Please provide the locator to wait for with PageReadyState.LOCATOR.')
+            if ready_state != PageReadyState.LOAD and self._page_load_strategy() == 'normal':
+                raise ValueError(f'PageReadyState.{ready_state.name} requires a driver launched with the page load '
+                                 f'strategy `eager` or `none`, the driver waits for the load event with `normal`.')
+            if ready_state == PageReadyState.NETWORK_IDLE:
+                self._install_network_tracker_early()
+            start = time.monotonic()
+            if ready_state == PageReadyState.LOAD:
+                self.context.driver.get(url)
+            else:
+                query = list(Locator(self.context).get_by_locator(locator)) if locator is not None else None
+                JsExecutor(self.context).execute_javascript(_NAVIGATE_SCRIPT, url)
+                deadline = start + timeout
+                while not self._is_ready(ready_state, query, idle_time):
+                    if time.monotonic() >= deadline:
+                        raise TimeoutException(f'The page was not ready ({ready_state.value}) after {timeout} seconds.')
+                    time.sleep(self.navigation_poll_interval)
+            elapsed = round(time.monotonic() - start, 3)
+            self.context.logger.info(f'Successfully navigated to `{url}`, ready ({ready_state.value}) '
+                                     f'after {elapsed} seconds.')
+            self._capture_page_metrics()
+            return elapsed
+        except ValueError as val_ex:
+            self.context.logger.error('An ValueError occurred.')
+            self.context.logger.exception(val_ex)
+            raise
+        except TypeError as type_ex:
+            self.context.logger.error('An TypeError occurred.')
+            self.context.logger.exception(type_ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(f'Unable to navigate to `{url}`.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to navigate to `{url}`. Error: {str(ex)}')
+
+    def _page_load_strategy(self):
+        capabilities = getattr(self.context.driver, 'capabilities', None) or {}
+        return capabilities.get('pageLoadStrategy', 'normal')
+
+    def _install_network_tracker_early(self):
+        # Chromium drivers run the tracker before the scripts of every new document
+        driver = self.context.driver
+        if not hasattr(driver, 'execute_cdp_cmd') or driver in self._early_tracker_drivers:
+            return
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_TRACKER_ON_NEW_DOCUMENT})
+        self._early_tracker_drivers.add(driver)
+
+    def _is_ready(self, ready_state, query, idle_time):
+        try:
+            document_state = JsExecutor(self.context).execute_javascript(_READY_STATE_SCRIPT)
+            if ready_state == PageReadyState.LOCATOR:
+                return document_state is not None and \
+                    JsExecutor(self.context).call('pageReady', 'locator', 0, query)
+            if document_state not in ('interactive', 'complete'):
+                return False
+            if ready_state == PageReadyState.DOM_CONTENT_LOADED:
+                return True
+            return JsExecutor(self.context).call('pageReady', ready_state.value, int(idle_time * 1000), None)
+        except (JavascriptException, TimeoutException):
+            # Scripts fail or time out while the old document is being unloaded, other errors are real
+            return False
+
+    def _capture_page_metrics(self):
+        # Records the timings of the new document when the run collects page metrics, see PageMetrics
+        page_metrics = getattr(self.context, 'page_metrics', None)
+        if page_metrics is not None:
+            page_metrics.capture(self.context)
+
     def close_browser_active_window(self):
         """
                 Close the current browser window having focus.
@@ -132,6 +255,7 @@ class BrowserINavigation:
         try:
             self.context.driver.refresh()
             self.context.logger.info('Successfully refreshed the current page.')
+            self._capture_page_metrics()
             return self
         except Exception as ex:
             self.context.logger.error(
@@ -148,6 +272,7 @@ class BrowserINavigation:
             self.context.driver.back()
             self.context.logger.info(
                 'Navigated one step backward on the browser')
+            self._capture_page_metrics()
             return self
         except Exception as ex:
             self.context.logger.error('Unable to navigate one step backward on the browser. '
@@ -163,6 +288,7 @@ class BrowserINavigation:
             self.context.driver.forward()
             self.context.logger.info(
                 'Navigated one step forward on the browser')
+            self._capture_page_metrics()
             return self
         except Exception as ex:
             self.context.logger.error('Unable to navigate one step forward on the browser. '
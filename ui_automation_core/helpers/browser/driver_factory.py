@@ -0,0 +1,252 @@
+import json
+import os
+import platform
+import shutil
+import statistics
+import time
+from enum import Enum, auto
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+
+class BrowserType(Enum):
+    """
+    Browsers the DriverFactory can launch.\n
+    USAGE: BrowserType.CHROME
+    """
+    CHROME = 'chrome'
+    FIREFOX = 'firefox'
+
+
+class DriverPreset(Enum):
+    """
+    Launch settings of the DriverFactory.
+        HEADLESS: headless, no extensions, GPU disabled, eager page load strategy and fixed window size.
+            The fastest startup, meant for CI.
+        HEADED: as HEADLESS but with a visible window, meant for local debugging.
+        DEFAULT: the driver defaults.\n
+    USAGE: DriverPreset.HEADLESS
+    """
+    HEADLESS = auto()
+    HEADED = auto()
+    DEFAULT = auto()
+
+
+class DriverBinaryCache:
+    """
+    Keeps driver binaries (chromedriver, geckodriver) in a local cache laid out as <cache_dir>/<browser>/<version>/.
+    A pinned version is resolved from the cache without any network access, a missing version is downloaded
+    once through webdriver_manager when downloads are allowed. A cache directory seeded with `add` or copied
+    from a build machine makes the startup work fully offline.
+
+    USAGE: DriverBinaryCache().resolve(BrowserType.CHROME, '87.0.4280.88')
+    """
+    default_cache_dir = '.ui_automation/drivers'
+    _binary_names = {BrowserType.CHROME: 'chromedriver', BrowserType.FIREFOX: 'geckodriver'}
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = self.default_cache_dir if cache_dir is None else cache_dir
+
+    def _binary_name(self, browser):
+        name = self._binary_names[browser]
+        return f'{name}.exe' if platform.system() == 'Windows' else name
+
+    def path_for(self, browser, version):
+        """
+        Returns the cache path of the driver binary of the browser and version, whether it exists or not.
+        """
+        return os.path.join(self.cache_dir, browser.value, version, self._binary_name(browser))
+
+    def versions(self, browser):
+        """
+        Returns the cached versions of the driver of the browser, the newest last.
+        """
+        browser_dir = os.path.join(self.cache_dir, browser.value)
+        if not os.path.isdir(browser_dir):
+            return []
+        versions = [version for version in os.listdir(browser_dir)
+                    if os.path.isfile(self.path_for(browser, version))]
+        return sorted(versions, key=lambda version: [int(part) if part.isdigit() else part
+                                                     for part in version.lstrip('v').split('.')])
+
+    def add(self, browser, version, binary_path):
+        """
+        Copies a driver binary into the cache.
+
+        :param browser: BrowserType
+        :param version: version the binary is stored under.
+        :param binary_path: path of the driver binary.
+        :return: the cache path of the binary
+        """
+        target = self.path_for(browser, version)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(binary_path, target)
+        os.chmod(target, 0o755)
+        with open(os.path.join(os.path.dirname(target), 'source.json'), 'w') as f:
+            json.dump({'browser': browser.value, 'version': version, 'source': os.path.abspath(binary_path),
+                       'added': time.strftime('%Y-%m-%dT%H:%M:%S')}, f)
+        return target
+
+    def _download(self, browser, version):
+        # Imported on demand so that offline runs never touch webdriver_manager
+        if browser == BrowserType.CHROME:
+            from webdriver_manager.chrome import ChromeDriverManager as DriverManager
+        else:
+            from webdriver_manager.firefox import GeckoDriverManager as DriverManager
+        download_dir = os.path.join(self.cache_dir, '.downloads')
+        return DriverManager(version=version or 'latest', path=download_dir).install()
+
+    def resolve(self, browser, version=None, allow_download=True):
+        """
+        Returns the path of the driver binary.
+
+        :param browser: BrowserType
+        :param version: pinned driver version. If None, the newest cached version is used.
+        :param allow_download: False to fail instead of downloading a version that is not cached.
+        :return: path of the driver binary
+        """
+        if version is None:
+            cached = self.versions(browser)
+            if cached:
+                return self.path_for(browser, cached[-1])
+        elif os.path.isfile(self.path_for(browser, version)):
+            return self.path_for(browser, version)
+        if not allow_download:
+            raise FileNotFoundError(f'No {browser.value} driver {version or ""} in the driver cache '
+                                    f'`{self.cache_dir}` and downloads are not allowed.')
+        binary_path = self._download(browser, version)
+        if version is None:
+            version = os.path.basename(os.path.dirname(binary_path)) or 'latest'
+        return self.add(browser, version, binary_path)
+
+
+class DriverFactory:
+    """
+    Launches webdrivers with startup-optimized presets and a driver binary resolved from the local
+    DriverBinaryCache. `create` can be used as the factory of a DriverPool.
+
+    The driver version is pinned with `version`, or through the UIAC_CHROMEDRIVER_VERSION /
+    UIAC_GECKODRIVER_VERSION environment variables. Set UIAC_DRIVER_OFFLINE=1 to never download a driver.
+
+    USAGE: context.driver = DriverFactory(BrowserType.CHROME, DriverPreset.HEADLESS).create()
+    """
+    window_size = (1920, 1080)
+    _version_env = {BrowserType.CHROME: 'UIAC_CHROMEDRIVER_VERSION', BrowserType.FIREFOX: 'UIAC_GECKODRIVER_VERSION'}
+
+    def __init__(self, browser=BrowserType.CHROME, preset=DriverPreset.HEADLESS, version=None, cache=None,
+                 allow_download=None, arguments=None, page_load_strategy=None):
+        """
+        :param browser: BrowserType
+        :param preset: DriverPreset
+        :param version: pinned driver version. If None, the environment variable or the newest cached version
+                is used.
+        :param cache: DriverBinaryCache. If None, the default cache directory is used.
+        :param allow_download: False to only use cached drivers. If None, downloads are allowed unless
+                UIAC_DRIVER_OFFLINE is set.
+        :param arguments: extra browser command line arguments.
+        :param page_load_strategy: 'normal', 'eager' or 'none'. If None, 'eager' for the HEADLESS and HEADED
+                presets and the driver default for DEFAULT. With 'eager' or 'none', use
+                BrowserINavigation.navigate with a PageReadyState to wait for the page.
+        """
+        if not isinstance(browser, BrowserType):
+            raise TypeError(f'{repr(browser)} must be an instance of BrowserType enum class.')
+        if not isinstance(preset, DriverPreset):
+            raise TypeError(f'{repr(preset)} must be an instance of DriverPreset enum class.')
+        self.browser = browser
+        self.preset = preset
+        self.version = version if version is not None else os.environ.get(self._version_env[browser])
+        self.cache = DriverBinaryCache() if cache is None else cache
+        self.allow_download = os.environ.get('UIAC_DRIVER_OFFLINE') not in ('1', 'true') \
+            if allow_download is None else allow_download
+        self.arguments = list(arguments or [])
+        if page_load_strategy not in (None, 'normal', 'eager', 'none'):
+            raise ValueError(f'Unsupported page load strategy `{page_load_strategy}`, '
+                             f'use `normal`, `eager` or `none`.')
+        self.page_load_strategy = page_load_strategy
+
+    def build_options(self):
+        """
+        Returns the browser options of the preset.
+        """
+        width, height = self.window_size
+        if self.browser == BrowserType.CHROME:
+            options = ChromeOptions()
+            if self.preset != DriverPreset.DEFAULT:
+                if self.preset == DriverPreset.HEADLESS:
+                    options.add_argument('--headless')
+                for argument in ('--disable-extensions', '--disable-gpu', '--no-first-run',
+                                 '--disable-background-networking', '--disable-default-apps',
+                                 '--disable-dev-shm-usage', f'--window-size={width},{height}'):
+                    options.add_argument(argument)
+        else:
+            options = FirefoxOptions()
+            if self.preset != DriverPreset.DEFAULT:
+                if self.preset == DriverPreset.HEADLESS:
+                    options.add_argument('-headless')
+                options.add_argument(f'--width={width}')
+                options.add_argument(f'--height={height}')
+                options.set_preference('extensions.enabledScopes', 0)
+                options.set_preference('layers.acceleration.disabled', True)
+                options.set_preference('app.update.auto', False)
+        if self.page_load_strategy is not None:
+            options.set_capability('pageLoadStrategy', self.page_load_strategy)
+        elif self.preset != DriverPreset.DEFAULT:
+            options.set_capability('pageLoadStrategy', 'eager')
+        for argument in self.arguments:
+            options.add_argument(argument)
+        return options
+
+    def create(self):
+        """
+        Launches a new webdriver.
+
+        :return: the webdriver
+        """
+        executable_path = self.cache.resolve(self.browser, self.version, self.allow_download)
+        options = self.build_options()
+        if self.browser == BrowserType.CHROME:
+            return webdriver.Chrome(executable_path=executable_path, options=options)
+        return webdriver.Firefox(executable_path=executable_path, options=options, service_log_path=os.devnull)
+
+    def benchmark(self, runs=3, url='about:blank'):
+        """
+        Measures the startup time of the preset: launching the driver and loading the first page.
+
+        :param runs: number of launches.
+        :param url: first page to load.
+        :return: A dictionary with the keys browser, preset, runs, launch and first_page, each timing being a
+         dictionary with the keys min, median and max in seconds
+        """
+        launch_times, first_page_times = [], []
+        # Resolve the binary once so that a first download is not measured
+        self.cache.resolve(self.browser, self.version, self.allow_download)
+        for _ in range(runs):
+            start = time.perf_counter()
+            driver = self.create()
+            launched = time.perf_counter()
+            try:
+                driver.get(url)
+                first_page_times.append(time.perf_counter() - launched)
+            finally:
+                driver.quit()
+            launch_times.append(launched - start)
+
+        def summary(times):
+            return {'min': round(min(times), 3), 'median': round(statistics.median(times), 3),
+                    'max': round(max(times), 3)}
+
+        return {'browser': self.browser.value, 'preset': self.preset.name, 'runs': runs,
+                'launch': summary(launch_times), 'first_page': summary(first_page_times)}
+
+
+if __name__ == '__main__':
+    # Compares the startup time of the presets, e.g.
+    # python -m ui_automation_core.helpers.browser.driver_factory chrome 5
+    import sys
+
+    browser_type = BrowserType(sys.argv[1]) if len(sys.argv) > 1 else BrowserType.CHROME
+    run_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    for driver_preset in DriverPreset:
+        print(json.dumps(DriverFactory(browser_type, driver_preset).benchmark(run_count)))
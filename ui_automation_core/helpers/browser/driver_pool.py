@@ -0,0 +1,216 @@
+import threading
+from urllib.parse import urlsplit
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Clears the storage of the current document and returns its origin, or null for about:blank and the like.
+_CLEAR_STORAGE_SCRIPT = """
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (error) {
+}
+return window.location.origin && window.location.origin !== 'null' ? window.location.origin : null;
+"""
+
+# Returns the used JS heap in bytes where the browser exposes it (Chromium), else null.
+_HEAP_SIZE_SCRIPT = 'return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;'
+
+
+class _PooledDriver:
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Hands out warm webdriver sessions so that a browser is not launched for every scenario.
+
+    A released driver is reset (extra windows closed, cookies and storage cleared, about:blank loaded) and kept
+    for the next scenario. It is quit instead once it served `max_uses` scenarios, its JS heap exceeds
+    `max_memory_mb` or the reset fails. Idle drivers are health-checked before they are handed out again.
+
+    Only Chromium drivers can clear the storage of origins that are no longer open in a window, through the
+    DevTools protocol and the navigation history of each window (which Chromium caps at 50 entries). Other
+    drivers are quit on release unless `allow_partial_reset` is True, in which case the storage of origins
+    visited but not open at release leaks into the next scenario.
+
+    USAGE: before_all: context.driver_pool = DriverPool(lambda: webdriver.Chrome())\n
+           after_all: context.driver_pool.shutdown()\n
+           BasePage(context).open_browser(url) and close_browser(all_windows=True) then acquire and release.
+    """
+    max_uses = 50
+    max_memory_mb = None
+    max_idle = 4
+    # True to reuse drivers without the DevTools protocol, whose reset only clears the storage of open origins
+    allow_partial_reset = False
+
+    def __init__(self, factory, max_uses=None, max_memory_mb=None, max_idle=None, logger=None):
+        """
+        :param factory: callable that launches a new webdriver.
+        :param max_uses: number of scenarios after which a driver is recycled.
+        :param max_memory_mb: JS heap in MB above which a driver is recycled. None to not check the memory.
+        :param max_idle: number of idle drivers to keep, extra drivers are quit on release.
+        :param logger: logger used when the pool is not given a context, e.g. on shutdown.
+        """
+        self.factory = factory
+        self.max_uses = self.max_uses if max_uses is None else max_uses
+        self.max_memory_mb = self.max_memory_mb if max_memory_mb is None else max_memory_mb
+        self.max_idle = self.max_idle if max_idle is None else max_idle
+        self.logger = logger
+        self._idle = []
+        self._in_use = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    def _quit(self, pooled, logger):
+        try:
+            pooled.driver.quit()
+        except Exception as ex:
+            if logger is not None:
+                logger.error(f'Unable to quit a pooled driver. Error: {ex}')
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def acquire(self, context):
+        """
+        Hands out a healthy driver, launching a new one if no idle driver is available,
+        and sets it as `context.driver`.
+
+        :param context: Holds contextual information
+        :return: the webdriver
+        """
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                try:
+                    pooled = _PooledDriver(self.factory())
+                except Exception as ex:
+                    context.logger.error('Unable to launch a new driver for the pool.')
+                    context.logger.exception(ex)
+                    raise Exception(f'Unable to launch a new driver for the pool. Error: {ex}')
+                self.created += 1
+                context.logger.info(f'Launched a new pooled driver, {self.created} launched so far.')
+                break
+            if self._is_healthy(pooled.driver):
+                context.logger.info(f'Reusing a pooled driver that served {pooled.uses} scenarios.')
+                break
+            context.logger.error('Discarding a pooled driver that failed the health check.')
+            self._quit(pooled, context.logger)
+            self.recycled += 1
+        pooled.uses += 1
+        with self._lock:
+            self._in_use[id(pooled.driver)] = pooled
+        context.driver = pooled.driver
+        return pooled.driver
+
+    def owns(self, driver):
+        """
+        Returns True if the driver was handed out by this pool and is not released yet.
+        """
+        with self._lock:
+            return id(driver) in self._in_use
+
+    @staticmethod
+    def _heap_size_mb(context):
+        heap_size = JsExecutor(context).execute_javascript(_HEAP_SIZE_SCRIPT)
+        return None if heap_size is None else heap_size / (1024 * 1024)
+
+    @staticmethod
+    def _can_reset(driver):
+        return hasattr(driver, 'execute_cdp_cmd')
+
+    @staticmethod
+    def _visited_origins(driver):
+        origins = set()
+        for entry in driver.execute_cdp_cmd('Page.getNavigationHistory', {}).get('entries', []):
+            parts = urlsplit(entry.get('url', ''))
+            if parts.scheme in ('http', 'https') and parts.netloc:
+                origins.add(f'{parts.scheme}://{parts.netloc}')
+        return origins
+
+    @classmethod
+    def _reset(cls, context):
+        """
+        Closes all windows but one, clears the cookies, the storage of every origin that is open and, on Chromium
+        drivers, the storage of every origin in the navigation history of the windows, then loads about:blank.
+        """
+        driver = context.driver
+        can_reset = cls._can_reset(driver)
+        handles = driver.window_handles
+        origins = set()
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            origins.add(JsExecutor(context).execute_javascript(_CLEAR_STORAGE_SCRIPT))
+            if can_reset:
+                origins |= cls._visited_origins(driver)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origins.add(JsExecutor(context).execute_javascript(_CLEAR_STORAGE_SCRIPT))
+        driver.delete_all_cookies()
+        if can_reset:
+            origins |= cls._visited_origins(driver)
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in sorted(origins - {None}):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        driver.get('about:blank')
+
+    def release(self, context):
+        """
+        Takes back `context.driver`, resets it for the next scenario or quits it if it is due for recycling.
+
+        :param context: Holds contextual information
+        """
+        driver = getattr(context, 'driver', None)
+        with self._lock:
+            pooled = self._in_use.pop(id(driver), None)
+        if pooled is None:
+            context.logger.error('The driver of the context was not handed out by this pool.')
+            return
+        reason = None
+        if pooled.uses >= self.max_uses:
+            reason = f'it served {pooled.uses} scenarios'
+        elif not self.allow_partial_reset and not self._can_reset(driver):
+            reason = 'it cannot clear the storage of the origins it visited'
+        else:
+            try:
+                heap_size_mb = self._heap_size_mb(context) if self.max_memory_mb is not None else None
+                if heap_size_mb is not None and heap_size_mb > self.max_memory_mb:
+                    reason = f'its JS heap of {heap_size_mb:.0f} MB exceeds {self.max_memory_mb} MB'
+                else:
+                    self._reset(context)
+            except Exception as ex:
+                reason = f'the reset failed with {ex}'
+        context.driver = None
+        if reason is None:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(pooled)
+                    context.logger.info('Successfully reset the driver and returned it to the pool.')
+                    return
+            reason = f'the pool already holds {self.max_idle} idle drivers'
+        context.logger.info(f'Recycling the pooled driver because {reason}.')
+        self._quit(pooled, context.logger)
+        self.recycled += 1
+
+    def shutdown(self):
+        """
+        Quits all the drivers of the pool, including the ones not released.
+        """
+        with self._lock:
+            drivers = self._idle + list(self._in_use.values())
+            self._idle = []
+            self._in_use = {}
+        for pooled in drivers:
+            self._quit(pooled, self.logger)
+        if self.logger is not None:
+            self.logger.info(f'Shut down the driver pool, quit {len(drivers)} drivers.')
@@ -0,0 +1,316 @@
+import glob
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Collects the Navigation Timing entry, a Resource Timing summary and the paint, largest-contentful-paint and
+# layout-shift entries of the current document in one call, once the `load` event has ended, so that the load
+# timing is known and LCP and CLS cover the whole page load. LCP and layout shifts are only exposed to buffered
+# PerformanceObservers, their entries arrive in a task after `observe`, hence the timeout.
+# Returns null for documents without a navigation entry (about:blank) or already captured, e.g. a page
+# restored from the back-forward cache, and {loaded: false} if the load did not end within loadTimeoutMs.
+# Such a document is not marked as captured.
+JsExecutor.register('pageMetrics', """function (settleMs, loadTimeoutMs) {
+    var navigationEntry = function () {
+        return window.performance && performance.getEntriesByType
+            ? performance.getEntriesByType('navigation')[0] : null;
+    };
+    if (!navigationEntry() || window.__uiacMetricsCaptured) {
+        return null;
+    }
+    var started = performance.now();
+    return new Promise(function (resolve) {
+        var waitForLoad = function () {
+            if (navigationEntry().loadEventEnd > 0) {
+                collect();
+            } else if (performance.now() - started >= loadTimeoutMs) {
+                resolve({loaded: false});
+            } else {
+                setTimeout(waitForLoad, 50);
+            }
+        };
+        var collect = function () {
+            var navigation = navigationEntry();
+            var entries = {'largest-contentful-paint': [], 'layout-shift': []};
+            var observers = [];
+            Object.keys(entries).forEach(function (type) {
+                try {
+                    var observer = new PerformanceObserver(function (list) {
+                        Array.prototype.push.apply(entries[type], list.getEntries());
+                    });
+                    observer.observe({type: type, buffered: true});
+                    observers.push([type, observer]);
+                } catch (error) {
+                }
+            });
+            setTimeout(function () {
+                observers.forEach(function (pair) {
+                    Array.prototype.push.apply(entries[pair[0]], pair[1].takeRecords());
+                    pair[1].disconnect();
+                });
+                var round = function (value) { return value === null ? null : Math.round(value * 10) / 10; };
+                var since = function (end, start) { return end > 0 ? round(end - start) : null; };
+                var paints = {};
+                performance.getEntriesByType('paint').forEach(function (entry) {
+                    paints[entry.name] = entry.startTime;
+                });
+                var lcp = entries['largest-contentful-paint'];
+                // CLS is the largest session window of layout shifts (gaps below 1s, windows up to 5s)
+                var cls = 0, session = 0, first = null, last = null;
+                entries['layout-shift'].forEach(function (entry) {
+                    if (entry.hadRecentInput) {
+                        return;
+                    }
+                    if (first !== null && entry.startTime - last < 1000 && entry.startTime - first < 5000) {
+                        session += entry.value;
+                    } else {
+                        session = entry.value;
+                        first = entry.startTime;
+                    }
+                    last = entry.startTime;
+                    cls = Math.max(cls, session);
+                });
+                var resources = performance.getEntriesByType('resource');
+                var byType = {}, transferSize = 0, slowest = 0;
+                resources.forEach(function (entry) {
+                    var summary = byType[entry.initiatorType] =
+                        byType[entry.initiatorType] || {count: 0, transfer_size: 0};
+                    summary.count++;
+                    summary.transfer_size += entry.transferSize || 0;
+                    transferSize += entry.transferSize || 0;
+                    slowest = Math.max(slowest, entry.duration);
+                });
+                window.__uiacMetricsCaptured = true;
+                resolve({
+                    loaded: true,
+                    url: window.location.href,
+                    navigation_type: navigation.type,
+                    metrics: {
+                        ttfb: since(navigation.responseStart, navigation.startTime),
+                        dns: round(navigation.domainLookupEnd - navigation.domainLookupStart),
+                        connect: round(navigation.connectEnd - navigation.connectStart),
+                        response: round(navigation.responseEnd - navigation.responseStart),
+                        dom_interactive: since(navigation.domInteractive, navigation.startTime),
+                        dom_content_loaded: since(navigation.domContentLoadedEventEnd, navigation.startTime),
+                        load: since(navigation.loadEventEnd, navigation.startTime),
+                        transfer_size: navigation.transferSize || 0,
+                        first_paint: paints['first-paint'] === undefined ? null : round(paints['first-paint']),
+                        fcp: paints['first-contentful-paint'] === undefined
+                            ? null : round(paints['first-contentful-paint']),
+                        lcp: lcp.length ? round(lcp[lcp.length - 1].startTime) : null,
+                        cls: Math.round(cls * 10000) / 10000,
+                        resource_count: resources.length,
+                        resource_transfer_size: transferSize,
+                        resource_max_duration: round(slowest)
+                    },
+                    resources: byType
+                });
+            }, settleMs);
+        };
+        waitForLoad();
+    });
+}""")
+
+_STATISTICS = ('p50', 'p95', 'max')
+
+# Environment variable the ParallelRunner passes its samples directory to the workers in
+SAMPLES_DIR_ENV = 'UIAC_PAGE_METRICS_DIR'
+
+
+def _percentile(values, percent):
+    # Linear interpolation between the closest ranks of the sorted values
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class PageMetrics:
+    """
+    Records Navigation Timing, a Resource Timing summary and the paint, LCP and CLS values of every page visit,
+    and aggregates them per URL into a metrics report with p50/p95 values at the end of the run.
+
+    BrowserINavigation captures a sample after each navigation when `context.page_metrics` is set, once the
+    `load` event of the page has ended. Samples are appended to a JSON Lines file in `samples_dir`, one file per
+    ParallelRunner worker, so the report covers all the workers. Timings are in milliseconds, sizes in bytes and
+    CLS is unitless.
+
+    USAGE: before_all: context.page_metrics = PageMetrics()\n
+           after_all: context.page_metrics.finalize(thresholds={'lcp': 2500, 'cls': 0.1, 'ttfb.p50': 400})
+    """
+    samples_dir = '.ui_automation/page_metrics'
+    report_path = 'reports/page_metrics.json'
+
+    def __init__(self, samples_dir=None, url_key=None, settle_time=0, load_timeout=10):
+        """
+        :param samples_dir: directory of the sample files. If None, the directory of the ParallelRunner in a
+                worker, else `samples_dir` of the class is used.
+        :param url_key: callable mapping the page URL to the URL the sample is aggregated under. If None,
+                the query string and fragment are dropped.
+        :param settle_time: seconds to wait for the buffered LCP and layout shift entries.
+        :param load_timeout: seconds to wait for the `load` event of the page before the capture is skipped.
+        """
+        if samples_dir is None:
+            samples_dir = os.environ.get(SAMPLES_DIR_ENV, self.samples_dir)
+        self.samples_dir = samples_dir
+        self.url_key = self.default_url_key if url_key is None else url_key
+        self.settle_time = settle_time
+        self.load_timeout = load_timeout
+        worker_id = os.environ.get('UIAC_WORKER_ID')
+        file_name = 'samples.jsonl' if worker_id is None else f'samples_worker_{worker_id}.jsonl'
+        self.samples_path = os.path.join(self.samples_dir, file_name)
+        # Every run starts without samples of its own. Files of other runs are left alone, the ParallelRunner
+        # clears the directory before the workers start.
+        if os.path.isfile(self.samples_path):
+            os.remove(self.samples_path)
+
+    @staticmethod
+    def default_url_key(url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}{parts.path or "/"}'
+
+    def capture(self, context):
+        """
+        Captures the metrics of the current document and appends them to the sample file.
+        A failing capture is logged and never fails the navigation.
+
+        :param context: Holds contextual information
+        :return: the sample, None if the document has no metrics, was already captured or did not finish loading
+        """
+        try:
+            sample = JsExecutor(context).call_async('pageMetrics', int(self.settle_time * 1000),
+                                                    int(self.load_timeout * 1000))
+            if sample is None:
+                return None
+            if not sample.pop('loaded'):
+                context.logger.info(f'Skipped the page metrics of the current document, its load event did not '
+                                    f'end within {self.load_timeout} seconds.')
+                return None
+            sample['page'] = self.url_key(sample['url'])
+            sample['captured_at'] = time.time()
+            os.makedirs(self.samples_dir, exist_ok=True)
+            with open(self.samples_path, 'a') as f:
+                f.write(json.dumps(sample) + '\n')
+            context.logger.info(f'Captured the page metrics of `{sample["page"]}`: ttfb '
+                                f'{sample["metrics"]["ttfb"]} ms, lcp {sample["metrics"]["lcp"]} ms, '
+                                f'cls {sample["metrics"]["cls"]}.')
+            return sample
+        except Exception as ex:
+            context.logger.error('Unable to capture the page metrics of the current document.')
+            context.logger.exception(ex)
+            return None
+
+    @classmethod
+    def load_samples(cls, samples_dir=None, pattern='*.jsonl'):
+        """
+        Returns the samples of all the sample files in the directory, or of the files matching the pattern.
+        """
+        samples = []
+        samples_dir = cls.samples_dir if samples_dir is None else samples_dir
+        for samples_path in sorted(glob.glob(os.path.join(samples_dir, pattern))):
+            with open(samples_path, 'r') as f:
+                samples.extend(json.loads(line) for line in f if line.strip())
+        return samples
+
+    @staticmethod
+    def aggregate(samples):
+        """
+        Aggregates the samples per page.
+
+        :param samples: samples returned by `capture`.
+        :return: A dictionary of page URL to a dictionary with the keys count and metrics, each metric being a
+         dictionary with the keys p50, p95 and max. Metrics missing on a visit, e.g. `lcp` in Firefox, are
+         aggregated over the visits that have them.
+        """
+        values = {}
+        for sample in samples:
+            page = values.setdefault(sample['page'], {'count': 0, 'metrics': {}})
+            page['count'] += 1
+            for name, value in sample['metrics'].items():
+                if value is not None:
+                    page['metrics'].setdefault(name, []).append(value)
+        pages = {}
+        for url, page in sorted(values.items()):
+            metrics = {}
+            for name, metric_values in page['metrics'].items():
+                metric_values.sort()
+                metrics[name] = {'p50': round(_percentile(metric_values, 50), 4),
+                                 'p95': round(_percentile(metric_values, 95), 4), 'max': metric_values[-1]}
+            pages[url] = {'count': page['count'], 'metrics': metrics}
+        return pages
+
+    @staticmethod
+    def check_thresholds(pages, thresholds):
+        """
+        Checks the aggregated metrics of every page against the thresholds.
+
+        :param pages: pages returned by `aggregate`.
+        :param thresholds: dictionary of metric to the highest allowed value. The p95 is checked unless the key
+                names the statistic, e.g. {'lcp': 2500, 'ttfb.p50': 400, 'cls.max': 0.25}.
+        :return: list of dictionaries with the keys page, metric, statistic, value and threshold
+        """
+        violations = []
+        for key, threshold in (thresholds or {}).items():
+            name, _, statistic = key.partition('.')
+            statistic = statistic or 'p95'
+            if statistic not in _STATISTICS:
+                raise ValueError(f'Unsupported statistic `{statistic}` in the threshold `{key}`, '
+                                 f'use one of {", ".join(_STATISTICS)}.')
+            for url, page in pages.items():
+                value = page['metrics'].get(name, {}).get(statistic)
+                if value is not None and value > threshold:
+                    violations.append({'page': url, 'metric': name, 'statistic': statistic, 'value': value,
+                                       'threshold': threshold})
+        return violations
+
+    @classmethod
+    def write_report(cls, samples_dir=None, report_path=None, thresholds=None, pattern='*.jsonl'):
+        """
+        Aggregates the samples of the directory, checks them against the thresholds and writes the report.
+
+        :param samples_dir: directory of the sample files. If None, `samples_dir` of the class is used.
+        :param report_path: path of the JSON report. If None, `report_path` of the class is used.
+        :param thresholds: see `check_thresholds`.
+        :param pattern: pattern of the sample files to aggregate, all the files of the directory by default.
+        :return: A dictionary with the keys passed, samples, pages, thresholds and violations
+        """
+        samples = cls.load_samples(samples_dir, pattern)
+        pages = cls.aggregate(samples)
+        violations = cls.check_thresholds(pages, thresholds)
+        report = {'passed': not violations, 'samples': len(samples), 'pages': pages,
+                  'thresholds': thresholds or {}, 'violations': violations}
+        report_path = cls.report_path if report_path is None else report_path
+        parent_dir = os.path.dirname(report_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=1)
+        return report
+
+    def finalize(self, report_path=None, thresholds=None, logger=None):
+        """
+        Writes the metrics report of the samples of this run and fails the run if a threshold is exceeded.
+        In a ParallelRunner worker nothing is done, the runner writes the report of all the workers.
+
+        :param report_path: path of the JSON report. If None, `report_path` of the class is used.
+        :param thresholds: see `check_thresholds`.
+        :param logger: logger the summary is written to.
+        :return: the report, None in a ParallelRunner worker
+        """
+        if os.environ.get('UIAC_WORKER_ID') is not None:
+            return None
+        report = self.write_report(self.samples_dir, report_path, thresholds,
+                                   os.path.basename(self.samples_path))
+        if logger is not None:
+            logger.info(f'Wrote the page metrics of {report["samples"]} visits of {len(report["pages"])} pages.')
+        if report['violations']:
+            details = '; '.join(f'{violation["page"]} {violation["metric"]} {violation["statistic"]} '
+                                f'{violation["value"]} > {violation["threshold"]}'
+                                for violation in report['violations'])
+            if logger is not None:
+                logger.error(f'Page metrics exceed the thresholds: {details}')
+            raise AssertionError(f'Page metrics exceed the thresholds: {details}')
+        return report
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class PageReadyState(Enum):
+    """
+    Condition after which a navigation is considered complete.
+        DOM_CONTENT_LOADED: the document is parsed, images and stylesheets may still load.
+        LOAD: the `load` event fired, i.e. every subresource finished. The WebDriver default.
+        NETWORK_IDLE: the document is parsed and no fetch/XHR request or resource load happened for the idle time.
+        LOCATOR: the element of the given locator is present.\n
+    USAGE: PageReadyState.NETWORK_IDLE
+    """
+    DOM_CONTENT_LOADED = 'domContentLoaded'
+    LOAD = 'load'
+    NETWORK_IDLE = 'networkIdle'
+    LOCATOR = 'locator'
@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+from ui_automation_core.helpers.browser.browser_cookie import BrowserCookie
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+JsExecutor.register('storageSnapshot', """function () {
+    var read = function (storage) {
+        var items = {};
+        for (var i = 0; i < storage.length; i++) {
+            var key = storage.key(i);
+            items[key] = storage.getItem(key);
+        }
+        return items;
+    };
+    return {origin: window.location.origin, local: read(window.localStorage), session: read(window.sessionStorage)};
+}""")
+JsExecutor.register('storageRestore', """function (local, session) {
+    Object.keys(local).forEach(function (key) { window.localStorage.setItem(key, local[key]); });
+    Object.keys(session).forEach(function (key) { window.sessionStorage.setItem(key, session[key]); });
+}""")
+
+
+class StorageState:
+    """
+    Saves the authenticated state of the browser (cookies, localStorage and sessionStorage of the current
+    origin) to a local file per user and role, and restores it in later scenarios so that they can skip the
+    login flow. A saved state is used until it expires, after `max_age` seconds or when the auth cookie
+    expires, whichever comes first.
+
+    USAGE: if not StorageState(context).restore('alice', 'admin'):\n
+               login_through_ui()\n
+               StorageState(context).save('alice', 'admin', auth_cookie='session_id')
+    """
+    state_dir = '.ui_automation/storage_state'
+    max_age = 3600
+
+    def __init__(self, context, state_dir=None):
+        self.context = context
+        self.state_dir = self.state_dir if state_dir is None else state_dir
+
+    def path_for(self, user, role):
+        """
+        Returns the file path of the state of the user and role.
+        """
+        key = '__'.join(re.sub(r'[^A-Za-z0-9_.-]', '_', str(part)) for part in (user, role))
+        return os.path.join(self.state_dir, f'{key}.json')
+
+    def save(self, user, role, max_age=None, auth_cookie=None):
+        """
+        Captures the cookies and the storage of the current origin and saves them for the user and role.
+
+        :param user: user name the state belongs to.
+        :param role: role of the user, e.g. 'admin'.
+        :param max_age: seconds the state is valid for. If None, `max_age` of the class is used.
+        :param auth_cookie: name of the cookie holding the session, its expiry caps the validity of the state.
+        :return: the saved state
+        """
+        try:
+            cookies = BrowserCookie(self.context).get_all_cookies()
+            storage = JsExecutor(self.context).call('storageSnapshot')
+            captured_at = time.time()
+            expires_at = captured_at + (self.max_age if max_age is None else max_age)
+            for cookie in cookies:
+                if cookie['name'] == auth_cookie and cookie.get('expiry'):
+                    expires_at = min(expires_at, cookie['expiry'])
+            state = {'version': 1, 'user': user, 'role': role, 'origin': storage['origin'],
+                     'captured_at': captured_at, 'expires_at': expires_at, 'cookies': cookies,
+                     'local_storage': storage['local'], 'session_storage': storage['session']}
+            file_path = self.path_for(user, role)
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = f'{file_path}.tmp'
+            # The state holds session secrets, keep it readable by the owner only
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, file_path)
+            self.context.logger.info(f'Successfully saved the storage state of `{user}` ({role}) for '
+                                     f'{storage["origin"]}: {len(cookies)} cookies, {len(storage["local"])} '
+                                     f'localStorage and {len(storage["session"])} sessionStorage items.')
+            return state
+        except Exception as ex:
+            self.context.logger.error(f'Unable to save the storage state of `{user}` ({role}).')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to save the storage state of `{user}` ({role}). Error: {ex}')
+
+    def load(self, user, role):
+        """
+        Returns the saved state of the user and role, None if there is none or it expired.
+        An expired state file is removed.
+        """
+        file_path = self.path_for(user, role)
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path, 'r') as f:
+            state = json.load(f)
+        if state.get('version') != 1 or state['expires_at'] <= time.time():
+            os.remove(file_path)
+            return None
+        return state
+
+    def restore(self, user, role, reload=True):
+        """
+        Restores the saved state of the user and role into the browser. The browser is navigated to the origin
+        of the state first if it is on another origin.
+
+        :param user: user name the state belongs to.
+        :param role: role of the user.
+        :param reload: True to reload the page so that the application picks up the restored state.
+        :return: True if a valid state was restored, False if there is none or it expired
+        """
+        try:
+            state = self.load(user, role)
+            if state is None:
+                self.context.logger.info(f'No valid storage state saved for `{user}` ({role}).')
+                return False
+            current_url = self.context.driver.current_url
+            current_origin = '{0.scheme}://{0.netloc}'.format(urlsplit(current_url))
+            if current_origin != state['origin']:
+                self.context.driver.get(state['origin'] + '/')
+            host = urlsplit(state['origin']).hostname
+            now = time.time()
+            browser_cookie = BrowserCookie(self.context)
+            browser_cookie.delete_all_cookies()
+            cookies = []
+            for cookie in state['cookies']:
+                domain = cookie.get('domain', host).lstrip('.')
+                if (cookie.get('expiry') and cookie['expiry'] <= now) or \
+                        not (host == domain or host.endswith('.' + domain)):
+                    continue
+                cookies.append(cookie)
+            restored = browser_cookie.add_cookies(cookies)
+            JsExecutor(self.context).call('storageRestore', state['local_storage'], state['session_storage'])
+            if reload:
+                self.context.driver.refresh()
+            self.context.logger.info(f'Successfully restored the storage state of `{user}` ({role}): '
+                                     f'{restored} of {len(state["cookies"])} cookies, '
+                                     f'{len(state["local_storage"])} localStorage and '
+                                     f'{len(state["session_storage"])} sessionStorage items.')
+            return True
+        except Exception as ex:
+            self.context.logger.error(f'Unable to restore the storage state of `{user}` ({role}).')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to restore the storage state of `{user}` ({role}). Error: {ex}')
+
+    def clear(self, user, role):
+        """
+        Removes the saved state of the user and role, e.g. after the password changed.
+        """
+        file_path = self.path_for(user, role)
+        if os.path.isfile(file_path):
+            os.remove(file_path)
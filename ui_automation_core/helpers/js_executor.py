@@ -1,22 +1,167 @@
+import hashlib
+import warnings
+
+from selenium.common.exceptions import WebDriverException
+
+# Calls a helper of the injected bundle by name. Returns [false] when the bundle of the expected version
+# is not on the page i.e. on first use or after a navigation replaced the document.
+_CALL_SCRIPT = """
+var uiac = window.__uiac;
+if (!uiac || uiac.version !== arguments[0]) {
+    return [false];
+}
+return [true, uiac.fns[arguments[1]].apply(null, arguments[2])];
+"""
+
+_CALL_ASYNC_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var uiac = window.__uiac;
+if (!uiac || uiac.version !== arguments[0]) {
+    done([false]);
+    return;
+}
+var fn = uiac.fns[arguments[1]], args = arguments[2];
+Promise.resolve().then(function () { return fn.apply(null, args); }).then(
+    function (value) { done([true, value]); },
+    function (error) { done([true, {error: String(error)}]); });
+"""
+
+
+class JsExecutor:
+    """
+    Executes JavaScript in the current window or frame.
+
+    Named helpers are registered once with `register` and injected into the page as a single bundle
+    (`window.__uiac`) the first time one of them is called on a document. Later calls only send the helper
+    name and its arguments. The bundle is injected again automatically once a navigation replaced the document.
+
+    USAGE: JsExecutor.register('title', 'function () { return document.title; }')\n
+           JsExecutor(context).call('title')
+    """
+    _scripts = {}
+    _bundle = None
+    _version = None
+
+    def __init__(self, context):
+        self.context = context
+
+    @classmethod
+    def register(cls, name, source):
+        """
+        Registers a named helper.
+
+        :param name: Name used to call the helper.
+        :param source: JavaScript function expression, e.g. 'function (element) { element.click(); }'
+        """
+        if cls._scripts.get(name) == source:
+            return
+        cls._scripts[name] = source
+        cls._bundle = None
+        cls._version = None
+
+    @classmethod
+    def _get_bundle(cls):
+        if cls._bundle is None:
+            functions = ''.join(f'fns[{name!r}] = {source};\n' for name, source in sorted(cls._scripts.items()))
+            cls._version = hashlib.md5(functions.encode('utf-8')).hexdigest()[:12]
+            cls._bundle = ('(function () {\nvar fns = {};\n' + functions +
+                           f'window.__uiac = {{version: {cls._version!r}, fns: fns}};\n}})();\n')
+        return cls._version, cls._bundle
+
+    def _inject_and_call(self, call_script, version, bundle, name, args, is_async):
+        self.context.logger.info(f'Injecting the javascript helper bundle `{version}` '
+                                 f'({len(self._scripts)} helpers) into the current document.')
+        execute = self.context.driver.execute_async_script if is_async else self.context.driver.execute_script
+        return execute(bundle + call_script, version, name, list(args))
+
+    def _call(self, name, args, is_async):
+        if name not in self._scripts:
+            raise ValueError(f'No javascript helper registered with the name `{name}`.')
+        version, bundle = self._get_bundle()
+        call_script = _CALL_ASYNC_SCRIPT if is_async else _CALL_SCRIPT
+        execute = self.context.driver.execute_async_script if is_async else self.context.driver.execute_script
+        try:
+            result = execute(call_script, version, name, list(args))
+            if not result[0]:
+                result = self._inject_and_call(call_script, version, bundle, name, args, is_async)
+            value = result[1]
+            if is_async and isinstance(value, dict) and set(value) == {'error'}:
+                raise Exception(value['error'])
+            self.context.logger.info(f'Successfully called the javascript helper `{name}` '
+                                     f'with {len(args)} argument(s).')
+            return value
+        except WebDriverException as ex:
+            # Driver errors keep their type so callers can react to them, e.g. retry a stale element
+            self.context.logger.error(f'Unable to call the javascript helper `{name}` '
+                                      f'with {len(args)} argument(s).')
+            self.context.logger.exception(ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(f'Unable to call the javascript helper `{name}` '
+                                      f'with {len(args)} argument(s).')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to call the javascript helper `{name}` '
+                            f'with {len(args)} argument(s). Error: {ex}') from ex
+
+    def call(self, name, *args):
+        """
+        Synchronously calls a registered helper in the current window or frame.
+
+        :param name: Name of the registered helper.
+        :param args: Any applicable arguments for the helper. Web elements are passed as DOM elements.
+        :return: The value returned by the helper.
+        """
+        return self._call(name, args, False)
+
+    def call_async(self, name, *args):
+        """
+        Calls a registered helper that returns a Promise and waits for it to settle.
+        The wait is bounded by the script timeout of the driver.
+
+        :param name: Name of the registered helper.
+        :param args: Any applicable arguments for the helper.
+        :return: The value the Promise resolved to.
+        """
+        return self._call(name, args, True)
+
+    def execute_javascript(self, script, *args):
+        """
+        Synchronously executes JavaScript in the current window or frame.
+
+        :Args:
+         - script: The JavaScript to execute.
+         - *args: Any applicable arguments for your JavaScript.
+        """
+        script_to_log = script if len(script) <= 80 else f'{script[:77]}...'
+        try:
+            value = self.context.driver.execute_script(script, *args)
+
+            self.context.logger.info(f'Successfully executed javascript `{script_to_log}` '
+                                     f'with {len(args)} argument(s).')
+            return value
+        except WebDriverException as ex:
+            self.context.logger.error(f'Unable to execute javascript `{script_to_log}` '
+                                      f'with {len(args)} argument(s).')
+            self.context.logger.exception(ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(f'Unable to execute javascript `{script_to_log}` '
+                                      f'with {len(args)} argument(s).')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to execute javascript `{script_to_log}` '
+                            f'with {len(args)} argument(s). Error: {ex}') from ex
+
+
 def execute_javascript(self, script, *args):
     """
     Synchronously executes JavaScript in the current window or frame.
+    Deprecated, kept for step code calling the module-level helper. Use JsExecutor(context).execute_javascript.
 
     :Args:
+     - self: Object holding the context, e.g. a page object.
      - script: The JavaScript to execute.
      - *args: Any applicable arguments for your JavaScript.
     """
-    try:
-        value = self.context.driver.execute_script(script, *args)
-
-        self.context.logger.info(f'Successfully executed javascript {script} on the '
-                                 f'argument(s) {args if len(args) > 0 else "No args"}')
-        if value is not None:
-            self.context.logger.info(f'Result : {value}')
-        return value
-    except Exception as ex:
-        self.context.logger.error(f'Unable to execute javascript {script} on the '
-                                  f'argument(s) {args if len(args) > 0 else "No args"}.')
-        self.context.logger.exception(ex)
-        raise Exception('Unable to execute javascript {script} on the '
-                        f'argument(s) {args if len(args) > 0 else "No args"}. Error: {ex}')
\ No newline at end of file
+    warnings.warn('execute_javascript is deprecated, use JsExecutor(context).execute_javascript instead.',
+                  DeprecationWarning, stacklevel=2)
+    return JsExecutor(self.context).execute_javascript(script, *args)
@@ -0,0 +1,59 @@
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Name of the helper, other helpers call it as window.__uiac.fns.networkTracker()
+NETWORK_TRACKER = 'networkTracker'
+
+# Installs, once per document, wrappers counting the fetch/XHR requests in flight and observers recording the
+# time of the last network or DOM activity. Returns the tracker {pending, lastActivity}. Resources that
+# finished before the install, e.g. during the initial page load, are seen through the buffered resource entries,
+# but fetch/XHR requests still in flight at the install are not counted unless it ran at document creation.
+_NETWORK_TRACKER_SOURCE = """function () {
+    var tracker = window.__uiacNetwork;
+    if (tracker) {
+        return tracker;
+    }
+    tracker = window.__uiacNetwork = {pending: 0, lastActivity: performance.now()};
+    var touch = function () { tracker.lastActivity = performance.now(); };
+    var begin = function () { tracker.pending++; touch(); };
+    var end = function () { tracker.pending = Math.max(tracker.pending - 1, 0); touch(); };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return fetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end);
+        try {
+            return send.apply(this, arguments);
+        } catch (error) {
+            // No loadend follows a send that throws, e.g. on a request that was not opened
+            this.removeEventListener('loadend', end);
+            end();
+            throw error;
+        }
+    };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true});
+    if (window.PerformanceObserver) {
+        try {
+            new PerformanceObserver(function (list) {
+                list.getEntries().forEach(function (entry) {
+                    tracker.lastActivity = Math.max(tracker.lastActivity, entry.responseEnd || entry.startTime);
+                });
+            }).observe({type: 'resource', buffered: true});
+        } catch (error) {
+        }
+    }
+    return tracker;
+}"""
+
+JsExecutor.register(NETWORK_TRACKER, _NETWORK_TRACKER_SOURCE)
+
+# Installs the tracker when a document is created, before the scripts of the page run, e.g. through the DevTools
+# Page.addScriptToEvaluateOnNewDocument, so that requests the page sends while bootstrapping are counted too
+NETWORK_TRACKER_ON_NEW_DOCUMENT = '(' + _NETWORK_TRACKER_SOURCE + ')();'
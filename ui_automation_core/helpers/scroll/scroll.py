@@ -4,81 +4,321 @@
 # Desc: Scroll class holds all the methods to scroll the web page.
 
 import time
+import warnings
+from collections import deque
+from enum import Enum
 
-from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.network_tracker import NETWORK_TRACKER
+from ui_automation_core.helpers.web_element.locator import Locator, ElementWaitState
+
+JsExecutor.register('scrollToStart', 'function () { window.scrollBy(0, -document.body.scrollHeight); }')
+# Scrolls the element into view unless it is already fully inside the viewport. Resolves to true if it scrolled,
+# after the scroll position stopped changing for two frames so that smooth scrolling has finished.
+JsExecutor.register('scrollIntoViewIfNeeded', """function (element, behavior, block) {
+    var rect = element.getBoundingClientRect();
+    var viewWidth = window.innerWidth || document.documentElement.clientWidth;
+    var viewHeight = window.innerHeight || document.documentElement.clientHeight;
+    if (rect.top >= 0 && rect.left >= 0 && rect.bottom <= viewHeight && rect.right <= viewWidth) {
+        return false;
+    }
+    element.scrollIntoView({behavior: behavior, block: block, inline: 'nearest'});
+    return new Promise(function (resolve) {
+        var last = null, stableFrames = 0;
+        var check = function () {
+            var current = element.getBoundingClientRect();
+            var position = current.top + ',' + current.left;
+            stableFrames = position === last ? stableFrames + 1 : 0;
+            last = position;
+            if (stableFrames >= 2) {
+                resolve(true);
+            } else {
+                requestAnimationFrame(check);
+            }
+        };
+        requestAnimationFrame(check);
+    });
+}""")
+# Scrolls to the bottom until the page stops growing. After each scroll it waits until no fetch/XHR request is
+# in flight and the DOM did not change for settleMs, a scroll that settles without height growth ends the
+# loop. Requests that never finish, e.g. long polling or analytics beacons, do not hold the wait: the page also
+# counts as settled when there was no activity and the height did not change for settleMs. The call returns at the latest after budgetMs so that it stays within the script timeout of the driver,
+# the caller calls it again to continue.
+JsExecutor.register('scrollToEnd', """function (maxIterations, budgetMs, settleMs) {
+    var tracker = window.__uiac.fns.""" + NETWORK_TRACKER + """();
+    var height = function () {
+        return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight);
+    };
+    var start = performance.now();
+    var result = {iterations: 0, loads: 0, reachedEnd: false};
+    return new Promise(function (resolve) {
+        var step = function () {
+            if (result.iterations >= maxIterations || performance.now() - start >= budgetMs) {
+                result.height = height();
+                resolve(result);
+                return;
+            }
+            var before = height();
+            var lastHeight = before, heightChangedAt = performance.now();
+            result.iterations++;
+            tracker.lastActivity = performance.now();
+            window.scrollTo(0, before);
+            var poll = function () {
+                var now = performance.now();
+                var current = height();
+                if (current !== lastHeight) {
+                    lastHeight = current;
+                    heightChangedAt = now;
+                }
+                var settled = now - tracker.lastActivity >= settleMs
+                    && (tracker.pending <= 0 || now - heightChangedAt >= settleMs);
+                if (!settled && now - start < budgetMs) {
+                    setTimeout(poll, 25);
+                    return;
+                }
+                if (current > before) {
+                    result.loads++;
+                    step();
+                } else {
+                    result.reachedEnd = settled;
+                    result.height = height();
+                    resolve(result);
+                }
+            };
+            setTimeout(poll, 25);
+        };
+        step();
+    });
+}""")
+
+# Optionally scrolls the container by most of its height, waits for the next frames plus settleMs and returns
+# the rendered rows as [key, text, cell texts]. The key is the keyAttr attribute. Rows without it are keyed by
+# their text and their offset from the top of the scrolled content, so distinct rows with the same text stay apart.
+JsExecutor.register('harvestStep', """function (container, query, keyAttr, scroll, settleMs) {
+    var scroller = container || document.scrollingElement || document.documentElement;
+    var contentTop = function () {
+        return (container ? container.getBoundingClientRect().top : 0) - scroller.scrollTop;
+    };
+    if (scroll) {
+        scroller.scrollTop += Math.max(scroller.clientHeight * 0.9, 1);
+    }
+    return new Promise(function (resolve) {
+        requestAnimationFrame(function () {
+            requestAnimationFrame(function () {
+                setTimeout(function () {
+                    var rows = window.__uiac.fns.findAll(query[0], query[1], container).map(function (row) {
+                        var text = (row.innerText || row.textContent || '').trim();
+                        var cells = Array.prototype.map.call(row.children, function (cell) {
+                            return (cell.innerText || cell.textContent || '').trim();
+                        });
+                        var key = keyAttr ? row.getAttribute(keyAttr) : null;
+                        if (key === null || key === '') {
+                            key = text + '@' + Math.round(row.getBoundingClientRect().top - contentTop());
+                        }
+                        return [key, text, cells];
+                    });
+                    resolve(rows);
+                }, settleMs);
+            });
+        });
+    });
+}""")
+
+
+class ScrollBehavior(Enum):
+    """
+    How the scroll into view is animated.\n
+    USAGE: ScrollBehavior.SMOOTH
+    """
+    INSTANT = 'auto'
+    SMOOTH = 'smooth'
+
+
+class ScrollAlignment(Enum):
+    """
+    Where the element is placed vertically in the viewport after the scroll into view.\n
+    USAGE: ScrollAlignment.CENTER
+    """
+    START = 'start'
+    CENTER = 'center'
+    END = 'end'
+    NEAREST = 'nearest'
 
 
 class Scroll:
     def __init__(self, context):
         self.context = context
 
+    # Longest single browser-side wait, kept below the default script timeout of the drivers
+    scroll_call_budget = 20
+
     def execute_javascript(self, script, *args):
         """
         Synchronously executes JavaScript in the current window or frame.
+        Deprecated, use JsExecutor(context).execute_javascript.
 
         :Args:
          - script: The JavaScript to execute.
          - *args: Any applicable arguments for your JavaScript.
         """
-        try:
-            value = self.context.driver.execute_script(script, *args)
+        warnings.warn('Scroll.execute_javascript is deprecated, use JsExecutor(context).execute_javascript instead.',
+                      DeprecationWarning, stacklevel=2)
+        return JsExecutor(self.context).execute_javascript(script, *args)
+
+    def scroll_to_page_end(self, max_iterations=100, max_time=60, settle_time=0.3):
+        """
+        Simulates the scroll to the bottom of the page. Lazily loaded content is waited for browser-side: the
+        next scroll happens as soon as the network requests and DOM changes triggered by the previous one have
+        settled, and scrolling stops when a settled scroll did not grow the page.
 
-            self.context.logger.info(f'Successfully executed javascript {script} on the '
-                                     f'argument(s) {args if len(args) > 0 else "No args"}')
-            if value is not None:
-                self.context.logger.info(f'Result : {value}')
-            return value
+        :param max_iterations: maximum number of scrolls.
+        :param max_time: maximum time in seconds spent scrolling.
+        :param settle_time: time in seconds without network activity and DOM changes after which a load is
+                considered complete. Requests still in flight are ignored once the height was unchanged as long.
+        :return: A dictionary with the keys loads (number of scrolls that grew the page), iterations, height,
+         reached_end (False if a cap was hit first) and elapsed (seconds)
+        """
+        start = time.monotonic()
+        report = {'loads': 0, 'iterations': 0, 'height': None, 'reached_end': False, 'elapsed': None}
+        try:
+            while not report['reached_end'] and report['iterations'] < max_iterations:
+                remaining = max_time - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+                result = JsExecutor(self.context).call_async(
+                    'scrollToEnd', max_iterations - report['iterations'],
+                    int(min(remaining, self.scroll_call_budget) * 1000), int(settle_time * 1000))
+                report['loads'] += result['loads']
+                report['iterations'] += result['iterations']
+                report['height'] = result['height']
+                report['reached_end'] = result['reachedEnd']
+            report['elapsed'] = round(time.monotonic() - start, 3)
+            if report['reached_end']:
+                self.context.logger.info(f'Successfully scrolled to the page end after {report["loads"]} loads '
+                                         f'in {report["elapsed"]} seconds.')
+            else:
+                self.context.logger.error(f'Stopped scrolling before the page end after {report["iterations"]} '
+                                          f'scrolls and {report["elapsed"]} seconds, {report["loads"]} loads.')
+            return report
         except Exception as ex:
-            self.context.logger.error(f'Unable to execute javascript {script} on the '
-                                      f'argument(s) {args if len(args) > 0 else "No args"}.')
+            self.context.logger.error(f'Unable to scroll to the page end.')
             self.context.logger.exception(ex)
-            raise Exception('Unable to execute javascript {script} on the '
-                            f'argument(s) {args if len(args) > 0 else "No args"}. Error: {ex}')
+            raise Exception(f'Unable to scroll to the page end. Error: {ex}')
 
-    def scroll_to_page_end(self):
+    def iter_items(self, container_locator, item_locator, key_attr=None, settle_time=0.1, max_idle_steps=3,
+                   max_items=None, timeout=None, seen_window=1000):
         """
-        Simulates the scroll to the bottom of the page
+        Harvests the rows of a virtualized or infinite list. The container is scrolled step by step, the rows
+        rendered after each step are extracted in one call, deduplicated by key and yielded as they arrive.
+        Only the keys of the last `seen_window` rows are kept, so very long lists are harvested in bounded memory.
+        The container and the locators are resolved when iter_items is called, not on the first iteration.
+
+        :param container_locator: web element or a locator string of the scrollable container.
+                None to scroll the page.
+        :param item_locator: locator string of the rows, resolved within the container.
+        :param key_attr: attribute that identifies a row, e.g. 'data-row-id'. If None or missing on a row,
+                the row text and its offset in the list are used as the key.
+        :param settle_time: time in seconds to wait for the rows to render after each scroll.
+        :param max_idle_steps: number of consecutive steps without new rows after which the harvest stops,
+                more than one gives lazily loaded rows at the end of the list time to arrive.
+        :param max_items: maximum number of rows to yield. None for no limit.
+        :param timeout: wait time for the container before throwing any exception.
+                If None, timeout defaults to 20 seconds.
+        :param seen_window: number of most recent row keys kept for deduplication, must exceed the number of rows
+                rendered at once.
+        :return: generator of dictionaries with the keys key, text and cells (texts of the child elements)
+
+        USAGE: for row in Scroll(context).iter_items('#grid .viewport', 'css=.row', 'data-row-id'): ...
         """
-        wait_time = 1
-        initial_height = self.execute_javascript("return document.body.scrollHeight")
-        while True:
-            self.execute_javascript(f"window.scrollBy(0, {initial_height});")
-            # Wait time before next scroll
-            time.sleep(wait_time)
-            new_height = self.execute_javascript("return document.body.scrollHeight")
-            if new_height == initial_height:
+        try:
+            if seen_window < 1:
+                raise ValueError(f'seen_window must be positive, got {seen_window}')
+            container = container_locator
+            if container_locator is not None and not isinstance(container_locator, WebElement):
+                container = Locator(self.context).get_element(container_locator, timeout=timeout)
+            query = list(Locator(self.context).get_by_locator(item_locator))
+        except Exception as ex:
+            self.context.logger.error(f'Unable to start harvesting `{item_locator}` from `{container_locator}`.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to start harvesting `{item_locator}` from `{container_locator}`. Error: {ex}')
+        return self._harvest(container, query, item_locator, key_attr, settle_time, max_idle_steps, max_items,
+                             seen_window)
+
+    def _harvest(self, container, query, item_locator, key_attr, settle_time, max_idle_steps, max_items,
+                 seen_window):
+        recent = deque()
+        seen = set()
+        harvested = 0
+        idle_steps = 0
+        steps = 0
+        while max_items is None or harvested < max_items:
+            rows = JsExecutor(self.context).call_async('harvestStep', container, query, key_attr, steps > 0,
+                                                         int(settle_time * 1000))
+            steps += 1
+            new_rows = 0
+            for key, text, cells in rows:
+                if key in seen:
+                    continue
+                seen.add(key)
+                recent.append(key)
+                if len(recent) > seen_window:
+                    seen.discard(recent.popleft())
+                harvested += 1
+                new_rows += 1
+                yield {'key': key, 'text': text, 'cells': cells}
+                if max_items is not None and harvested >= max_items:
+                    break
+            idle_steps = 0 if new_rows else idle_steps + 1
+            if idle_steps >= max_idle_steps:
                 break
-            initial_height = new_height
+        self.context.logger.info(f'Harvested {harvested} rows of `{item_locator}` in {steps} steps.')
 
     def scroll_to_page_start(self):
         """
         Simulates the scroll to the start of the page
         """
-        self.execute_javascript(
-            "window.scrollBy(0, -document.body.scrollHeight);")
+        JsExecutor(self.context).call('scrollToStart')
 
-    def scroll_element_into_view(self, locator, js=True, timeout=None):
+    def scroll_element_into_view(self, locator, js=True, timeout=None, behavior=ScrollBehavior.INSTANT,
+                                 alignment=ScrollAlignment.START):
         """
-        Find element and scroll the element into view
-        :param locator:  String to find the element on webpage
+        Find element and scroll the element into view. With js, the viewport check and the scroll happen in a
+        single call and the scroll is skipped when the element is already fully visible in the viewport.
+        :param locator: Web element or a locator string to find the element on webpage
         :param js: True if to perform action using execute_javascript(default), for native methods set it as False
         :param timeout: The timeout to find the element.
-            If None, timeout defaults to 30 seconds.
-        :return:
+            If None, timeout defaults to 20 seconds.
+        :param behavior: Choose the animation from ScrollBehavior class. Defaults to ScrollBehavior.INSTANT.
+        :param alignment: Choose the vertical alignment from ScrollAlignment class. Defaults to ScrollAlignment.START.
+        :return: True if the page was scrolled, False if the element was already in the viewport
         """
-        element = self.context.driver.find_element(By.ID, locator)
-        if js:
-            self.execute_javascript('arguments[0].scrollIntoView(true)', element)
-        else:
-
-            try:
-                location = element.location_once_scrolled_into_view
-                self.context.logger.info(
-                    f'Successfully scrolled element into view. Location:{location}')
-
-            except Exception as ex:
-                self.context.logger.error(
-                    f'Unable to scroll element into view.')
-                self.context.logger.exception(ex)
-                raise Exception(
-                    f'Unable to scroll element into view. Error: {ex}')
+        _ele_to_log = locator
+        try:
+            if not isinstance(behavior, ScrollBehavior):
+                raise TypeError(f'{repr(behavior)} must be an instance of ScrollBehavior enum class.')
+            if not isinstance(alignment, ScrollAlignment):
+                raise TypeError(f'{repr(alignment)} must be an instance of ScrollAlignment enum class.')
+            element = locator if isinstance(locator, WebElement) \
+                else Locator(self.context).get_element(locator, ElementWaitState.PRESENT, True, timeout)
+            if js:
+                scrolled = JsExecutor(self.context).call_async('scrollIntoViewIfNeeded', element, behavior.value,
+                                                               alignment.value)
+                self.context.logger.info(f'Successfully scrolled element `{_ele_to_log}` into view.' if scrolled
+                                         else f'The element `{_ele_to_log}` is already in the viewport.')
+                return scrolled
+            location = element.location_once_scrolled_into_view
+            self.context.logger.info(
+                f'Successfully scrolled element into view. Location:{location}')
+            return True
+        except TypeError as type_ex:
+            self.context.logger.error('An TypeError occurred.')
+            self.context.logger.exception(type_ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(
+                f'Unable to scroll element `{_ele_to_log}` into view.')
+            self.context.logger.exception(ex)
+            raise Exception(
+                f'Unable to scroll element `{_ele_to_log}` into view. Error: {ex}')
@@ -1,10 +1,73 @@
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import Select, WebDriverWait
 
+from ui_automation_core.helpers.js_executor import JsExecutor
 from ui_automation_core.helpers.select.select_method import SelectMethod
 from ui_automation_core.helpers.web_element.locator import Locator
+from ui_automation_core.helpers.web_element.stale_retry import StaleElementRetry
 from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
 
+# Reads every option of a select element in one call
+JsExecutor.register('selectOptions', """function (select, withElements) {
+    return Array.prototype.map.call(select.options, function (option) {
+        var details = {text: option.text.replace(/\\s+/g, ' ').trim(), value: option.value, index: option.index,
+                       selected: option.selected, disabled: option.disabled};
+        if (withElements) {
+            details.element = option;
+        }
+        return details;
+    });
+}""")
+
+
+# Selects or deselects all options matching the requested texts, values or indices in one pass
+# and fires a single `input` and `change` event. Nothing is changed when any requested value matches no option,
+# the unmatched values are returned instead.
+JsExecutor.register('selectBulk', """function (select, by, isSelect, values) {
+    if (!isSelect && !select.multiple) {
+        return {multiple: false, unmatched: []};
+    }
+    var requested = {};
+    values.forEach(function (value) { requested[value] = false; });
+    var matched = Array.prototype.filter.call(select.options, function (option) {
+        var key = by === 'VISIBLE_TEXT' ? option.text.replace(/\\s+/g, ' ').trim()
+            : by === 'VALUE' ? option.value : String(option.index);
+        if (requested.hasOwnProperty(key)) {
+            requested[key] = true;
+            return true;
+        }
+        return false;
+    });
+    var unmatched = values.filter(function (value) { return !requested[value]; });
+    if (unmatched.length) {
+        return {multiple: select.multiple, unmatched: unmatched};
+    }
+    var changed = false;
+    matched.forEach(function (option) {
+        if (option.selected !== isSelect) {
+            option.selected = isSelect;
+            changed = true;
+        }
+    });
+    if (changed) {
+        select.dispatchEvent(new Event('input', {bubbles: true}));
+        select.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    return {multiple: select.multiple, unmatched: []};
+}""")
+
+
+# Resolves every checkbox query (a web element or a [by, value] pair) and reads its checked state in one call
+JsExecutor.register('checkboxStates', """function (queries) {
+    var elements = queries.map(function (query) {
+        return Array.isArray(query) ? window.__uiac.fns.findAll(query[0], query[1])[0] || null : query;
+    });
+    return {elements: elements, states: elements.map(function (element) {
+        return element ? element.checked === true : null;
+    })};
+}""")
+
 
 class SelectAction:
 
@@ -62,22 +125,22 @@ class SelectAction:
             if isinstance(locator, WebElement) \
             else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
         try:
-
-            if not element.is_selected() and is_select:
+            is_selected = element.is_selected()
+            if not is_selected and is_select:
                 # if checkbox is not selected and is_select is true
                 element.click()
                 self.context.logger.info(
                     f'Successfully selected the element {log_element}')
-            elif element.is_selected() and not is_select:
+            elif is_selected and not is_select:
                 # if checkbox is selected and is_select is false
                 element.click()
                 self.context.logger.info(
                     f'Successfully unselected the element {log_element}')
-            elif not element.is_selected() and not is_select:
+            elif not is_selected and not is_select:
                 # if checkbox is not selected and is_select is false
                 # element.click()
                 self.context.logger.info(f'The element {log_element} is already in unselected state.')
-            elif element.is_selected() and is_select:
+            elif is_selected and is_select:
                 # if checkbox is selected and is_select is true
                 # element.click()
                 self.context.logger.info(
@@ -95,8 +158,60 @@ class SelectAction:
             raise Exception(
                 f'Unable to select/unselect the element {log_element}. Error: {ex}')
 
+    def _select_bulk(self, element, select_by, is_select, values):
+        result = JsExecutor(self.context).call('selectBulk', element, select_by.name, is_select,
+                                               [str(value) for value in values])
+        if not result['multiple'] and not is_select:
+            raise NotImplementedError('You may only deselect options of a multi-select')
+        if result['unmatched']:
+            raise NoSuchElementException(f'The items {result["unmatched"]} did not match any option, '
+                                         f'no option was changed')
+
+    def set_checkboxes(self, states, timeout=None):
+        """
+        Bring many checkboxes to the requested state. All current states are read in one call and only the
+        checkboxes whose state differs are clicked, with a native click so the interactability checks apply.
+
+        :param states: A dictionary of web element or locator string to the boolean state to set, True: To select,
+                False: to unselect.
+        :param timeout: wait time for all checkboxes to be present before throwing any exception.
+                    If None, timeout defaults to 20 seconds.
+        :return: self
+
+        USAGE: set_checkboxes({'#read': True, '#write': False, '[admin]': True})
+        """
+        try:
+            if not states:
+                raise ValueError('Please provide one or more checkboxes and their states to perform the action.')
+            locators = list(states)
+            queries = [loc if isinstance(loc, WebElement) else list(Locator(self.context).get_by_locator(loc))
+                       for loc in locators]
+            timeout = Locator.default_wait if timeout is None else timeout
+
+            def all_present(driver):
+                result = JsExecutor(self.context).call('checkboxStates', queries)
+                return result if None not in result['states'] else False
+
+            current = WebDriverWait(self.context.driver, timeout, poll_frequency=0.25).until(
+                all_present, f'Timed out after {timeout} seconds waiting for the checkboxes {locators}.')
+            to_click = [element for loc, element, state in zip(locators, current['elements'], current['states'])
+                        if state != bool(states[loc])]
+            for element in to_click:
+                element.click()
+            self.context.logger.info(f'Successfully set {len(locators)} checkboxes, '
+                                     f'{len(to_click)} of them changed state.')
+            return self
+        except ValueError as val_ex:
+            self.context.logger.error(f'ValueError  occurred.')
+            self.context.logger.exception(val_ex)
+            raise ValueError
+        except Exception as ex:
+            self.context.logger.error(f'Unable to set the state of the checkboxes {list(states)}.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to set the state of the checkboxes {list(states)}. Error: {ex}')
+
     def select_dropdown(self, locator, select_by, is_select, values=None,
-                        wait_state=ElementWaitState.PRESENT, timeout=None):
+                        wait_state=ElementWaitState.PRESENT, timeout=None, bulk=False):
         """
         Select an option or list of options at the given index, value or visible text.
 
@@ -106,6 +221,9 @@ class SelectAction:
         :param values: A list of single or multiple indices, values or visible texts
         :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
         :param timeout: wait time before throwing any exception. If None, timeout defaults to 20 seconds.
+        :param bulk: True to select/deselect all the values browser-side in one pass with a single `change` event.
+                If any value matches no option, nothing is changed and the error names the unmatched values.
+                Defaults to False.
         :return: self
 
         USAGE:  select_dropdown('#dropdown', SelectMethod.VALUE, True, ['Option One'])\n
@@ -126,6 +244,15 @@ class SelectAction:
                 raise TypeError('{strategy} must be an instance of SelectStrategy'
                                 .format(strategy=repr(select_by)))
 
+            if bulk:
+                element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+                StaleElementRetry(self.context).run(
+                    locator, lambda element: self._select_bulk(element, select_by, is_select, values),
+                    wait_state, timeout)
+                self.context.logger.info(f'Successfully selected/deselected the {len(values)} items {values} '
+                                         f'in bulk on the dropdown element {element_to_log}')
+                return self
+
             element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
                 if isinstance(locator, WebElement) \
                 else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
@@ -153,6 +280,44 @@ class SelectAction:
             raise Exception(f'Unable to select the item {values} on the '
                             f'dropdown element {element_to_log}. Error: {ex}')
 
+    def _get_options(self, locator, with_elements, wait_state, timeout):
+        return StaleElementRetry(self.context).run(
+            locator, lambda element: JsExecutor(self.context).call('selectOptions', element, with_elements),
+            wait_state, timeout)
+
+    def get_dropdown_options_details(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+        Get the text, value, index, selected and disabled state of all options belonging to this select tag
+        in a single call.
+
+        :param locator:  Web element or a locator string on which the action need to be performed.
+        :param wait_state: he wait state for retrial. Choose state from ElementWaitState class.
+        :param timeout: wait time before throwing any exception. If None, timeout defaults to 20 seconds.
+        :return: Returns a list of dictionaries with the keys text, value, index, selected and disabled
+        """
+        element_to_log = None
+        try:
+            if locator is None:
+                raise ValueError('Please provide the string pattern or a web element to perform an action')
+
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            options = self._get_options(locator, False, wait_state, timeout)
+            self.context.logger.info(f'Successfully retrieved the details of {len(options)} options from the '
+                                     f'dropdown element {element_to_log}')
+            return options
+        except ValueError:
+            self.context.logger.error(
+                'String pattern is None.'
+                ' Please provide a valid pattern to locate the element and to perform an action.')
+            raise ValueError
+
+        except Exception as ex:
+            self.context.logger.error(f'Unable to get the option details from the '
+                                      f'dropdown element {element_to_log}, Error: {ex}')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to get the option details from the '
+                            f'dropdown element {element_to_log}, Error: {ex}')
+
     def get_all_dropdown_options(self, locator, wait_state=ElementWaitState.PRESENT, timeout=None):
         """
         Get a list of all options belonging to this select tag.
@@ -167,17 +332,12 @@ class SelectAction:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action')
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            options = Select(element).options
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            options = self._get_options(locator, True, wait_state, timeout)
             self.context.logger.info(f'Successfully retrieved {len(options)} options from the '
                                      f'dropdown element {element_to_log}')
-            log_options = []
-            for opt in options:
-                log_options.append(opt.text)
-            self.context.logger.info(f'The dropdown options are: { log_options}')
-            return options
+            self.context.logger.info(f'The dropdown options are: {[opt["text"] for opt in options]}')
+            return [opt['element'] for opt in options]
         except ValueError:
             self.context.logger.error(
                 'String pattern is None.'
@@ -208,10 +368,11 @@ class SelectAction:
             if locator is None:
                 raise ValueError('Please provide the string pattern or a web element to perform an action')
 
-            element, element_to_log = (locator, locator.get_attribute('outerHTML')) \
-                if isinstance(locator, WebElement) \
-                else (Locator(self.context).get_element(locator, wait_state, True, timeout), locator)
-            option_text = Select(element).first_selected_option.text
+            element_to_log = locator.get_attribute('outerHTML') if isinstance(locator, WebElement) else locator
+            selected = [opt for opt in self._get_options(locator, False, wait_state, timeout) if opt['selected']]
+            if not selected:
+                raise NoSuchElementException('No options are selected')
+            option_text = selected[0]['text']
             self.context.logger.info(f'Successfully performed get first selected option call on the '
                                      f'dropdown element {element_to_log}. The selected option is `{option_text}`')
             return option_text
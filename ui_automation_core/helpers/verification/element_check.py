@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class ElementCheck(Enum):
+    """
+    Expectations that can be verified in a batch with Verify.check_all. The `expected` value of the entry is
+    the text for TEXT and TEXT_CONTAINS, a (name, value) tuple for ATTRIBUTE and the number of matching
+    elements for COUNT. It is ignored by the other checks.\n
+    USAGE: ElementCheck.VISIBLE
+    """
+    PRESENT = 'present'
+    NOT_PRESENT = 'notPresent'
+    VISIBLE = 'visible'
+    NOT_VISIBLE = 'notVisible'
+    SELECTED = 'selected'
+    ENABLED = 'enabled'
+    TEXT = 'text'
+    TEXT_CONTAINS = 'textContains'
+    ATTRIBUTE = 'attribute'
+    COUNT = 'count'
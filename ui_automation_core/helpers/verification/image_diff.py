@@ -0,0 +1,108 @@
+import io
+import os
+
+import numpy as np
+from PIL import Image
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Returns the device pixel rects [x, y, width, height] of all the elements matched by the queries (web elements
+# or [by, value] pairs), relative to the origin element if given else to the viewport.
+JsExecutor.register('screenRects', """function (queries, origin) {
+    var ratio = window.devicePixelRatio || 1;
+    var base = origin ? origin.getBoundingClientRect() : {left: 0, top: 0};
+    var rects = [];
+    queries.forEach(function (query) {
+        var elements = Array.isArray(query) ? window.__uiac.fns.findAll(query[0], query[1]) : [query];
+        elements.forEach(function (element) {
+            var rect = element.getBoundingClientRect();
+            rects.push([Math.floor((rect.left - base.left) * ratio), Math.floor((rect.top - base.top) * ratio),
+                        Math.ceil(rect.width * ratio), Math.ceil(rect.height * ratio)]);
+        });
+    });
+    return rects;
+}""")
+
+
+class ImageDiff:
+    """
+    Compares two images decoded into numpy arrays. A pixel differs when any channel differs by more than
+    the tolerance, pixels inside the ignore regions are masked out. All steps are whole-array operations,
+    so a 4K capture is compared in a fraction of a second.
+
+    USAGE: report = ImageDiff.compare(ImageDiff.load(png_bytes), ImageDiff.load('baselines/home.png'), tolerance=8)
+    """
+
+    @staticmethod
+    def load(source):
+        """
+        Decodes an image into an RGB array.
+
+        :param source: PNG bytes, a file path or an array.
+        :return: numpy uint8 array of shape (height, width, 3)
+        """
+        if isinstance(source, np.ndarray):
+            return source[..., :3]
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        with Image.open(source) as image:
+            return np.asarray(image.convert('RGB'))
+
+    @staticmethod
+    def save(array, file_path):
+        """
+        Writes an RGB array as a PNG file.
+
+        :param array: numpy uint8 array of shape (height, width, 3)
+        :param file_path: Path+filename.png
+        """
+        parent_dir = os.path.dirname(file_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        Image.fromarray(array).save(file_path)
+
+    @staticmethod
+    def compare(actual, baseline, tolerance=0, ignore_regions=None, max_diff_ratio=0.0):
+        """
+        Compares the actual image against the baseline.
+
+        :param actual: numpy uint8 array of shape (height, width, 3)
+        :param baseline: numpy uint8 array of shape (height, width, 3)
+        :param tolerance: allowed difference per channel, a number or a (red, green, blue) tuple.
+        :param ignore_regions: list of (x, y, width, height) rects in pixels that are not compared.
+        :param max_diff_ratio: allowed ratio of differing pixels to compared pixels, 0.0 to 1.0.
+        :return: A dictionary with the keys matches, diff_pixels, diff_ratio, max_delta, size_mismatch
+         and heatmap (uint8 array of shape (height, width) scaled to the largest channel difference, None on a
+         size mismatch).
+        """
+        if actual.shape != baseline.shape:
+            return {'matches': False, 'diff_pixels': None, 'diff_ratio': None, 'max_delta': None,
+                    'size_mismatch': (actual.shape[1::-1], baseline.shape[1::-1]), 'heatmap': None}
+        delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16))
+        tolerance = np.asarray(tolerance, dtype=np.int16)
+        mask = np.ones(actual.shape[:2], dtype=bool)
+        for x, y, width, height in ignore_regions or ():
+            mask[max(y, 0):max(y + height, 0), max(x, 0):max(x + width, 0)] = False
+        differs = (delta > tolerance).any(axis=2) & mask
+        heatmap = delta.max(axis=2).astype(np.uint8)
+        heatmap[~mask] = 0
+        diff_pixels = int(np.count_nonzero(differs))
+        compared = int(np.count_nonzero(mask))
+        diff_ratio = diff_pixels / compared if compared else 0.0
+        return {'matches': diff_ratio <= max_diff_ratio, 'diff_pixels': diff_pixels, 'diff_ratio': diff_ratio,
+                'max_delta': int(heatmap.max()) if heatmap.size else 0, 'size_mismatch': None, 'heatmap': heatmap}
+
+    @staticmethod
+    def render_heatmap(actual, heatmap):
+        """
+        Renders the heatmap in red over a dimmed grayscale copy of the actual image.
+
+        :param actual: numpy uint8 array of shape (height, width, 3)
+        :param heatmap: heatmap returned by `compare`
+        :return: numpy uint8 array of shape (height, width, 3)
+        """
+        gray = (actual.mean(axis=2) * 0.3).astype(np.uint8)
+        intensity = heatmap.astype(np.uint16) * 255 // max(int(heatmap.max()), 1)
+        rendered = np.repeat(gray[..., np.newaxis], 3, axis=2)
+        rendered[..., 0] = np.maximum(gray, intensity.astype(np.uint8))
+        return rendered
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+
+from ui_automation_core.helpers.js_executor import JsExecutor
+
+# Walks the scope element and its descendants in document order and returns, per element, a key made of the
+# tag names and sibling indices from the scope, the rect relative to the scope, the visibility flag and the
+# requested computed styles.
+JsExecutor.register('layoutSnapshot', """function (scope, styles) {
+    var skip = {SCRIPT: 1, STYLE: 1, NOSCRIPT: 1, TEMPLATE: 1};
+    var origin = scope.getBoundingClientRect();
+    var keys = [], rects = [], visible = [], values = [];
+    var visit = function (element, key) {
+        var rect = element.getBoundingClientRect();
+        var style = window.getComputedStyle(element);
+        keys.push(key);
+        rects.push(Math.round(rect.left - origin.left), Math.round(rect.top - origin.top),
+                   Math.round(rect.width), Math.round(rect.height));
+        visible.push(style.display !== 'none' && style.visibility !== 'hidden' && parseFloat(style.opacity) > 0 &&
+                     rect.width > 0 && rect.height > 0);
+        values.push(styles.map(function (name) { return style.getPropertyValue(name); }));
+        var counts = {};
+        for (var child = element.firstElementChild; child; child = child.nextElementSibling) {
+            if (skip[child.tagName]) {
+                continue;
+            }
+            var tag = child.tagName.toLowerCase();
+            counts[tag] = (counts[tag] || 0) + 1;
+            visit(child, key + '/' + tag + ':' + (counts[tag] - 1));
+        }
+    };
+    visit(scope, scope.tagName.toLowerCase());
+    return {keys: keys, rects: rects, visible: visible, styles: values};
+}""")
+
+
+class LayoutSnapshot:
+    """
+    Geometry of every element under a scope: a key per element (its tag path from the scope), the rect
+    (x, y, width, height) relative to the scope, the visibility flag and a few computed styles.
+    Snapshots are saved as compressed numpy archives and compared column-wise, so diffing thousands of
+    elements costs a handful of array operations.
+
+    USAGE: LayoutSnapshot.capture(context, element).save('baselines/header.npz')
+    """
+    key_styles = ('display', 'position', 'font-size', 'font-weight', 'color', 'background-color')
+
+    def __init__(self, keys, rects, visible, styles, style_names=None):
+        self.keys = np.asarray(keys, dtype=str)
+        self.rects = np.asarray(rects, dtype=np.int32).reshape(-1, 4)
+        self.visible = np.asarray(visible, dtype=bool)
+        self.style_names = tuple(self.key_styles if style_names is None else style_names)
+        self.styles = np.asarray(styles, dtype=str).reshape(len(self.keys), len(self.style_names))
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def capture(cls, context, scope):
+        """
+        Captures the snapshot of the scope element in a single script call.
+
+        :param context: Holds contextual information
+        :param scope: Web element whose subtree is captured.
+        :return: LayoutSnapshot
+        """
+        data = JsExecutor(context).call('layoutSnapshot', scope, list(cls.key_styles))
+        return cls(data['keys'], data['rects'], data['visible'], data['styles'])
+
+    def save(self, file_path):
+        """
+        Writes the snapshot to a compressed .npz file.
+
+        :param file_path: Path+filename.npz where the snapshot should be saved.
+        """
+        parent_dir = os.path.dirname(file_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(f, version=1, keys=self.keys, rects=self.rects, visible=self.visible,
+                                styles=self.styles, style_names=np.asarray(self.style_names, dtype=str))
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Reads a snapshot written by `save`.
+
+        :param file_path: Path+filename.npz of the snapshot.
+        :return: LayoutSnapshot
+        """
+        with np.load(file_path) as data:
+            if int(data['version']) != 1:
+                raise ValueError(f'Unsupported layout baseline version `{int(data["version"])}` in {file_path}.')
+            return cls(data['keys'], data['rects'], data['visible'], data['styles'], list(data['style_names']))
+
+    def diff(self, baseline, position_tolerance=2, size_tolerance=2):
+        """
+        Compares this snapshot against a baseline. Elements are matched by key.
+
+        :param baseline: LayoutSnapshot to compare against.
+        :param position_tolerance: allowed difference of x and y in pixels.
+        :param size_tolerance: allowed difference of width and height in pixels.
+        :return: A dictionary with the keys missing and added (lists of element keys) and changed, a list of
+         dictionaries with the keys key, baseline and actual (the rect, visibility and styles that differ).
+        """
+        if self.style_names != baseline.style_names:
+            raise ValueError(f'The baseline captured the styles {baseline.style_names}, '
+                             f'expected {self.style_names}.')
+        common, base_idx, cur_idx = np.intersect1d(baseline.keys, self.keys, assume_unique=True,
+                                                   return_indices=True)
+        delta = np.abs(self.rects[cur_idx] - baseline.rects[base_idx])
+        rect_changed = (delta[:, :2] > position_tolerance).any(axis=1) | (delta[:, 2:] > size_tolerance).any(axis=1)
+        visible_changed = self.visible[cur_idx] != baseline.visible[base_idx]
+        styles_changed = self.styles[cur_idx] != baseline.styles[base_idx]
+        changed_rows = np.flatnonzero(rect_changed | visible_changed | styles_changed.any(axis=1))
+
+        changed = []
+        for row in changed_rows:
+            b, c = base_idx[row], cur_idx[row]
+            expected, actual = {}, {}
+            if rect_changed[row]:
+                expected['rect'], actual['rect'] = baseline.rects[b].tolist(), self.rects[c].tolist()
+            if visible_changed[row]:
+                expected['visible'], actual['visible'] = bool(baseline.visible[b]), bool(self.visible[c])
+            for column in np.flatnonzero(styles_changed[row]):
+                name = self.style_names[column]
+                expected[name], actual[name] = str(baseline.styles[b, column]), str(self.styles[c, column])
+            changed.append({'key': str(common[row]), 'baseline': expected, 'actual': actual})
+        return {'missing': np.setdiff1d(baseline.keys, self.keys).tolist(),
+                'added': np.setdiff1d(self.keys, baseline.keys).tolist(),
+                'changed': changed}
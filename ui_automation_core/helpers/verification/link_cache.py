@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LinkStatusCache:
+    """
+    Caches link check results by normalized URL so that a link shared by many pages, e.g. in the header or
+    footer, is checked once per suite run. Entries expire after `success_ttl` or `failure_ttl` seconds depending
+    on the result, and the least recently used entries are evicted beyond `max_size`.
+
+    Results are kept in memory and, if a `db_path` is given, in an SQLite file that is shared across runs.
+
+    USAGE: LinkStatusCache.default_db_path = '.ui_automation/link_status.sqlite'\n
+           LinkChecker(context, cache=LinkStatusCache.shared())
+    """
+    success_ttl = 3600
+    failure_ttl = 300
+    max_size = 10000
+    # On-disk store used by `shared`, None to keep the shared cache in memory only
+    default_db_path = None
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path=None, success_ttl=None, failure_ttl=None, max_size=None, clock=time.time):
+        self.success_ttl = self.success_ttl if success_ttl is None else success_ttl
+        self.failure_ttl = self.failure_ttl if failure_ttl is None else failure_ttl
+        self.max_size = self.max_size if max_size is None else max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path is not None:
+            parent_dir = os.path.dirname(db_path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS link_status '
+                             '(url TEXT PRIMARY KEY, status TEXT NOT NULL, expires_at REAL NOT NULL, '
+                             'last_used REAL NOT NULL)')
+            self._prune_db()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the process-wide cache, created on first use with `default_db_path`.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(cls.default_db_path)
+            return cls._shared
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _prune_db(self):
+        # Called with the lock held, or before the cache is shared
+        now = self._clock()
+        with self._db:
+            self._db.execute('DELETE FROM link_status WHERE expires_at <= ?', (now,))
+            self._db.execute('DELETE FROM link_status WHERE url NOT IN '
+                             '(SELECT url FROM link_status ORDER BY last_used DESC LIMIT ?)', (self.max_size,))
+
+    def _remember(self, url, expires_at, status):
+        self._entries[url] = (expires_at, status)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, url):
+        """
+        Returns the cached status of the URL, None if it is unknown or expired.
+
+        :param url: normalized URL
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None and self._db is not None:
+                row = self._db.execute('SELECT expires_at, status FROM link_status WHERE url = ?', (url,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(url, *entry)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            if self._db is not None:
+                # Keep the on-disk store in least recently used order as well, for the pruning
+                with self._db:
+                    self._db.execute('UPDATE link_status SET last_used = ? WHERE url = ?', (now, url))
+            return entry[1]
+
+    def put(self, url, status):
+        """
+        Stores the status of the URL with the TTL matching its `ok` flag.
+
+        :param url: normalized URL
+        :param status: the status dictionary reported by LinkChecker.check_url
+        """
+        now = self._clock()
+        expires_at = now + (self.success_ttl if status.get('ok') else self.failure_ttl)
+        with self._lock:
+            self._remember(url, expires_at, status)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('INSERT OR REPLACE INTO link_status (url, status, expires_at, last_used) '
+                                     'VALUES (?, ?, ?, ?)', (url, json.dumps(status), expires_at, now))
+
+    def clear(self):
+        """
+        Removes all entries, including the ones in the on-disk store.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('DELETE FROM link_status')
+
+    def close(self):
+        """
+        Closes the on-disk store.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._prune_db()
+                self._db.close()
+                self._db = None
@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LinkChecker:
+    """
+    Checks the accessibility of many URLs concurrently over a pooled HTTP session.
+
+    URLs are normalized and deduplicated first, each URL is requested with HEAD and falls back to a
+    streamed GET (the body is not downloaded) when the server rejects or fails the HEAD request.
+    The number of parallel requests per host is limited. If a cache is given, URLs with a cached result are
+    not requested again. A session created by the checker is closed by `close` or on leaving the `with` block.
+
+    USAGE: with LinkChecker(context) as checker:\n
+               checker.check(['https://example.com/', 'https://example.com/about'])
+    """
+    max_workers = 16
+    per_host_limit = 4
+    # (connect timeout, read timeout) in seconds
+    timeout = (5, 10)
+
+    def __init__(self, context, session=None, cache=None):
+        self.context = context
+        self.cache = cache
+        # A session passed in belongs to the caller and is not closed by the checker
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session()
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def close(self):
+        """
+        Closes the pooled session if the checker created it.
+        """
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def normalize_url(url):
+        """
+        Normalizes a link for deduplication: drops the fragment, lower-cases scheme and host and removes the
+        default port.
+
+        :param url: absolute URL
+        :return: the normalized URL, or None if it is not an http(s) URL
+        """
+        if not url:
+            return None
+        url = urldefrag(url.strip())[0]
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            return None
+        netloc = parts.hostname.lower()
+        if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+            netloc = f'{netloc}:{parts.port}'
+        if parts.username:
+            netloc = f'{parts.username}{":" + parts.password if parts.password else ""}@{netloc}'
+        return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def check_url(self, url):
+        """
+        Checks a single normalized URL.
+
+        :param url: normalized URL
+        :return: a dictionary with the keys status_code, ok, method, error, elapsed (seconds) and cached
+        """
+        start = time.monotonic()
+        status = {'status_code': None, 'ok': False, 'method': 'HEAD', 'error': None, 'elapsed': None,
+                  'cached': False}
+        with self._host_limit(url):
+            try:
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                status['status_code'] = response.status_code
+            except requests.RequestException:
+                pass
+            if status['status_code'] is None or status['status_code'] >= 400:
+                # Some servers do not implement, protect or drop HEAD, confirm with a GET without the body
+                status['method'] = 'GET'
+                try:
+                    with self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True) as response:
+                        status['status_code'] = response.status_code
+                except requests.RequestException as ex:
+                    status['status_code'] = None
+                    status['error'] = f'{type(ex).__name__}: {ex}'
+        status['ok'] = status['status_code'] is not None and status['status_code'] < 400
+        status['elapsed'] = round(time.monotonic() - start, 3)
+        if self.cache is not None:
+            self.cache.put(url, status)
+        return status
+
+    def check(self, urls):
+        """
+        Checks all the URLs concurrently. Links that are not http(s), e.g. mailto: or javascript:, are skipped.
+
+        :param urls: iterable of absolute URLs
+        :return: a dictionary of normalized URL to its status, see check_url
+        """
+        unique_urls = []
+        seen = set()
+        for url in urls:
+            normalized = self.normalize_url(url)
+            if normalized is not None and normalized not in seen:
+                seen.add(normalized)
+                unique_urls.append(normalized)
+        report = {}
+        if self.cache is not None:
+            for url in unique_urls:
+                cached = self.cache.get(url)
+                if cached is not None:
+                    report[url] = dict(cached, cached=True)
+        to_check = [url for url in unique_urls if url not in report]
+        self.context.logger.info(f'Checking {len(to_check)} of {len(unique_urls)} unique links, '
+                                 f'{len(report)} found in the cache.')
+        if to_check:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_check))) as executor:
+                report.update(zip(to_check, executor.map(self.check_url, to_check)))
+        return {url: report[url] for url in unique_urls}
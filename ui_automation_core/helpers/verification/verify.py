@@ -1,67 +1,132 @@
-import requests
+import os
+import time
+
 from selenium.common.exceptions import NoAlertPresentException, TimeoutException
-from selenium.webdriver.common.alert import Alert
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
 from ui_automation_core.helpers.actions.action import Actions
+from ui_automation_core.helpers.js_executor import JsExecutor
 from ui_automation_core.helpers.select.select import SelectAction
+from ui_automation_core.helpers.verification.element_check import ElementCheck
+from ui_automation_core.helpers.verification.image_diff import ImageDiff
+from ui_automation_core.helpers.verification.layout_baseline import LayoutSnapshot
+from ui_automation_core.helpers.verification.link_cache import LinkStatusCache
+from ui_automation_core.helpers.verification.link_checker import LinkChecker
 from ui_automation_core.helpers.web_element.locator import Locator
 from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
 
+JsExecutor.register('linkHrefs', """function () {
+    return Array.prototype.map.call(document.querySelectorAll('a[href]'), function (anchor) { return anchor.href; });
+}""")
+# Evaluates [query, check, expected] entries, where query is a web element or a [by, value] pair.
+# Returns a [passed, actual] pair per entry.
+JsExecutor.register('checkAll', """function (entries) {
+    var isVisible = function (element) {
+        var style = window.getComputedStyle(element);
+        return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) > 0 &&
+            !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+    };
+    var textOf = function (element) { return (element.innerText || element.textContent || '').trim(); };
+    return entries.map(function (entry) {
+        var query = entry[0], check = entry[1], expected = entry[2];
+        var elements = Array.isArray(query) ? window.__uiac.fns.findAll(query[0], query[1]) : [query];
+        var element = elements[0];
+        switch (check) {
+            case 'present':
+                return [!!element, elements.length];
+            case 'notPresent':
+                return [!element, elements.length];
+            case 'visible':
+                return [!!element && isVisible(element), element ? isVisible(element) : null];
+            case 'notVisible':
+                return [!element || !isVisible(element), element ? isVisible(element) : null];
+            case 'count':
+                return [elements.length === expected, elements.length];
+        }
+        if (!element) {
+            return [false, null];
+        }
+        switch (check) {
+            case 'selected':
+                return [!!(element.checked || element.selected), !!(element.checked || element.selected)];
+            case 'enabled':
+                return [!element.disabled, !element.disabled];
+            case 'text':
+                return [textOf(element) === String(expected).trim(), textOf(element)];
+            case 'textContains':
+                return [textOf(element).indexOf(expected) !== -1, textOf(element)];
+            case 'attribute':
+                var value = element.getAttribute(expected[0]);
+                return [value !== null && value.trim().toLowerCase() === String(expected[1]).trim().toLowerCase(),
+                        value];
+        }
+        throw new Error('Unsupported check ' + check);
+    });
+}""")
+
 
 class Verify:
     def __init__(self, context):
         self.context = context
+        self.layout_report = None
+        self.screenshot_report = None
 
     default_timeout = 3
+    check_all_poll_interval = 0.25
+    default_alert_grace_period = 0
+    alert_poll_interval = 0.05
+
+    # Probe Alert
+    def probe_alert(self, grace_period=0):
+        """
+        Checks if an alert is present without an explicit wait. The first probe is immediate, within the grace
+        period the probe is repeated every `alert_poll_interval` seconds until an alert shows up.
+
+        :param grace_period: time in seconds to keep probing for an alert that is about to show up, 0 to probe once.
+        :return: True if an alert is present else False.
+        """
+        deadline = time.monotonic() + grace_period
+        while True:
+            try:
+                # switch_to.alert reads the alert text, which fails right away when there is no alert
+                self.context.driver.switch_to.alert
+                return True
+            except NoAlertPresentException:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(self.alert_poll_interval)
 
     # Verify Alert Not Present
     def is_alert_not_present(self, timeout=None):
         """
-        Verify if alert does not present
+        Verify if alert does not present. The check returns immediately when there is no grace period.
 
-        :param timeout: wait time before throwing any exception.
-                    If None, timeout is set to default timeout.
+        :param timeout: grace period in seconds during which an alert showing up fails the check.
+                    If None, timeout is set to the default alert grace period (0).
         :return: True if alert does not present else False.
         """
-        is_alert_not_present = True
-        timeout = self.default_timeout if timeout is None else timeout
-        try:
-            WebDriverWait(self.context.driver, timeout).until(EC.alert_is_present())
-            alert = self.context.driver.switch_to.alert
-            if isinstance(alert, Alert):
-                self.context.logger.error(
-                    f'Alert is present on webpage.')
-                is_alert_not_present = False
-        except (NoAlertPresentException or TimeoutException) as ex:
-            self.context.logger.info(f'Alert is NOT present on webpage.')
-
-        return is_alert_not_present
+        timeout = self.default_alert_grace_period if timeout is None else timeout
+        if self.probe_alert(timeout):
+            self.context.logger.error(f'Alert is present on webpage.')
+            return False
+        self.context.logger.info(f'Alert is NOT present on webpage.')
+        return True
 
     # Verify Alert Present
     def is_alert_present(self, timeout=None):
         """
-        Verify if alert does present
+        Verify if alert does present. The check returns as soon as the alert is found.
 
-        :param timeout: wait time before throwing any exception.
+        :param timeout: wait time for the alert to show up.
                     If None, timeout is set to default timeout.
         :return: True if alert does present else False.
         """
-        is_alert_present = False
         timeout = self.default_timeout if timeout is None else timeout
-        try:
-            WebDriverWait(self.context.driver, timeout).until(EC.alert_is_present())
-            alert = self.context.driver.switch_to.alert
-            if isinstance(alert, Alert):
-                self.context.logger.info(
-                    f'Alert is present on webpage.')
-                is_alert_present = True
-        except (NoAlertPresentException or TimeoutException) as ex:
-            self.context.logger.error(f'Alert is NOT present on webpage.')
-
-        return is_alert_present
+        if self.probe_alert(timeout):
+            self.context.logger.info(f'Alert is present on webpage.')
+            return True
+        self.context.logger.error(f'Alert is NOT present on webpage.')
+        return False
 
     # Verify Element Attribute Value
     def is_attribute_value(self, locator, attribute, value):
@@ -333,41 +398,239 @@ class Verify:
             self.context.logger.exception(ex)
             raise Exception(f'Unable to perform the visibility check on the element `{_ele_to_log}`. Error:{ex}.')
 
-    # Verify All Links On Current Page Accessible
-    def are_all_links_accessible(self):
+    # Verify Many Element Expectations
+    def check_all(self, expectations, timeout=None):
         """
-        Verify if all links (URLs) on the current page are accessible.
-        :return: True if all links (URLs) on the current page are accessible else False
+        Verify many element expectations at once. All of them are evaluated browser-side in a single call per
+        poll until they all pass or the timeout expires.
+
+        :param expectations: list of (locator, check, expected) tuples, where locator is a web element or a
+                locator string, check is an instance of ElementCheck enum class and expected is the expected value
+                of the check, see ElementCheck. The expected value can be omitted for the checks that ignore it.
+        :param timeout: wait time for all expectations to pass. If None, timeout is set to default timeout.
+        :return: A dictionary with the keys passed (True if all expectations passed), polls, elapsed and
+         results, a list of dictionaries with the keys locator, check, expected, passed and actual in the order
+         of the expectations.
+
+        USAGE: check_all([('#title', ElementCheck.TEXT, 'Welcome'), ('#spinner', ElementCheck.NOT_VISIBLE),
+                          ('a.logo', ElementCheck.ATTRIBUTE, ('href', '/home'))])
         """
-        all_links_accessible = True
-        broken_links = 0
-        self.context.logger.info('Trying to obtain all the links on the web page.')
+        timeout = self.default_timeout if timeout is None else timeout
         try:
-            links = Locator(self.context).get_elements('<a>')
-            self.context.logger.info(f'Successfully obtained {len(links)} links on the current web page.')
-            for link in links:
-                link_text = link.get_attribute('href').strip()
-                if link_text is not (None or ""):
-                    r = requests.get(link_text)
-                    self.context.logger.info(f'URL:{link_text}, Status Code: {r.status_code}.')
-                    if r.status_code != 200:
-                        broken_links += 1
-                        all_links_accessible = False
-            if all_links_accessible:
-                self.context.logger.info(
-                    'Successfully verified if all links (URLs) on the current page are accessible '
-                    'and all the links found to be accessible.')
+            if not expectations:
+                raise ValueError('Please provide one or more expectations to verify.')
+            entries = []
+            for expectation in expectations:
+                locator, check = expectation[0], expectation[1]
+                expected = expectation[2] if len(expectation) > 2 else None
+                if not isinstance(check, ElementCheck):
+                    raise TypeError(f'{repr(check)} must be an instance of ElementCheck enum class.')
+                if check == ElementCheck.ATTRIBUTE and (not isinstance(expected, (tuple, list)) or len(expected) != 2):
+                    raise ValueError(f'The expected value of the attribute check on `{locator}` must be a '
+                                     f'(name, value) tuple.')
+                query = locator if isinstance(locator, WebElement) \
+                    else list(Locator(self.context).get_by_locator(locator))
+                entries.append([query, check.value, expected])
+
+            start = time.monotonic()
+            polls = 0
+            while True:
+                outcomes = JsExecutor(self.context).call('checkAll', entries)
+                polls += 1
+                if all(passed for passed, _ in outcomes) or time.monotonic() - start >= timeout:
+                    break
+                time.sleep(self.check_all_poll_interval)
+
+            results = [{'locator': expectation[0], 'check': entry[1], 'expected': entry[2],
+                        'passed': passed, 'actual': actual}
+                       for expectation, entry, (passed, actual) in zip(expectations, entries, outcomes)]
+            for result in results:
+                if not result['passed']:
+                    self.context.logger.error(f'The check `{result["check"]}` failed on `{result["locator"]}`. '
+                                              f'Expected: `{result["expected"]}`, actual: `{result["actual"]}`.')
+            failed = sum(1 for result in results if not result['passed'])
+            report = {'passed': failed == 0, 'polls': polls, 'elapsed': round(time.monotonic() - start, 3),
+                      'results': results}
+            if failed == 0:
+                self.context.logger.info(f'Successfully verified all {len(results)} expectations '
+                                         f'in {polls} poll(s).')
             else:
-                self.context.logger.error(
-                    f'Successfully verified if all links (URLs) on the current page are accessible'
-                    f' and found {broken_links} broken links.')
-            return all_links_accessible
+                self.context.logger.error(f'{failed} of {len(results)} expectations failed after {timeout} seconds.')
+            return report
+        except ValueError as val_ex:
+            self.context.logger.error('An ValueError occurred.')
+            self.context.logger.exception(val_ex)
+            raise
+        except TypeError as type_ex:
+            self.context.logger.error('An TypeError occurred.')
+            self.context.logger.exception(type_ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(f'Unable to verify the {len(expectations)} element expectations.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to verify the {len(expectations)} element expectations. Error: {ex}')
+
+    # Verify Layout Matches Baseline
+    def layout_matches_baseline(self, scope_locator, baseline_path, position_tolerance=2, size_tolerance=2,
+                                update=False, timeout=None):
+        """
+        Verify that the layout of the elements under the scope matches the baseline file. The rects, visibility
+        and key computed styles of all elements are captured in a single call. If the baseline file does not
+        exist yet, it is written and the check passes. The differences are kept in `layout_report`.
+
+        :param scope_locator: web element or a locator string of the element whose subtree is compared.
+        :param baseline_path: Path+filename.npz of the baseline.
+        :param position_tolerance: allowed difference of x and y in pixels.
+        :param size_tolerance: allowed difference of width and height in pixels.
+        :param update: True to overwrite the baseline with the current layout.
+        :param timeout: wait time for the scope element before throwing any exception.
+                    If None, timeout is set to default timeout.
+        :return: True if the layout matches the baseline else False.
+        """
+        self.layout_report = None
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            scope = scope_locator if isinstance(scope_locator, WebElement) \
+                else Locator(self.context).get_element(scope_locator, ElementWaitState.PRESENT, True, timeout)
+            snapshot = LayoutSnapshot.capture(self.context, scope)
+            if update or not os.path.exists(baseline_path):
+                snapshot.save(baseline_path)
+                self.context.logger.info(f'Saved the layout baseline of `{scope_locator}` with {len(snapshot)} '
+                                         f'elements to {baseline_path}.')
+                return True
+            self.layout_report = snapshot.diff(LayoutSnapshot.load(baseline_path), position_tolerance,
+                                               size_tolerance)
+            missing, added, changed = (self.layout_report[key] for key in ('missing', 'added', 'changed'))
+            if not (missing or added or changed):
+                self.context.logger.info(f'Successfully verified the layout of `{scope_locator}` '
+                                         f'({len(snapshot)} elements) against {baseline_path}.')
+                return True
+            for change in changed[:20]:
+                self.context.logger.error(f'Layout of `{change["key"]}` changed. '
+                                          f'Baseline: {change["baseline"]}, actual: {change["actual"]}.')
+            self.context.logger.error(f'The layout of `{scope_locator}` does not match {baseline_path}: '
+                                      f'{len(changed)} changed, {len(missing)} missing and {len(added)} added '
+                                      f'elements.')
+            return False
+        except ValueError as val_ex:
+            self.context.logger.error('An ValueError occurred.')
+            self.context.logger.exception(val_ex)
+            raise
+        except Exception as ex:
+            self.context.logger.error(f'Unable to verify the layout of `{scope_locator}` against {baseline_path}.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to verify the layout of `{scope_locator}` against {baseline_path}. '
+                            f'Error: {ex}')
+
+    # Verify Screenshot Matches Baseline
+    def screenshot_matches(self, baseline_path, locator=None, ignore_locators=None, tolerance=0, max_diff_ratio=0.0,
+                           diff_path=None, update=False, timeout=None):
+        """
+        Verify that the screenshot of the page or of an element matches the baseline image. The capture is
+        compared in memory, pixel differences within the per-channel tolerance and pixels covered by the ignore
+        locators are not counted. If the baseline file does not exist yet, it is written and the check passes.
+        The comparison result is kept in `screenshot_report`.
+
+        :param baseline_path: Path+filename.png of the baseline.
+        :param locator: web element or a locator string whose screenshot is compared.
+                Default: None - To compare the screenshot of the page.
+        :param ignore_locators: list of web elements or locator strings of regions to ignore, e.g. clocks or ads.
+                All the elements matched by a locator string are ignored.
+        :param tolerance: allowed difference per channel, a number or a (red, green, blue) tuple.
+        :param max_diff_ratio: allowed ratio of differing pixels, 0.0 to 1.0.
+        :param diff_path: Path+filename.png where the diff heatmap is saved when the check fails.
+                Default: None - To not save the heatmap.
+        :param update: True to overwrite the baseline with the current screenshot.
+        :param timeout: wait time for the element before throwing any exception.
+                    If None, timeout is set to default timeout.
+        :return: True if the screenshot matches the baseline else False.
+        """
+        self.screenshot_report = None
+        timeout = self.default_timeout if timeout is None else timeout
+        target = 'page' if locator is None else f'element `{locator}`'
+        try:
+            element = None
+            if locator is not None:
+                element = locator if isinstance(locator, WebElement) \
+                    else Locator(self.context).get_element(locator, ElementWaitState.PRESENT, True, timeout)
+            ignore_regions = []
+            if ignore_locators:
+                queries = [loc if isinstance(loc, WebElement) else list(Locator(self.context).get_by_locator(loc))
+                           for loc in ignore_locators]
+                ignore_regions = JsExecutor(self.context).call('screenRects', queries, element)
+            png = self.context.driver.get_screenshot_as_png() if element is None else element.screenshot_as_png
+            actual = ImageDiff.load(png)
+            if update or not os.path.exists(baseline_path):
+                ImageDiff.save(actual, baseline_path)
+                self.context.logger.info(f'Saved the screenshot baseline of the {target} to {baseline_path}.')
+                return True
+            report = ImageDiff.compare(actual, ImageDiff.load(baseline_path), tolerance, ignore_regions,
+                                       max_diff_ratio)
+            self.screenshot_report = report
+            if report['size_mismatch']:
+                self.context.logger.error(f'The screenshot of the {target} has the size {report["size_mismatch"][0]}'
+                                          f', the baseline {baseline_path} has {report["size_mismatch"][1]}.')
+                return False
+            if report['matches']:
+                self.context.logger.info(f'Successfully matched the screenshot of the {target} with '
+                                         f'{baseline_path}, {report["diff_pixels"]} pixels differ.')
+                return True
+            self.context.logger.error(f'The screenshot of the {target} does not match {baseline_path}: '
+                                      f'{report["diff_pixels"]} pixels ({report["diff_ratio"]:.4%}) differ, '
+                                      f'max channel difference {report["max_delta"]}.')
+            if diff_path is not None:
+                ImageDiff.save(ImageDiff.render_heatmap(actual, report['heatmap']), diff_path)
+                self.context.logger.error(f'Saved the diff heatmap to {diff_path}.')
+            return False
+        except Exception as ex:
+            self.context.logger.error(f'Unable to compare the screenshot of the {target} with {baseline_path}.')
+            self.context.logger.exception(ex)
+            raise Exception(f'Unable to compare the screenshot of the {target} with {baseline_path}. Error: {ex}')
+
+    # Links Status Report Of Current Page
+    def get_links_status_report(self):
+        """
+        Checks all links (URLs) on the current page concurrently and reports the status of each of them.
+        The links are read in a single call, normalized and deduplicated before they are checked. Results are
+        cached in LinkStatusCache.shared() so that links already checked on other pages are not requested again.
+        :return: A dictionary of normalized URL to a dictionary with the keys status_code, ok, method, error
+         and elapsed
+        """
+        self.context.logger.info('Trying to obtain all the links on the web page.')
+        try:
+            hrefs = JsExecutor(self.context).call('linkHrefs')
+            self.context.logger.info(f'Successfully obtained {len(hrefs)} links on the current web page.')
+            with LinkChecker(self.context, cache=LinkStatusCache.shared()) as checker:
+                report = checker.check(hrefs)
+            for url, status in report.items():
+                if not status['ok']:
+                    self.context.logger.error(f'URL:{url}, Status Code: {status["status_code"]}, '
+                                              f'Error: {status["error"]}.')
+            return report
         except Exception as ex:
             self.context.logger.error(
-                f'Unable to verify if all links (URLs) on the current page are accessible.')
+                f'Unable to check the links (URLs) on the current page.')
             self.context.logger.exception(ex)
             raise Exception(
-                f'Unable to verify if all links (URLs) on the current page are accessible.')
+                f'Unable to check the links (URLs) on the current page. Error: {ex}')
+
+    # Verify All Links On Current Page Accessible
+    def are_all_links_accessible(self):
+        """
+        Verify if all links (URLs) on the current page are accessible.
+        :return: True if all links (URLs) on the current page are accessible else False
+        """
+        report = self.get_links_status_report()
+        broken_links = sum(1 for status in report.values() if not status['ok'])
+        if broken_links == 0:
+            self.context.logger.info(
+                'Successfully verified if all links (URLs) on the current page are accessible '
+                'and all the links found to be accessible.')
+        else:
+            self.context.logger.error(
+                f'Successfully verified if all links (URLs) on the current page are accessible'
+                f' and found {broken_links} broken links.')
+        return broken_links == 0
 
     # Verify Options Present
     def options_present(self, locator, options, timeout=None):
@@ -382,10 +645,8 @@ class Verify:
         self.context.logger.info('Trying to retrieve all dropdown options.')
         is_match = False
         try:
-            option_items = SelectAction(self.context).get_all_dropdown_options(locator=locator, timeout=timeout)
-            actual_options = []
-            for op_it in option_items:
-                actual_options.append(op_it.text)
+            option_items = SelectAction(self.context).get_dropdown_options_details(locator=locator, timeout=timeout)
+            actual_options = [op_it['text'] for op_it in option_items]
             if set(actual_options) == set(options):
                 self.context.logger.info(f'Successfully matched all options. '
                                          f'Actual options: {actual_options} and Expected options:{options}.')
@@ -6,8 +6,51 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from ui_automation_core.helpers.js_executor import JsExecutor
 from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
 
+# Browser-side counterpart of the By strategies, so helpers can resolve locator patterns without a round trip
+# per element. Returns all elements matching the strategy under root (the document if root is null).
+# Absolute XPaths are made relative to root, XPaths in parentheses must be relative already.
+JsExecutor.register('findAll', """function (by, value, root) {
+    root = root || document;
+    var toArray = function (items) { return Array.prototype.slice.call(items); };
+    var quote = function (text) { return '"' + text.replace(/["\\\\]/g, '\\\\$&').replace(/\\n/g, '\\\\a ') + '"'; };
+    switch (by) {
+        case 'id':
+            return toArray(root.querySelectorAll('[id=' + quote(value) + ']'));
+        case 'name':
+            return toArray(root.querySelectorAll('[name=' + quote(value) + ']'));
+        case 'class name':
+            return toArray(root.getElementsByClassName(value));
+        case 'tag name':
+            return toArray(root.getElementsByTagName(value));
+        case 'css selector':
+            return toArray(root.querySelectorAll(value));
+        case 'xpath':
+            if (root !== document) {
+                if (value.charAt(0) === '/') {
+                    value = '.' + value;
+                } else if (/^\\(\\s*\\//.test(value)) {
+                    throw new Error('The XPath ' + value + ' must be relative to the container, start it with `(.`');
+                }
+            }
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            return toArray(root.querySelectorAll('a')).filter(function (anchor) {
+                var text = (anchor.innerText || anchor.textContent).trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('Unsupported locator strategy ' + by);
+}""")
+
 
 class _ElementType(Enum):
     SINGLE = 1
@@ -29,7 +72,7 @@ class Locator:
     # any string starting with < followed by at least one character and ends with >
     _tag_regex = re.compile(r'^([<])(.+)([>])$')
     # any string starting with css (by ignoring case) followed by at least one character
-    _css_regex = re.compile(r'^(?i)([c][s][s][=])(.+)')
+    _css_regex = re.compile(r'(?i)^([c][s][s][=])(.+)')
     # any string starting with [ followed by at least one character and ends with ]
     _name_regex = re.compile(r'^([\[])(.+)[]]$')
 
@@ -84,6 +127,16 @@ class Locator:
                             'NAME - Begins with `[` and ends with `]`')
         return locator_string
 
+    def get_by_locator(self, locator_pattern):
+        """
+        Returns the By strategy and the value for the locator pattern, e.g. ('id', 'submit') for '#submit'.
+        The pair can be passed to javascript helpers that resolve elements browser-side.
+
+        :param locator_pattern: The string pattern used to find the element on a web page.
+        :return: locator method type and locator string as a tuple
+        """
+        return self._get_locator(locator_pattern)
+
     def _get_web_element(self, element_type, locator_string, wait_state, throw_exception, timeout):
         """
         Returns web element or web elements based on the element type
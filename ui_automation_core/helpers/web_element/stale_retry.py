@@ -0,0 +1,103 @@
+import threading
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from ui_automation_core.helpers.web_element.locator import Locator
+from ui_automation_core.helpers.web_element.wait_states import ElementWaitState
+
+
+class StaleElementRetry:
+    """
+    Re-resolves a web element and repeats the action when the element goes stale between the
+    lookup and the action, e.g. when a single page application re-renders the component.
+
+    Only locator strings can be re-resolved. Web elements passed in by the caller are used as they are.
+
+    USAGE: StaleElementRetry(context).run('#submit', lambda element: element.click())
+    """
+    # Total number of attempts (first attempt included) before the stale exception is raised
+    max_attempts = 3
+    # Wait time used to re-resolve the element after it went stale
+    retry_wait = 2
+    # Number of re-resolutions performed in this process, see `retry_total`
+    _retry_total = 0
+    _lock = threading.Lock()
+
+    def __init__(self, context):
+        self.context = context
+
+    @classmethod
+    def retry_total(cls):
+        """
+        Returns the number of times a stale element was re-resolved since the start or the last `reset`.
+        """
+        with cls._lock:
+            return cls._retry_total
+
+    @classmethod
+    def reset(cls):
+        """
+        Sets the number of re-resolutions back to zero.
+        """
+        with cls._lock:
+            cls._retry_total = 0
+
+    @classmethod
+    def _count_retry(cls):
+        with cls._lock:
+            cls._retry_total += 1
+            return cls._retry_total
+
+    def run(self, locator, action, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+        Resolves the element and performs the action on it, retrying on StaleElementReferenceException.
+
+        :param locator: Web element or a locator string on which the action need to be performed.
+        :param action: Callable that receives the web element and performs the action.
+        :param wait_state: The wait state for retrial. Choose state from ElementWaitState class.
+        :param timeout: wait time before throwing any exception for the first lookup.
+                    If None, timeout is set to default timeout.
+        :return: the value returned by the action
+        """
+        return self.run_all([locator], action, wait_state, timeout)
+
+    def run_all(self, locators, action, wait_state=ElementWaitState.PRESENT, timeout=None):
+        """
+        Resolves all the elements and performs the action on them, retrying on StaleElementReferenceException.
+        All the locator strings are re-resolved on a retry, so an action on several elements, e.g. a drag and
+        drop, takes at most `max_attempts` attempts whichever element went stale.
+
+        :param locators: Web elements or locator strings on which the action need to be performed.
+        :param action: Callable that receives the web elements, in the order of the locators, and performs
+                    the action.
+        :param wait_state: The wait state for retrial. Choose state from ElementWaitState class.
+        :param timeout: wait time before throwing any exception for the first lookup.
+                    If None, timeout is set to default timeout.
+        :return: the value returned by the action
+        """
+        def resolve(resolve_timeout):
+            return [locator if isinstance(locator, WebElement)
+                    else Locator(self.context).get_element(locator, wait_state, True, resolve_timeout)
+                    for locator in locators]
+
+        elements = resolve(timeout)
+        if all(isinstance(locator, WebElement) for locator in locators):
+            return action(*elements)
+        locators_to_log = ', '.join(f'`{locator}`' for locator in locators if not isinstance(locator, WebElement))
+        attempt = 1
+        while True:
+            try:
+                return action(*elements)
+            except StaleElementReferenceException:
+                if attempt >= self.max_attempts:
+                    self.context.logger.error(f'The element {locators_to_log} is still stale after '
+                                              f'{attempt} attempts.')
+                    raise
+                attempt += 1
+                retry_total = self._count_retry()
+                self.context.logger.warning(f'The element {locators_to_log} went stale. Re-resolving the element, '
+                                            f'attempt {attempt} of {self.max_attempts} '
+                                            f'({retry_total} stale re-resolutions so far).')
+                retry_timeout = self.retry_wait if timeout is None else min(timeout, self.retry_wait)
+                elements = resolve(retry_timeout)
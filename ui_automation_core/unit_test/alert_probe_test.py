@@ -0,0 +1,44 @@
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+
+from selenium.common.exceptions import NoAlertPresentException
+
+from ui_automation_core.helpers.verification.verify import Verify
+from ui_automation_core.unit_test.fakes import fake_context
+
+
+class _SwitchTo:
+
+    def __init__(self, appears_after=None):
+        self.appears_at = None if appears_after is None else time.monotonic() + appears_after
+        self.probes = 0
+
+    @property
+    def alert(self):
+        self.probes += 1
+        if self.appears_at is None or time.monotonic() < self.appears_at:
+            raise NoAlertPresentException('no such alert')
+        return object()
+
+
+class AlertProbeTest(TestCase):
+
+    def _verify(self, switch_to):
+        return Verify(fake_context(SimpleNamespace(switch_to=switch_to), 'alert_probe_test'))
+
+    def test_no_alert_is_reported_without_waiting(self):
+        switch_to = _SwitchTo()
+        start = time.monotonic()
+        self.assertTrue(self._verify(switch_to).is_alert_not_present())
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(1, switch_to.probes)
+
+    def test_present_alert_is_reported_without_waiting(self):
+        start = time.monotonic()
+        self.assertTrue(self._verify(_SwitchTo(appears_after=0)).is_alert_present())
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_grace_period_catches_a_late_alert(self):
+        self.assertFalse(self._verify(_SwitchTo(appears_after=0.1)).is_alert_not_present(timeout=1))
+        self.assertFalse(self._verify(_SwitchTo()).is_alert_present(timeout=0.1))
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from ui_automation_core.helpers.browser.browser_cookie import BrowserCookie
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+def _driver():
+    driver = FakeDriver('https://app.example.com/home')
+    driver.cookies = [{'name': 'ab_color', 'value': 'red'}, {'name': 'ab_size', 'value': 'l'},
+                      {'name': 'session', 'value': 's'}]
+    return driver
+
+
+class _FakeChromeDriver(FakeDriver):
+
+    def __init__(self):
+        super().__init__('https://app.example.com/home')
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+
+
+class BrowserCookieTest(TestCase):
+
+    def _cookie(self, driver):
+        return BrowserCookie(fake_context(driver, 'browser_cookie_test'))
+
+    def test_get_cookies_filters_by_predicate(self):
+        cookies = self._cookie(_driver()).get_cookies(lambda cookie: cookie['name'].startswith('ab_'))
+        self.assertEqual(['ab_color', 'ab_size'], [cookie['name'] for cookie in cookies])
+
+    def test_cookie_values_are_not_logged(self):
+        with self.assertLogs('browser_cookie_test', 'DEBUG') as logs:
+            self._cookie(FakeDriver()).add_a_cookie({'name': 'session', 'value': 's3cr3t'})
+        self.assertIn('session', logs.output[0])
+        self.assertNotIn('s3cr3t', ''.join(logs.output))
+
+    def test_add_cookies_in_one_devtools_call(self):
+        driver = _FakeChromeDriver()
+        added = self._cookie(driver).add_cookies([{'name': 'a', 'value': '1', 'expiry': 1700000000},
+                                                  {'name': 'b', 'value': '2', 'domain': '.example.com'}])
+        self.assertEqual(2, added)
+        self.assertEqual([('Network.setCookies', {'cookies': [
+            {'name': 'a', 'value': '1', 'expires': 1700000000, 'url': 'https://app.example.com/home'},
+            {'name': 'b', 'value': '2', 'domain': '.example.com'}]})], driver.calls)
+
+    def test_other_drivers_add_and_delete_one_by_one(self):
+        driver = _driver()
+        cookie = self._cookie(driver)
+        cookie.add_cookies([{'name': 'a', 'value': '1'}, {'name': 'b', 'value': '2'}])
+        cookie.delete_cookies(['a', 'b'])
+        self.assertEqual([('add_cookie', 'a'), ('add_cookie', 'b'), ('delete_cookie', 'a'), ('delete_cookie', 'b')],
+                         driver.calls)
@@ -0,0 +1,44 @@
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.verification.element_check import ElementCheck
+from ui_automation_core.helpers.verification.verify import Verify
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+def _driver(*outcomes):
+    return FakeDriver().answer('checkAll', *outcomes)
+
+
+class CheckAllTest(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(Verify, 'check_all_poll_interval', 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _verify(self, driver):
+        return Verify(fake_context(driver, 'check_all_test'))
+
+    def test_polls_until_all_expectations_pass(self):
+        driver = _driver([[True, 1], [False, 'Loading']], [[True, 1], [True, 'Welcome']])
+        report = self._verify(driver).check_all([('#logo', ElementCheck.PRESENT),
+                                                 ('#title', ElementCheck.TEXT, 'Welcome')], timeout=1)
+        self.assertTrue(report['passed'])
+        self.assertEqual(2, report['polls'])
+        self.assertEqual([['id', 'logo'], 'present', None], driver.helper_calls[0][1][0][0])
+        self.assertEqual('Welcome', report['results'][1]['actual'])
+
+    def test_reports_failures_after_timeout(self):
+        driver = _driver([[True, 1], [False, 'Loading']])
+        report = self._verify(driver).check_all([('#logo', ElementCheck.PRESENT),
+                                                 ('#title', ElementCheck.TEXT, 'Welcome')], timeout=0.05)
+        self.assertFalse(report['passed'])
+        self.assertEqual([True, False], [result['passed'] for result in report['results']])
+        self.assertEqual('text', report['results'][1]['check'])
+
+    def test_rejects_invalid_expectations(self):
+        verify = self._verify(_driver([]))
+        with self.assertRaises(TypeError):
+            verify.check_all([('#logo', 'present')])
+        with self.assertRaises(ValueError):
+            verify.check_all([('#logo', ElementCheck.ATTRIBUTE, 'href')])
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from selenium.common.exceptions import ElementClickInterceptedException, ElementNotInteractableException
+
+from ui_automation_core.helpers.actions.click_strategy import ClickStrategyStore
+from ui_automation_core.helpers.actions.mouse_action import ClickMethod, MouseAction
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class _StoreTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.store_path = os.path.join(self.tmp_dir.name, 'store', 'click_strategies.json')
+        patcher = mock.patch.object(ClickStrategyStore, 'store_path', self.store_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ClickStrategyStore.reset()
+        self.addCleanup(ClickStrategyStore.reset)
+
+    def _read(self):
+        with open(self.store_path, 'r') as f:
+            return json.load(f)
+
+
+class ClickStrategyStoreTest(_StoreTestCase):
+
+    def test_learned_methods_are_persisted_for_the_next_run(self):
+        ClickStrategyStore.remember('#submit', 'JAVA_SCRIPT_CLICK')
+        ClickStrategyStore.reset()
+        self.assertEqual('JAVA_SCRIPT_CLICK', ClickStrategyStore.get('#submit'))
+        self.assertEqual([], [name for name in os.listdir(os.path.dirname(self.store_path))
+                              if name.endswith('.tmp')])
+
+    def test_entries_saved_by_other_workers_are_merged(self):
+        ClickStrategyStore.remember('#submit', 'JAVA_SCRIPT_CLICK')
+        with open(self.store_path, 'w') as f:
+            json.dump({'#submit': 'JAVA_SCRIPT_CLICK', '#menu': 'ACTION_CHAIN_CLICK'}, f)
+        ClickStrategyStore.remember('#cancel', 'API_CLICK')
+        self.assertEqual({'#submit': 'JAVA_SCRIPT_CLICK', '#menu': 'ACTION_CHAIN_CLICK', '#cancel': 'API_CLICK'},
+                         self._read())
+
+
+@mock.patch('ui_automation_core.helpers.actions.mouse_action.ActionChains')
+@mock.patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+class AutoClickTest(_StoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.driver = FakeDriver().answer('click', None)
+        self.element = mock.MagicMock()
+
+    def _click(self, mock_locator):
+        mock_locator.return_value.get_element.return_value = self.element
+        MouseAction(fake_context(self.driver, 'click_strategy_test')).click_web_element('#submit', ClickMethod.AUTO)
+
+    def test_falls_back_in_order_and_remembers_the_method(self, mock_locator, mock_action_chains):
+        self.element.click.side_effect = ElementClickInterceptedException('overlay')
+        mock_action_chains.return_value.click.return_value.perform.side_effect = \
+            ElementNotInteractableException('not interactable')
+        self._click(mock_locator)
+        self.element.click.assert_called_once()
+        mock_action_chains.return_value.click.assert_called_once()
+        self.assertEqual([('click', [self.element])], self.driver.helper_calls)
+        self.assertEqual({'#submit': 'JAVA_SCRIPT_CLICK'}, self._read())
+
+    def test_starts_with_the_learned_method(self, mock_locator, mock_action_chains):
+        ClickStrategyStore.remember('#submit', 'JAVA_SCRIPT_CLICK')
+        self._click(mock_locator)
+        self.element.click.assert_not_called()
+        mock_action_chains.assert_not_called()
+        self.assertEqual(1, len(self.driver.helper_calls))
+
+    def test_raises_when_every_method_fails(self, mock_locator, mock_action_chains):
+        self.element.click.side_effect = ElementClickInterceptedException('overlay')
+        mock_action_chains.return_value.click.return_value.perform.side_effect = \
+            ElementNotInteractableException('not interactable')
+        self.driver.answer('click', mock.Mock(side_effect=Exception('javascript error')))
+        with self.assertRaises(Exception):
+            self._click(mock_locator)
+        self.assertFalse(os.path.exists(self.store_path))
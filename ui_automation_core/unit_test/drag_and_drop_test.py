@@ -0,0 +1,49 @@
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.actions.mouse_action import DragMethod, MouseAction
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+@mock.patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+class Html5DragAndDropTest(TestCase):
+
+    def setUp(self):
+        self.elements = {'#card': mock.MagicMock(name='card'), '#lane': mock.MagicMock(name='lane')}
+        self.driver = FakeDriver().answer('html5DragAndDrop', True)
+        self.context = fake_context(self.driver, 'drag_and_drop_test')
+
+    def _resolve(self, mock_locator):
+        mock_locator.return_value.get_element.side_effect = lambda locator, *args: self.elements[locator]
+
+    def test_drops_onto_the_target_with_drag_events(self, mock_locator):
+        self._resolve(mock_locator)
+        MouseAction(self.context).drag_and_drop_to_object('#card', '#lane', drag_method=DragMethod.HTML5)
+        self.assertEqual([('html5DragAndDrop', [self.elements['#card'], self.elements['#lane'], 0, 0])],
+                         self.driver.helper_calls)
+
+    def test_drops_at_an_offset(self, mock_locator):
+        self._resolve(mock_locator)
+        MouseAction(self.context).drag_and_drop_by_offset('#card', 30, -40, drag_method=DragMethod.HTML5)
+        self.assertEqual([('html5DragAndDrop', [self.elements['#card'], None, 30, -40])], self.driver.helper_calls)
+
+    def test_warns_when_the_target_does_not_accept_the_drop(self, mock_locator):
+        self._resolve(mock_locator)
+        self.driver.answer('html5DragAndDrop', False)
+        with self.assertLogs('drag_and_drop_test', 'WARNING') as logs:
+            MouseAction(self.context).drag_and_drop_to_object('#card', '#lane', drag_method=DragMethod.HTML5)
+        self.assertIn('did not cancel `dragover`', logs.output[0])
+
+    def test_rejects_an_invalid_drag_method_up_front(self, mock_locator):
+        with self.assertRaises(TypeError):
+            MouseAction(self.context).drag_and_drop_to_object('#card', '#lane', drag_method='html5')
+        with self.assertRaises(TypeError):
+            MouseAction(self.context).drag_and_drop_by_offset('#card', 1, 1, drag_method='html5')
+        mock_locator.assert_not_called()
+
+    def test_type_errors_of_the_drag_are_not_reported_as_invalid_method(self, mock_locator):
+        self._resolve(mock_locator)
+        self.driver.answer('html5DragAndDrop', mock.Mock(side_effect=TypeError('not a DragEvent')))
+        with self.assertRaises(Exception) as error:
+            MouseAction(self.context).drag_and_drop_to_object('#card', '#lane', drag_method=DragMethod.HTML5)
+        self.assertNotIsInstance(error.exception, TypeError)
+        self.assertIn('Unable to drag and drop', str(error.exception))
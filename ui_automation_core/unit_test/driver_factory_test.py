@@ -0,0 +1,77 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.browser.driver_factory import (BrowserType, DriverBinaryCache, DriverFactory,
+                                                               DriverPreset)
+from ui_automation_core.unit_test.fakes import FakeDriver
+
+
+class DriverBinaryCacheTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = DriverBinaryCache(os.path.join(self.tmp_dir.name, 'drivers'))
+        self.binary = os.path.join(self.tmp_dir.name, 'chromedriver')
+        with open(self.binary, 'w') as f:
+            f.write('#!/bin/sh\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_resolves_pinned_and_newest_versions_offline(self):
+        self.cache.add(BrowserType.CHROME, '9.0.1', self.binary)
+        self.cache.add(BrowserType.CHROME, '87.0.4280.88', self.binary)
+        with mock.patch.object(DriverBinaryCache, '_download', side_effect=AssertionError('network access')):
+            self.assertEqual(self.cache.path_for(BrowserType.CHROME, '9.0.1'),
+                             self.cache.resolve(BrowserType.CHROME, '9.0.1', allow_download=False))
+            self.assertEqual(self.cache.path_for(BrowserType.CHROME, '87.0.4280.88'),
+                             self.cache.resolve(BrowserType.CHROME, allow_download=False))
+
+    def test_missing_version_fails_when_offline(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.resolve(BrowserType.FIREFOX, '0.28.0', allow_download=False)
+
+    def test_downloaded_driver_is_added_to_the_cache(self):
+        with mock.patch.object(DriverBinaryCache, '_download', return_value=self.binary) as download:
+            path = self.cache.resolve(BrowserType.CHROME, '88.0.4324.96')
+            self.cache.resolve(BrowserType.CHROME, '88.0.4324.96')
+        self.assertEqual(1, download.call_count)
+        self.assertTrue(os.path.isfile(path))
+
+
+class DriverFactoryTest(TestCase):
+
+    def test_headless_preset_options(self):
+        capabilities = DriverFactory(BrowserType.CHROME, DriverPreset.HEADLESS).build_options().to_capabilities()
+        arguments = capabilities['goog:chromeOptions']['args']
+        self.assertIn('--headless', arguments)
+        self.assertIn('--disable-extensions', arguments)
+        self.assertIn('--disable-gpu', arguments)
+        self.assertIn('--window-size=1920,1080', arguments)
+        self.assertEqual('eager', capabilities['pageLoadStrategy'])
+
+    def test_default_preset_keeps_driver_defaults(self):
+        capabilities = DriverFactory(BrowserType.FIREFOX, DriverPreset.DEFAULT).build_options().to_capabilities()
+        self.assertNotIn('pageLoadStrategy', capabilities)
+
+    def test_page_load_strategy_overrides_the_preset(self):
+        capabilities = DriverFactory(BrowserType.FIREFOX, DriverPreset.DEFAULT, page_load_strategy='none') \
+            .build_options().to_capabilities()
+        self.assertEqual('none', capabilities['pageLoadStrategy'])
+        with self.assertRaises(ValueError):
+            DriverFactory(page_load_strategy='lazy')
+
+    def test_version_is_pinned_from_the_environment(self):
+        with mock.patch.dict(os.environ, {'UIAC_CHROMEDRIVER_VERSION': '87.0.4280.88', 'UIAC_DRIVER_OFFLINE': '1'}):
+            factory = DriverFactory()
+        self.assertEqual('87.0.4280.88', factory.version)
+        self.assertFalse(factory.allow_download)
+
+    def test_benchmark_reports_startup_times(self):
+        factory = DriverFactory(cache=mock.Mock())
+        with mock.patch.object(DriverFactory, 'create', return_value=FakeDriver()):
+            report = factory.benchmark(runs=2)
+        self.assertEqual(2, report['runs'])
+        self.assertEqual({'min', 'median', 'max'}, set(report['launch']))
+        self.assertLessEqual(report['first_page']['min'], report['first_page']['max'])
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ui_automation_core.helpers.browser.driver_pool import DriverPool
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class _FakeDriver(FakeDriver):
+
+    def __init__(self, heap_size=0):
+        super().__init__()
+        self.heap_size = heap_size
+        self.healthy = True
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+
+    @property
+    def window_handles(self):
+        if not self.healthy:
+            raise Exception('session deleted')
+        return self._window_handles
+
+    @window_handles.setter
+    def window_handles(self, handles):
+        self._window_handles = handles
+
+    @property
+    def cookies_deleted(self):
+        return self.calls.count(('delete_all_cookies',))
+
+    def close(self):
+        self.window_handles = self.window_handles[:-1]
+
+    def run_script(self, script, args):
+        return self.heap_size if 'usedJSHeapSize' in script else 'https://example.com'
+
+
+class _ChromeDriver(_FakeDriver):
+    """
+    Adds the DevTools protocol commands used by the reset.
+    """
+
+    def __init__(self, heap_size=0):
+        super().__init__(heap_size)
+        self.history = ['about:blank', 'https://example.com/login', 'https://sso.example.org/auth?next=1']
+        self.cdp_calls = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params.get('origin')))
+        if cmd == 'Page.getNavigationHistory':
+            return {'currentIndex': 0, 'entries': [{'url': url} for url in self.history]}
+        return {}
+
+
+class DriverPoolTest(TestCase):
+
+    def setUp(self):
+        self.launched = []
+        self.context = fake_context(None, 'driver_pool_test')
+
+    def _factory(self):
+        driver = _ChromeDriver()
+        self.launched.append(driver)
+        return driver
+
+    def test_released_driver_is_reset_and_reused(self):
+        pool = DriverPool(self._factory)
+        driver = pool.acquire(self.context)
+        driver.window_handles = ['main', 'popup']
+        pool.release(self.context)
+        self.assertIsNone(self.context.driver)
+        self.assertEqual(['main'], driver.window_handles)
+        self.assertEqual(1, driver.cookies_deleted)
+        self.assertEqual(['about:blank'], driver.visited)
+        self.assertIs(driver, pool.acquire(self.context))
+        self.assertEqual(1, len(self.launched))
+
+    def test_storage_of_every_visited_origin_is_cleared(self):
+        pool = DriverPool(self._factory)
+        driver = pool.acquire(self.context)
+        pool.release(self.context)
+        cleared = [origin for cmd, origin in driver.cdp_calls if cmd == 'Storage.clearDataForOrigin']
+        self.assertEqual(['https://example.com', 'https://sso.example.org'], cleared)
+
+    def test_drivers_without_devtools_are_not_reused(self):
+        pool = DriverPool(lambda: _FakeDriver())
+        driver = pool.acquire(self.context)
+        pool.release(self.context)
+        self.assertTrue(driver.quit_called)
+        self.assertEqual([], driver.visited)
+
+        pool.allow_partial_reset = True
+        driver = pool.acquire(self.context)
+        pool.release(self.context)
+        self.assertFalse(driver.quit_called)
+        self.assertEqual(['about:blank'], driver.visited)
+
+    def test_driver_is_recycled_after_max_uses(self):
+        pool = DriverPool(self._factory, max_uses=2)
+        for _ in range(3):
+            pool.acquire(self.context)
+            pool.release(self.context)
+        self.assertEqual(2, len(self.launched))
+        self.assertTrue(self.launched[0].quit_called)
+
+    def test_driver_is_recycled_above_memory_threshold(self):
+        pool = DriverPool(self._factory, max_memory_mb=100)
+        driver = pool.acquire(self.context)
+        driver.heap_size = 200 * 1024 * 1024
+        pool.release(self.context)
+        self.assertTrue(driver.quit_called)
+
+    def test_unhealthy_idle_driver_is_replaced(self):
+        pool = DriverPool(self._factory)
+        driver = pool.acquire(self.context)
+        pool.release(self.context)
+        driver.healthy = False
+        self.assertIsNot(driver, pool.acquire(self.context))
+        self.assertTrue(driver.quit_called)
+
+    def test_shutdown_quits_all_drivers(self):
+        pool = DriverPool(self._factory)
+        pool.acquire(self.context)
+        pool.acquire(fake_context(None, 'driver_pool_test'))
+        pool.release(self.context)
+        pool.shutdown()
+        self.assertTrue(all(driver.quit_called for driver in self.launched))
@@ -0,0 +1,96 @@
+import logging
+from types import SimpleNamespace
+
+
+def fake_context(driver=None, logger_name='unit_test', **attributes):
+    """
+    Returns a behave-like context holding the driver and a logger.
+    """
+    return SimpleNamespace(driver=driver, logger=logging.getLogger(logger_name), **attributes)
+
+
+class FakeDriver:
+    """
+    Minimal webdriver stand-in shared by the unit tests.
+
+    JsExecutor helper calls are answered with the answers queued by `answer`, the last one is repeated, and
+    recorded in `helper_calls` as (name, args). Other scripts are answered by `run_script`, which tests override
+    when a script matters. Every script sent is recorded in `scripts`, navigations in `visited` and cookie
+    operations in `calls`.
+
+    USAGE: driver = FakeDriver().answer('checkAll', [[True, 1]])\n
+           Verify(fake_context(driver)).check_all([('#logo', ElementCheck.PRESENT)])
+    """
+
+    def __init__(self, current_url='about:blank', injected=True):
+        self.current_url = current_url
+        # False to answer helper calls as a document without the helper bundle until the bundle is sent
+        self.injected = injected
+        self.answers = {}
+        self.helper_calls = []
+        self.scripts = []
+        self.visited = []
+        self.cookies = []
+        self.calls = []
+        self.window_handles = ['main']
+        self.quit_called = False
+
+    def answer(self, name, *answers):
+        """
+        Queues the answers of the helper. A single callable answer is called with the helper arguments instead.
+        """
+        self.answers[name] = list(answers)
+        return self
+
+    def _call_helper(self, script, args):
+        if script.startswith('(function'):
+            self.injected = True
+        if not self.injected:
+            return [False]
+        version, name, helper_args = args
+        self.helper_calls.append((name, helper_args))
+        answers = self.answers[name]
+        if len(answers) == 1 and callable(answers[0]):
+            return [True, answers[0](*helper_args)]
+        return [True, answers.pop(0) if len(answers) > 1 else answers[0]]
+
+    def _is_helper_call(self, args):
+        return len(args) == 3 and isinstance(args[1], str) and isinstance(args[2], list) and (
+            args[1] in self.answers or not self.injected)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if self._is_helper_call(args):
+            return self._call_helper(script, args)
+        return self.run_script(script, args)
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def run_script(self, script, args):
+        return None
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def refresh(self):
+        self.visited.append('refresh')
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie):
+        self.calls.append(('add_cookie', cookie['name']))
+        self.cookies.append(cookie)
+
+    def delete_cookie(self, name):
+        self.calls.append(('delete_cookie', name))
+        self.cookies = [cookie for cookie in self.cookies if cookie['name'] != name]
+
+    def delete_all_cookies(self):
+        self.calls.append(('delete_all_cookies',))
+        self.cookies = []
+
+    def quit(self):
+        self.quit_called = True
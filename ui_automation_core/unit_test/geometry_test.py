@@ -0,0 +1,73 @@
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.actions.action import Actions
+from ui_automation_core.helpers.actions.geometry import GeometryCache
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class _Page:
+    """
+    Answers the `geometry` helper like a document whose layout generation is bumped by `scroll`.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.element_reads = 0
+
+    def scroll(self):
+        self.generation += 1
+
+    def __call__(self, element):
+        token = f'doc:{self.generation}'
+        if element is None:
+            return {'generation': token}
+        self.element_reads += 1
+        return {'generation': token, 'x': 10, 'y': 20 + self.generation, 'width': 100, 'height': 30}
+
+
+class GeometryCacheTest(TestCase):
+
+    def test_entries_are_valid_in_their_generation_only(self):
+        cache = GeometryCache()
+        cache.put('#header', 'doc:1', {'x': 1})
+        self.assertEqual({'x': 1}, cache.get('#header', 'doc:1'))
+        self.assertIsNone(cache.get('#header', 'doc:2'))
+        self.assertIsNone(cache.get('#footer', 'doc:1'))
+
+    def test_returns_copies(self):
+        cache = GeometryCache()
+        geometry = {'x': 1}
+        cache.put('#header', 'doc:1', geometry)
+        geometry['x'] = 2
+        cache.get('#header', 'doc:1')['x'] = 3
+        self.assertEqual({'x': 1}, cache.get('#header', 'doc:1'))
+
+    def test_cache_is_attached_to_the_context(self):
+        context = fake_context()
+        self.assertIs(GeometryCache.for_context(context), GeometryCache.for_context(context))
+
+
+@mock.patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+class GetGeometryTest(TestCase):
+
+    def setUp(self):
+        self.page = _Page()
+        self.context = fake_context(FakeDriver().answer('geometry', self.page), 'geometry_test')
+
+    def test_cached_geometry_is_reused_until_the_layout_changes(self, mock_locator):
+        actions = Actions(self.context)
+        first = actions.get_geometry('#header', use_cache=True)
+        self.assertEqual({'x': 10, 'y': 20, 'width': 100, 'height': 30}, first)
+        self.assertEqual(first, actions.get_geometry('#header', use_cache=True))
+        self.assertEqual(1, self.page.element_reads)
+
+        self.page.scroll()
+        self.assertEqual(21, actions.get_geometry('#header', use_cache=True)['y'])
+        self.assertEqual(2, self.page.element_reads)
+
+    def test_cache_is_not_used_by_default(self, mock_locator):
+        actions = Actions(self.context)
+        actions.get_geometry('#header')
+        actions.get_geometry('#header')
+        self.assertEqual(2, self.page.element_reads)
+        self.assertIsNone(getattr(self.context, 'geometry_cache', None))
@@ -0,0 +1,26 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ui_automation_core.helpers.actions.gesture import Gesture
+
+
+class GestureTest(TestCase):
+
+    def setUp(self):
+        self.gesture = Gesture().add(Gesture.DOWN, 0, 0, 0).add(Gesture.MOVE, 10, 5, 100) \
+            .add(Gesture.MOVE, 15, 5, 300).add(Gesture.UP, 15, 5, 300)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'gesture.json')
+            self.gesture.save(file_path)
+            self.assertEqual(self.gesture.points, Gesture.load(file_path).points)
+
+    def test_steps_are_relative_and_scaled_by_speed(self):
+        steps = self.gesture.steps(speed=2.0)
+        self.assertEqual([(Gesture.DOWN, 0, 0, 0), (Gesture.MOVE, 10, 5, 0.05),
+                          (Gesture.MOVE, 5, 0, 0.1), (Gesture.UP, 0, 0, 0)], steps)
+
+    def test_speed_zero_removes_pauses(self):
+        self.assertTrue(all(pause == 0 for _, _, _, pause in self.gesture.steps(speed=0)))
@@ -0,0 +1,69 @@
+import io
+import os
+import time
+from unittest import TestCase, skipUnless
+
+import numpy as np
+from PIL import Image
+
+from ui_automation_core.helpers.verification.image_diff import ImageDiff
+
+
+class ImageDiffTest(TestCase):
+
+    def setUp(self):
+        self.baseline = np.full((100, 200, 3), 200, dtype=np.uint8)
+
+    def test_identical_images_match(self):
+        report = ImageDiff.compare(self.baseline.copy(), self.baseline)
+        self.assertTrue(report['matches'])
+        self.assertEqual(0, report['diff_pixels'])
+
+    def test_differences_within_tolerance_are_ignored(self):
+        actual = self.baseline.copy()
+        actual[10:20, 10:20] = (205, 195, 200)
+        self.assertTrue(ImageDiff.compare(actual, self.baseline, tolerance=5)['matches'])
+        self.assertFalse(ImageDiff.compare(actual, self.baseline, tolerance=(5, 4, 5))['matches'])
+
+    def test_ignore_regions_are_masked(self):
+        actual = self.baseline.copy()
+        actual[10:20, 30:40] = 0
+        report = ImageDiff.compare(actual, self.baseline)
+        self.assertEqual(100, report['diff_pixels'])
+        self.assertEqual(200, report['max_delta'])
+        self.assertEqual(200, report['heatmap'][15, 35])
+        self.assertTrue(ImageDiff.compare(actual, self.baseline, ignore_regions=[(30, 10, 10, 10)])['matches'])
+
+    def test_size_mismatch_does_not_match(self):
+        report = ImageDiff.compare(self.baseline[:50], self.baseline)
+        self.assertFalse(report['matches'])
+        self.assertEqual(((200, 50), (200, 100)), report['size_mismatch'])
+
+    def test_decodes_png_bytes(self):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (4, 3), (1, 2, 3, 255)).save(buffer, 'PNG')
+        array = ImageDiff.load(buffer.getvalue())
+        self.assertEqual((3, 4, 3), array.shape)
+        self.assertEqual([1, 2, 3], array[0, 0].tolist())
+
+    def test_4k_capture_is_compared(self):
+        baseline, actual = _4k_captures()
+        report = ImageDiff.compare(actual, baseline, tolerance=4, ignore_regions=[(0, 0, 50, 50)])
+        self.assertFalse(report['matches'])
+
+
+def _4k_captures():
+    baseline = np.random.default_rng(1).integers(0, 256, (2160, 3840, 3), dtype=np.uint8)
+    actual = baseline.copy()
+    actual[100:200, 100:200] = 0
+    return baseline, actual
+
+
+@skipUnless(os.environ.get('UIAC_BENCHMARK'), 'set UIAC_BENCHMARK=1 to run the benchmarks')
+class ImageDiffBenchmark(TestCase):
+
+    def test_4k_capture_is_compared_in_under_a_second(self):
+        baseline, actual = _4k_captures()
+        start = time.monotonic()
+        ImageDiff.compare(actual, baseline, tolerance=4, ignore_regions=[(0, 0, 50, 50)])
+        self.assertLess(time.monotonic() - start, 1)
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from ui_automation_core.helpers import js_executor
+from ui_automation_core.helpers.js_executor import JsExecutor
+from ui_automation_core.helpers.scroll.scroll import Scroll
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class JsExecutorTest(TestCase):
+
+    def setUp(self):
+        JsExecutor.register('echo', 'function (value) { return value; }')
+        self.driver = FakeDriver(injected=False).answer('echo', lambda value: f'echo[{value}]')
+        self.context = fake_context(self.driver, 'js_executor_test')
+
+    def test_bundle_is_injected_once_per_document(self):
+        executor = JsExecutor(self.context)
+        self.assertEqual("echo[1]", executor.call('echo', 1))
+        self.assertEqual("echo[2]", executor.call('echo', 2))
+        bundles = [script for script in self.driver.scripts if script.startswith('(function')]
+        self.assertEqual(1, len(bundles))
+        self.assertIn("fns['echo']", bundles[0])
+
+    def test_bundle_is_injected_again_after_navigation(self):
+        executor = JsExecutor(self.context)
+        executor.call('echo', 1)
+        self.driver.injected = False
+        executor.call('echo', 1)
+        bundles = [script for script in self.driver.scripts if script.startswith('(function')]
+        self.assertEqual(2, len(bundles))
+
+    def test_unknown_helper_raises(self):
+        with self.assertRaises(ValueError):
+            JsExecutor(self.context).call('missing')
+
+    def test_deprecated_execute_javascript_delegates_to_js_executor(self):
+        with self.assertWarns(DeprecationWarning):
+            js_executor.execute_javascript(SimpleNamespace(context=self.context), 'return 1;')
+        with self.assertWarns(DeprecationWarning):
+            Scroll(self.context).execute_javascript('return 2;', 'arg')
+        self.assertEqual(['return 1;', 'return 2;'], self.driver.scripts)
+
+    def test_driver_errors_keep_their_type(self):
+        self.driver.answer('echo', mock.Mock(side_effect=StaleElementReferenceException('stale')))
+        with self.assertRaises(StaleElementReferenceException):
+            JsExecutor(self.context).call('echo', 1)
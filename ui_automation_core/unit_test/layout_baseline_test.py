@@ -0,0 +1,51 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ui_automation_core.helpers.verification.layout_baseline import LayoutSnapshot
+
+_STYLES = ['block', 'static', '16px', '400', 'rgb(0, 0, 0)', 'rgba(0, 0, 0, 0)']
+
+
+def _snapshot(rows):
+    return LayoutSnapshot([row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows],
+                          [row[3] if len(row) > 3 else _STYLES for row in rows])
+
+
+class LayoutSnapshotTest(TestCase):
+
+    def setUp(self):
+        self.baseline = _snapshot([('div', [0, 0, 800, 600], True),
+                                   ('div/h1:0', [10, 10, 300, 40], True),
+                                   ('div/ul:0', [10, 60, 300, 200], True),
+                                   ('div/ul:0/li:0', [10, 60, 300, 20], True)])
+
+    def test_changes_within_tolerance_match(self):
+        current = _snapshot([('div', [0, 0, 800, 600], True),
+                             ('div/h1:0', [11, 12, 301, 40], True),
+                             ('div/ul:0', [10, 60, 300, 200], True),
+                             ('div/ul:0/li:0', [10, 60, 300, 20], True)])
+        self.assertEqual({'missing': [], 'added': [], 'changed': []}, current.diff(self.baseline))
+
+    def test_reports_moved_hidden_restyled_missing_and_added_elements(self):
+        bold = list(_STYLES)
+        bold[3] = '700'
+        current = _snapshot([('div', [0, 0, 800, 600], True),
+                             ('div/h1:0', [10, 30, 300, 40], True, bold),
+                             ('div/ul:0', [10, 60, 300, 200], False),
+                             ('div/p:0', [10, 300, 300, 20], True)])
+        report = current.diff(self.baseline)
+        self.assertEqual(['div/ul:0/li:0'], report['missing'])
+        self.assertEqual(['div/p:0'], report['added'])
+        changes = {change['key']: change for change in report['changed']}
+        self.assertEqual({'rect': [10, 10, 300, 40], 'font-weight': '400'}, changes['div/h1:0']['baseline'])
+        self.assertEqual({'rect': [10, 30, 300, 40], 'font-weight': '700'}, changes['div/h1:0']['actual'])
+        self.assertEqual({'visible': False}, changes['div/ul:0']['actual'])
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'baselines', 'page.npz')
+            self.baseline.save(file_path)
+            loaded = LayoutSnapshot.load(file_path)
+        self.assertEqual(self.baseline.keys.tolist(), loaded.keys.tolist())
+        self.assertEqual({'missing': [], 'added': [], 'changed': []}, loaded.diff(self.baseline))
@@ -0,0 +1,68 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ui_automation_core.helpers.verification.link_cache import LinkStatusCache
+
+
+class _Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LinkStatusCacheTest(TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+
+    def test_success_and_failure_have_separate_ttl(self):
+        cache = LinkStatusCache(success_ttl=100, failure_ttl=10, clock=self.clock)
+        cache.put('http://a/', {'ok': True, 'status_code': 200})
+        cache.put('http://b/', {'ok': False, 'status_code': 500})
+        self.clock.now += 11
+        self.assertEqual(200, cache.get('http://a/')['status_code'])
+        self.assertIsNone(cache.get('http://b/'))
+        self.clock.now += 100
+        self.assertIsNone(cache.get('http://a/'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LinkStatusCache(max_size=2, clock=self.clock)
+        cache.put('http://a/', {'ok': True})
+        cache.put('http://b/', {'ok': True})
+        cache.get('http://a/')
+        cache.put('http://c/', {'ok': True})
+        self.assertIsNotNone(cache.get('http://a/'))
+        self.assertIsNone(cache.get('http://b/'))
+        self.assertEqual(2, len(cache))
+
+    def test_on_disk_store_is_shared_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'cache', 'links.sqlite')
+            cache = LinkStatusCache(db_path, clock=self.clock)
+            cache.put('http://a/', {'ok': True, 'status_code': 200})
+            cache.close()
+
+            reopened = LinkStatusCache(db_path, clock=self.clock)
+            self.assertEqual(200, reopened.get('http://a/')['status_code'])
+            reopened.close()
+
+    def test_on_disk_store_keeps_the_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'links.sqlite')
+            cache = LinkStatusCache(db_path, max_size=2, clock=self.clock)
+            for url in ('http://a/', 'http://b/', 'http://c/'):
+                self.clock.now += 1
+                cache.put(url, {'ok': True})
+            self.clock.now += 1
+            self.assertIsNotNone(cache.get('http://a/'))
+            cache.close()
+
+            reopened = LinkStatusCache(db_path, max_size=2, clock=self.clock)
+            self.assertIsNotNone(reopened.get('http://a/'))
+            self.assertIsNotNone(reopened.get('http://c/'))
+            self.assertIsNone(reopened.get('http://b/'))
+            reopened.close()
@@ -0,0 +1,122 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.verification.link_cache import LinkStatusCache
+from ui_automation_core.helpers.verification.link_checker import LinkChecker
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    /ok answers 200, /missing 404, /no-head rejects HEAD with 405 but answers GET with 200
+    and /redirect redirects to /ok. /drop-head closes the connection on HEAD but answers GET with 200.
+    Every request is recorded on the server.
+    """
+
+    def _respond(self, with_body):
+        self.server.requests.append((self.command, self.path))
+        if self.path == '/drop-head' and self.command == 'HEAD':
+            self.close_connection = True
+            return
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/ok')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        status = {'/ok': 200, '/missing': 404}.get(self.path, 200)
+        if self.path == '/no-head':
+            status = 405 if self.command == 'HEAD' else 200
+        body = b'stub body'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, *args):
+        pass
+
+
+class LinkCheckerTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        cls.server.requests = []
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.checker = LinkChecker(SimpleNamespace(logger=logging.getLogger('link_checker_test')))
+        self.addCleanup(self.checker.close)
+
+    def test_normalize_url(self):
+        self.assertEqual('http://example.com/a?b=1', LinkChecker.normalize_url('HTTP://Example.COM:80/a?b=1#top'))
+        self.assertEqual('https://example.com:8443/', LinkChecker.normalize_url('https://example.com:8443'))
+        self.assertIsNone(LinkChecker.normalize_url('mailto:someone@example.com'))
+        self.assertIsNone(LinkChecker.normalize_url('javascript:void(0)'))
+
+    def test_reports_status_per_url(self):
+        report = self.checker.check([f'{self.base_url}/ok', f'{self.base_url}/missing',
+                                     f'{self.base_url}/redirect'])
+        self.assertTrue(report[f'{self.base_url}/ok']['ok'])
+        self.assertEqual('HEAD', report[f'{self.base_url}/ok']['method'])
+        self.assertFalse(report[f'{self.base_url}/missing']['ok'])
+        self.assertEqual(404, report[f'{self.base_url}/missing']['status_code'])
+        self.assertTrue(report[f'{self.base_url}/redirect']['ok'])
+
+    def test_falls_back_to_get_when_head_is_rejected(self):
+        status = self.checker.check([f'{self.base_url}/no-head'])[f'{self.base_url}/no-head']
+        self.assertTrue(status['ok'])
+        self.assertEqual('GET', status['method'])
+
+    def test_falls_back_to_get_when_head_fails(self):
+        status = self.checker.check([f'{self.base_url}/drop-head'])[f'{self.base_url}/drop-head']
+        self.assertTrue(status['ok'])
+        self.assertEqual('GET', status['method'])
+        self.assertIsNone(status['error'])
+        self.assertEqual([('HEAD', '/drop-head'), ('GET', '/drop-head')], self.server.requests)
+
+    def test_closes_only_its_own_session(self):
+        session = mock.Mock()
+        LinkChecker(self.checker.context, session=session).close()
+        session.close.assert_not_called()
+        with LinkChecker(self.checker.context) as checker:
+            checker.session = mock.Mock(wraps=checker.session)
+        checker.session.close.assert_called_once()
+
+    def test_duplicate_links_are_checked_once(self):
+        report = self.checker.check([f'{self.base_url}/ok', f'{self.base_url}/ok#section',
+                                     f'{self.base_url.upper().replace("HTTP", "http")}/ok', 'mailto:a@b.c'])
+        self.assertEqual([f'{self.base_url}/ok'], list(report))
+        self.assertEqual([('HEAD', '/ok')], self.server.requests)
+
+    def test_connection_errors_are_reported(self):
+        self.checker.timeout = (0.5, 0.5)
+        status = self.checker.check(['http://127.0.0.1:1/'])['http://127.0.0.1:1/']
+        self.assertFalse(status['ok'])
+        self.assertIsNotNone(status['error'])
+
+    def test_cached_links_are_not_requested_again(self):
+        self.checker.cache = LinkStatusCache()
+        self.checker.check([f'{self.base_url}/ok'])
+        with LinkChecker(self.checker.context, cache=self.checker.cache) as checker:
+            report = checker.check([f'{self.base_url}/ok', f'{self.base_url}/missing'])
+        self.assertTrue(report[f'{self.base_url}/ok']['cached'])
+        self.assertFalse(report[f'{self.base_url}/missing']['cached'])
+        self.assertEqual([('HEAD', '/ok'), ('HEAD', '/missing'), ('GET', '/missing')], self.server.requests)
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.browser.browser_navigation import BrowserINavigation
+from ui_automation_core.helpers.browser.page_metrics import PageMetrics
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+def _sample(url, **metrics):
+    return {'loaded': True, 'url': url, 'navigation_type': 'navigate', 'metrics': metrics, 'resources': {}}
+
+
+def _driver(*samples):
+    return FakeDriver().answer('pageMetrics', *samples)
+
+
+def _unavailable(settle_ms):
+    raise Exception('javascript error: PerformanceObserver is not defined')
+
+
+class PageMetricsTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.samples_dir = os.path.join(self.tmp_dir.name, 'samples')
+        self.report_path = os.path.join(self.tmp_dir.name, 'page_metrics.json')
+        self.logger = fake_context(logger_name='page_metrics_test').logger
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_navigation_captures_a_sample_per_page_visit(self):
+        page_metrics = PageMetrics(self.samples_dir)
+        driver = _driver(_sample('https://shop.test/cart?id=7#top', ttfb=120.5, lcp=900, cls=0.02), None)
+        context = fake_context(driver, 'page_metrics_test', page_metrics=page_metrics)
+        BrowserINavigation(context).launch_browser_with_url('https://shop.test/cart?id=7#top')
+        BrowserINavigation(context).launch_browser_with_url('about:blank')
+        samples = PageMetrics.load_samples(self.samples_dir)
+        self.assertEqual(1, len(samples))
+        self.assertEqual('https://shop.test/cart', samples[0]['page'])
+        self.assertEqual(900, samples[0]['metrics']['lcp'])
+
+    def test_capture_errors_do_not_fail_the_navigation(self):
+        driver = _driver(_unavailable)
+        context = fake_context(driver, 'page_metrics_test', page_metrics=PageMetrics(self.samples_dir))
+        BrowserINavigation(context).launch_browser_with_url('https://shop.test/')
+        self.assertEqual(['https://shop.test/'], driver.visited)
+        self.assertEqual([], PageMetrics.load_samples(self.samples_dir))
+
+    def test_pages_still_loading_are_skipped(self):
+        page_metrics = PageMetrics(self.samples_dir, load_timeout=2)
+        driver = _driver({'loaded': False}, _sample('https://shop.test/', ttfb=100, lcp=900, cls=0))
+        self.assertIsNone(page_metrics.capture(fake_context(driver)))
+        self.assertEqual([('pageMetrics', [0, 2000])], driver.helper_calls)
+        self.assertEqual('https://shop.test/', page_metrics.capture(fake_context(driver))['page'])
+        self.assertEqual(1, len(PageMetrics.load_samples(self.samples_dir)))
+
+    def test_runs_only_remove_and_report_their_own_samples(self):
+        os.makedirs(self.samples_dir)
+        other_run = os.path.join(self.samples_dir, 'samples_worker_0.jsonl')
+        with open(other_run, 'w') as f:
+            f.write(json.dumps(dict(_sample('https://shop.test/', lcp=9000), page='https://shop.test/')) + '\n')
+        page_metrics = PageMetrics(self.samples_dir)
+        page_metrics.capture(fake_context(_driver(_sample('https://shop.test/', lcp=1000))))
+        self.assertTrue(os.path.isfile(other_run))
+        report = page_metrics.finalize(self.report_path, thresholds={'lcp': 2500})
+        self.assertEqual(1, report['samples'])
+
+    def test_workers_use_the_samples_dir_of_the_runner(self):
+        with mock.patch.dict(os.environ, {'UIAC_PAGE_METRICS_DIR': self.samples_dir}):
+            self.assertEqual(self.samples_dir, PageMetrics().samples_dir)
+
+    def test_aggregates_percentiles_per_page(self):
+        samples = [dict(_sample('https://shop.test/', ttfb=value, lcp=None), page='https://shop.test/')
+                   for value in range(100, 1100, 100)]
+        pages = PageMetrics.aggregate(samples)
+        page = pages['https://shop.test/']
+        self.assertEqual(10, page['count'])
+        self.assertEqual({'p50': 550.0, 'p95': 955.0, 'max': 1000}, page['metrics']['ttfb'])
+        self.assertNotIn('lcp', page['metrics'])
+
+    def test_finalize_fails_on_exceeded_thresholds(self):
+        page_metrics = PageMetrics(self.samples_dir)
+        for lcp in (1000, 1200, 4000):
+            page_metrics.capture(fake_context(_driver(_sample('https://shop.test/', lcp=lcp, ttfb=100))))
+        with self.assertRaises(AssertionError) as error:
+            page_metrics.finalize(self.report_path, thresholds={'lcp': 2500, 'ttfb.p50': 200}, logger=self.logger)
+        self.assertIn('lcp p95', str(error.exception))
+        with open(self.report_path, 'r') as f:
+            report = json.load(f)
+        self.assertFalse(report['passed'])
+        self.assertEqual(1, len(report['violations']))
+        self.assertTrue(page_metrics.finalize(self.report_path, thresholds={'lcp.p50': 2500})['passed'])
+        with self.assertRaises(ValueError):
+            page_metrics.finalize(self.report_path, thresholds={'lcp.p99': 2500})
+
+    def test_workers_keep_separate_sample_files(self):
+        with mock.patch.dict(os.environ, {'UIAC_WORKER_ID': '2'}):
+            page_metrics = PageMetrics(self.samples_dir)
+            page_metrics.capture(fake_context(_driver(_sample('https://shop.test/', ttfb=1))))
+            self.assertIsNone(page_metrics.finalize(self.report_path))
+        self.assertTrue(page_metrics.samples_path.endswith('samples_worker_2.jsonl'))
+        self.assertEqual(1, len(PageMetrics.load_samples(self.samples_dir)))
+        self.assertFalse(os.path.exists(self.report_path))
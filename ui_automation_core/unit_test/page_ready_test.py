@@ -0,0 +1,113 @@
+from unittest import TestCase, mock
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from ui_automation_core.helpers.browser.browser_navigation import BrowserINavigation
+from ui_automation_core.helpers.browser.page_ready_state import PageReadyState
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class _FakeDriver(FakeDriver):
+    """
+    Answers the readyState polls with the queued document states and the readiness helper with the queued results.
+    """
+
+    def __init__(self, states, ready=(False,), page_load_strategy='eager'):
+        super().__init__()
+        self.states = list(states)
+        self.navigated = []
+        self.capabilities = {'pageLoadStrategy': page_load_strategy}
+        self.answer('pageReady', *ready)
+
+    def run_script(self, script, args):
+        if 'location.assign' in script:
+            self.navigated.append(args[0])
+            return None
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+
+class _FakeChromeDriver(_FakeDriver):
+
+    def __init__(self, states, ready=(False,)):
+        super().__init__(states, ready)
+        self.cdp_calls = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+        return {}
+
+
+class NavigateTest(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(BrowserINavigation, 'navigation_poll_interval', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _navigation(self, driver):
+        return BrowserINavigation(fake_context(driver, 'page_ready_test'))
+
+    def test_load_uses_the_driver_navigation(self):
+        driver = _FakeDriver(['complete'])
+        self._navigation(driver).navigate('https://example.com')
+        self.assertEqual(['https://example.com'], driver.visited)
+        self.assertEqual([], driver.navigated)
+
+    def test_dom_content_loaded_waits_for_the_new_document(self):
+        driver = _FakeDriver([None, None, 'loading', 'interactive'])
+        self._navigation(driver).navigate('https://example.com', PageReadyState.DOM_CONTENT_LOADED)
+        self.assertEqual(['https://example.com'], driver.navigated)
+        self.assertEqual([], driver.states[1:])
+        self.assertEqual([], driver.helper_calls)
+
+    def test_network_idle_polls_until_idle(self):
+        driver = _FakeDriver([None, 'interactive'], ready=(False, False, True))
+        self._navigation(driver).navigate('https://example.com', PageReadyState.NETWORK_IDLE, idle_time=0.25)
+        self.assertEqual(3, len(driver.helper_calls))
+        self.assertEqual(('pageReady', ['networkIdle', 250, None]), driver.helper_calls[0])
+
+    def test_locator_waits_for_the_element(self):
+        driver = _FakeDriver(['loading'], ready=(False, True))
+        self._navigation(driver).navigate('https://example.com', PageReadyState.LOCATOR, locator='#main')
+        self.assertEqual(['locator', 0, ['id', 'main']], driver.helper_calls[-1][1])
+
+    def test_times_out(self):
+        driver = _FakeDriver([None])
+        with self.assertRaises(Exception) as error:
+            self._navigation(driver).navigate('https://example.com', PageReadyState.NETWORK_IDLE, timeout=0.05)
+        self.assertIn('was not ready', str(error.exception))
+
+    def test_locator_state_requires_a_locator(self):
+        with self.assertRaises(ValueError):
+            self._navigation(_FakeDriver(['complete'])).navigate('https://example.com', PageReadyState.LOCATOR)
+        with self.assertRaises(TypeError):
+            self._navigation(_FakeDriver(['complete'])).navigate('https://example.com', 'load')
+
+    def test_states_other_than_load_require_an_eager_driver(self):
+        driver = _FakeDriver(['complete'], page_load_strategy='normal')
+        with self.assertRaises(ValueError):
+            self._navigation(driver).navigate('https://example.com', PageReadyState.DOM_CONTENT_LOADED)
+        self.assertEqual([], driver.navigated)
+        self._navigation(driver).navigate('https://example.com')
+        self.assertEqual(['https://example.com'], driver.visited)
+
+    def test_network_tracker_is_installed_in_new_documents_once(self):
+        driver = _FakeChromeDriver(['complete'], ready=(True,))
+        self._navigation(driver).navigate('https://example.com', PageReadyState.NETWORK_IDLE)
+        self._navigation(driver).navigate('https://example.com/next', PageReadyState.NETWORK_IDLE)
+        self.assertEqual(['Page.addScriptToEvaluateOnNewDocument'], [cmd for cmd, params in driver.cdp_calls])
+        self.assertIn('__uiacNetwork', driver.cdp_calls[0][1]['source'])
+
+    def test_script_errors_of_the_unloading_document_are_retried(self):
+        driver = _FakeDriver([JavascriptException('document unloaded while waiting for result'), 'interactive'])
+        self._navigation(driver).navigate('https://example.com', PageReadyState.DOM_CONTENT_LOADED)
+        self.assertEqual([], driver.states[1:])
+
+    def test_other_driver_errors_are_raised(self):
+        driver = _FakeDriver([WebDriverException('chrome not reachable')])
+        with self.assertRaises(Exception) as error:
+            self._navigation(driver).navigate('https://example.com', PageReadyState.DOM_CONTENT_LOADED, timeout=5)
+        self.assertIn('chrome not reachable', str(error.exception))
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from ui_automation_core.utilities.parallel_runner import DurationStore, ParallelRunner
+
+_STEPS = """
+import os
+from behave import step
+
+
+@step('the worker records "{name}"')
+def record(context, name):
+    with open(os.path.join(os.path.dirname(__file__), '..', '..', f'{name}.worker'), 'w') as f:
+        f.write(os.environ['UIAC_WORKER_ID'])
+"""
+
+
+class ParallelRunnerTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.durations = DurationStore(os.path.join(self.tmp_dir.name, 'durations.json'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_features(self):
+        features_dir = os.path.join(self.tmp_dir.name, 'features')
+        os.makedirs(os.path.join(features_dir, 'steps'))
+        with open(os.path.join(features_dir, 'steps', 'steps.py'), 'w') as f:
+            f.write(_STEPS)
+        for name in ('login', 'search'):
+            with open(os.path.join(features_dir, f'{name}.feature'), 'w') as f:
+                f.write(f'Feature: {name}\n'
+                        f'  Scenario: {name} one\n    Given the worker records "{name}_one"\n'
+                        f'  Scenario: {name} two\n    Given the worker records "{name}_two"\n')
+        return features_dir
+
+    def _write_outline(self, features_dir):
+        with open(os.path.join(features_dir, 'filter.feature'), 'w') as f:
+            f.write('Feature: filter\n'
+                    '  Scenario Outline: filter by <field>\n'
+                    '    Given the worker records "filter_<field>"\n'
+                    '\n'
+                    '    Examples: text\n'
+                    '      | field |\n'
+                    '      | name  |\n'
+                    '      | city  |\n'
+                    '\n'
+                    '    @numbers\n'
+                    '    Examples: numbers\n'
+                    '      | field |\n'
+                    '      | age   |\n'
+                    '  Scenario: filter reset\n'
+                    '    Given the worker records "filter_reset"\n')
+        return os.path.join(os.path.relpath(features_dir), 'filter.feature')
+
+    def test_plan_balances_by_historical_durations(self):
+        self.durations.update({'a': 8, 'b': 5, 'c': 4, 'd': 3, 'e': 1})
+        shards = ParallelRunner([], workers=2, durations=self.durations).plan(['a', 'b', 'c', 'd', 'e'])
+        loads = sorted(sum(self.durations.get(item, 0) for item in shard) for shard in shards)
+        self.assertEqual([10, 11], loads)
+
+    def test_unknown_items_get_the_median_duration(self):
+        self.durations.update({'a': 10, 'b': 2, 'c': 4})
+        shards = ParallelRunner([], workers=2, durations=self.durations).plan(['a', 'b', 'c', 'new'])
+        self.assertEqual([['a'], ['new', 'c', 'b']], sorted(shards))
+
+    def test_discovers_scenarios(self):
+        features_dir = self._write_features()
+        scenarios = ParallelRunner(features_dir, shard='scenario', durations=self.durations).discover()
+        feature_dir = os.path.relpath(features_dir)
+        self.assertEqual([os.path.join(feature_dir, 'login.feature:2'), os.path.join(feature_dir, 'login.feature:4'),
+                          os.path.join(feature_dir, 'search.feature:2'), os.path.join(feature_dir, 'search.feature:4')],
+                         scenarios)
+
+    def test_discovers_each_example_of_an_outline(self):
+        feature_file = self._write_outline(self._write_features())
+        scenarios = ParallelRunner(feature_file, shard='scenario', durations=self.durations).discover()
+        self.assertEqual([f'{feature_file}:{line}' for line in (7, 8, 13, 14)], scenarios)
+
+    def test_items_without_results_are_reported(self):
+        features = [{'location': 'features/login.feature:1',
+                     'elements': [{'type': 'scenario', 'location': 'features/login.feature:2'}]}]
+        runner = ParallelRunner([], shard='scenario', durations=self.durations)
+        self.assertEqual(['features/login.feature:4'],
+                         runner.missing_items(['features/login.feature:2', 'features/login.feature:4'], features))
+        runner.shard = 'feature'
+        self.assertEqual(['features/search.feature'],
+                         runner.missing_items(['features/login.feature', 'features/search.feature'], features))
+
+    def test_runs_scenarios_across_workers_and_merges_results(self):
+        features_dir = self._write_features()
+        results_dir = os.path.join(self.tmp_dir.name, 'reports')
+        report = ParallelRunner(features_dir, workers=2, shard='scenario', results_dir=results_dir,
+                                durations=self.durations, allure=False).run()
+        self.assertTrue(report['passed'])
+        self.assertEqual(2, len(report['workers']))
+        workers = {name: open(os.path.join(self.tmp_dir.name, f'{name}.worker')).read()
+                   for name in ('login_one', 'login_two', 'search_one', 'search_two')}
+        self.assertEqual({'0', '1'}, set(workers.values()))
+        with open(os.path.join(results_dir, 'behave.json')) as f:
+            scenarios = [element for feature in json.load(f) for element in feature['elements']]
+        self.assertEqual(4, len(scenarios))
+        self.assertEqual(4, len(DurationStore(self.durations.path).durations))
+
+    def test_runs_every_example_of_an_outline(self):
+        features_dir = self._write_features()
+        self._write_outline(features_dir)
+        results_dir = os.path.join(self.tmp_dir.name, 'reports')
+        report = ParallelRunner(features_dir, workers=3, shard='scenario', results_dir=results_dir,
+                                durations=self.durations, allure=False).run()
+        self.assertTrue(report['passed'])
+        self.assertEqual([], report['missing'])
+        for name in ('filter_name', 'filter_city', 'filter_age', 'filter_reset'):
+            self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir.name, f'{name}.worker')), name)
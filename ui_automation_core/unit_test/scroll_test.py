@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from ui_automation_core.helpers.scroll.scroll import Scroll, ScrollAlignment, ScrollBehavior
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+def _scroll(driver):
+    return Scroll(fake_context(driver, 'scroll_test'))
+
+
+class ScrollToPageEndTest(TestCase):
+
+    def test_continues_until_the_page_end_across_calls(self):
+        driver = FakeDriver().answer('scrollToEnd',
+                                     {'iterations': 30, 'loads': 30, 'height': 30000, 'reachedEnd': False},
+                                     {'iterations': 5, 'loads': 4, 'height': 34000, 'reachedEnd': True})
+        report = _scroll(driver).scroll_to_page_end(max_iterations=100, settle_time=0.2)
+        self.assertTrue(report['reached_end'])
+        self.assertEqual(34, report['loads'])
+        self.assertEqual(35, report['iterations'])
+        self.assertEqual(34000, report['height'])
+        self.assertEqual([100, 20000, 200], driver.helper_calls[0][1])
+        self.assertEqual(70, driver.helper_calls[1][1][0])
+
+    def test_stops_at_the_iteration_cap(self):
+        driver = FakeDriver().answer('scrollToEnd',
+                                     {'iterations': 10, 'loads': 10, 'height': 10000, 'reachedEnd': False})
+        report = _scroll(driver).scroll_to_page_end(max_iterations=10)
+        self.assertFalse(report['reached_end'])
+        self.assertEqual(1, len(driver.helper_calls))
+
+
+class _VirtualList:
+    """
+    Renders a window of 5 rows out of `total` that moves by 3 rows per scroll.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.first = 0
+        self.steps = 0
+
+    def __call__(self, container, query, key_attr, scroll, settle_ms):
+        if scroll:
+            self.first = min(self.first + 3, max(self.total - 5, 0))
+        self.steps += 1
+        return [[f'row-{i}', f'Row {i}', ['Row', str(i)]] for i in range(self.first, min(self.first + 5, self.total))]
+
+
+class IterItemsTest(TestCase):
+
+    def test_yields_each_row_once(self):
+        driver = FakeDriver().answer('harvestStep', _VirtualList(20))
+        keys = [row['key'] for row in _scroll(driver).iter_items(None, 'css=.row', 'data-key', settle_time=0)]
+        self.assertEqual([f'row-{i}' for i in range(20)], keys)
+
+    def test_stops_at_max_items(self):
+        driver = FakeDriver().answer('harvestStep', _VirtualList(1000))
+        rows = list(_scroll(driver).iter_items(None, 'css=.row', 'data-key', settle_time=0, max_items=12))
+        self.assertEqual(12, len(rows))
+        self.assertEqual({'key': 'row-0', 'text': 'Row 0', 'cells': ['Row', '0']}, rows[0])
+
+    def test_keeps_only_a_window_of_seen_keys(self):
+        driver = FakeDriver().answer('harvestStep', _VirtualList(500))
+        keys = [row['key'] for row in _scroll(driver).iter_items(None, 'css=.row', 'data-key', settle_time=0,
+                                                                   seen_window=5)]
+        self.assertEqual([f'row-{i}' for i in range(500)], keys)
+
+    def test_a_window_smaller_than_the_rendered_rows_yields_them_again(self):
+        driver = FakeDriver().answer('harvestStep', _VirtualList(5))
+        rows = list(_scroll(driver).iter_items(None, 'css=.row', 'data-key', settle_time=0, max_idle_steps=1,
+                                               max_items=8, seen_window=2))
+        self.assertEqual(8, len(rows))
+
+    def test_arguments_are_validated_when_called(self):
+        with self.assertRaises(Exception):
+            _scroll(FakeDriver()).iter_items(None, 'no locator pattern')
+        with self.assertRaises(Exception):
+            _scroll(FakeDriver()).iter_items(None, 'css=.row', seen_window=0)
+
+
+def _element():
+    return WebElement(SimpleNamespace(session_id='session-1'), 'element-1')
+
+
+def _into_view_driver(in_viewport):
+    return FakeDriver().answer('scrollIntoViewIfNeeded', not in_viewport)
+
+
+class ScrollElementIntoViewTest(TestCase):
+
+    def test_passes_behavior_and_alignment(self):
+        element = _element()
+        driver = _into_view_driver(in_viewport=False)
+        self.assertTrue(_scroll(driver).scroll_element_into_view(
+            element, behavior=ScrollBehavior.SMOOTH, alignment=ScrollAlignment.CENTER))
+        self.assertEqual([element, 'smooth', 'center'], driver.helper_calls[0][1])
+
+    def test_reports_element_already_in_viewport(self):
+        self.assertFalse(_scroll(_into_view_driver(in_viewport=True)).scroll_element_into_view(_element()))
+
+    def test_rejects_invalid_options(self):
+        with self.assertRaises(TypeError):
+            _scroll(_into_view_driver(True)).scroll_element_into_view(_element(), behavior='smooth')
@@ -0,0 +1,155 @@
+from unittest import TestCase, mock
+
+from ui_automation_core.helpers.select.select import SelectAction
+from ui_automation_core.helpers.select.select_method import SelectMethod
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+def _option(text, value, index, selected=False, disabled=False):
+    return {'text': text, 'value': value, 'index': index, 'selected': selected, 'disabled': disabled}
+
+
+@mock.patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+class DropdownOptionsTest(TestCase):
+
+    def setUp(self):
+        self.options = [_option('Austria', 'at', 0), _option('Belgium', 'be', 1, selected=True),
+                        _option('Croatia', 'hr', 2, disabled=True)]
+        self.driver = FakeDriver().answer('selectOptions', self._answer)
+        self.select = SelectAction(fake_context(self.driver, 'select_test'))
+
+    def _answer(self, select, with_elements):
+        if not with_elements:
+            return [dict(option) for option in self.options]
+        return [dict(option, element=f'option-{option["value"]}') for option in self.options]
+
+    def test_reads_every_option_in_one_call(self, mock_locator):
+        self.assertEqual(self.options, self.select.get_dropdown_options_details('#country'))
+        self.assertEqual(1, len(self.driver.helper_calls))
+        self.assertFalse(self.driver.helper_calls[0][1][1])
+
+    def test_returns_the_option_elements(self, mock_locator):
+        self.assertEqual(['option-at', 'option-be', 'option-hr'], self.select.get_all_dropdown_options('#country'))
+        self.assertTrue(self.driver.helper_calls[0][1][1])
+
+    def test_returns_the_first_selected_option(self, mock_locator):
+        self.assertEqual('Belgium', self.select.get_dropdown_first_option('#country'))
+
+    def test_raises_when_no_option_is_selected(self, mock_locator):
+        self.options[1]['selected'] = False
+        with self.assertRaises(Exception) as error:
+            self.select.get_dropdown_first_option('#country')
+        self.assertIn('No options are selected', str(error.exception))
+
+    def test_rejects_a_missing_locator(self, mock_locator):
+        with self.assertRaises(ValueError):
+            self.select.get_dropdown_options_details(None)
+        self.assertEqual([], self.driver.helper_calls)
+
+
+class _MultiSelect:
+    """
+    Answers the `selectBulk` helper like a multi-select of the options with the values 'a' to 'e'.
+    """
+
+    def __init__(self, multiple=True):
+        self.multiple = multiple
+        self.selected = set()
+        self.events = 0
+
+    def __call__(self, select, by, is_select, values):
+        if not is_select and not self.multiple:
+            return {'multiple': False, 'unmatched': []}
+        unmatched = [value for value in values if value not in 'abcde']
+        if unmatched:
+            return {'multiple': self.multiple, 'unmatched': unmatched}
+        before = set(self.selected)
+        self.selected = self.selected | set(values) if is_select else self.selected - set(values)
+        self.events += self.selected != before
+        return {'multiple': self.multiple, 'unmatched': []}
+
+
+@mock.patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+class BulkSelectTest(TestCase):
+
+    def setUp(self):
+        self.dropdown = _MultiSelect()
+        self.driver = FakeDriver().answer('selectBulk', self.dropdown)
+        self.select = SelectAction(fake_context(self.driver, 'select_test'))
+
+    def test_selects_all_values_in_one_call(self, mock_locator):
+        self.select.select_dropdown('#letters', SelectMethod.VALUE, True, ['a', 'c', 'e'], bulk=True)
+        self.assertEqual({'a', 'c', 'e'}, self.dropdown.selected)
+        self.assertEqual([('selectBulk', [mock_locator.return_value.get_element.return_value, 'VALUE', True,
+                                          ['a', 'c', 'e']])], self.driver.helper_calls)
+
+    def test_deselects_values(self, mock_locator):
+        self.dropdown.selected = {'a', 'b', 'c'}
+        self.select.select_dropdown('#letters', SelectMethod.VALUE, False, ['a', 'c'], bulk=True)
+        self.assertEqual({'b'}, self.dropdown.selected)
+        self.assertEqual(1, self.dropdown.events)
+
+    def test_indices_are_sent_as_strings(self, mock_locator):
+        self.driver.answer('selectBulk', {'multiple': True, 'unmatched': []})
+        self.select.select_dropdown('#letters', SelectMethod.INDEX, True, [1, 2], bulk=True)
+        self.assertEqual(['1', '2'], self.driver.helper_calls[0][1][3])
+
+    def test_raises_naming_the_unmatched_values(self, mock_locator):
+        with self.assertRaises(Exception) as error:
+            self.select.select_dropdown('#letters', SelectMethod.VALUE, True, ['a', 'x', 'y'], bulk=True)
+        self.assertIn("['x', 'y'] did not match any option", str(error.exception))
+        self.assertEqual(set(), self.dropdown.selected)
+
+    def test_only_multi_selects_can_be_deselected(self, mock_locator):
+        self.dropdown.multiple = False
+        with self.assertRaises(Exception) as error:
+            self.select.select_dropdown('#letters', SelectMethod.VALUE, False, ['a'], bulk=True)
+        self.assertIn('multi-select', str(error.exception))
+
+
+class _Checkboxes:
+    """
+    Answers the `checkboxStates` helper like a page whose checkboxes with the given ids appear after `delay` polls.
+    """
+
+    def __init__(self, checked, delay=0):
+        self.elements = {name: mock.MagicMock(name=name) for name in checked}
+        for name, element in self.elements.items():
+            element.click.side_effect = lambda name=name: self.checked.__setitem__(name, not self.checked[name])
+        self.checked = dict(checked)
+        self.delay = delay
+
+    def __call__(self, queries):
+        self.delay -= 1
+        elements = [self.elements.get(value) if self.delay < 0 else None for by, value in queries]
+        return {'elements': elements,
+                'states': [None if element is None else self.checked[by_value[1]]
+                           for element, by_value in zip(elements, queries)]}
+
+
+class SetCheckboxesTest(TestCase):
+
+    def _select(self, page):
+        return SelectAction(fake_context(FakeDriver().answer('checkboxStates', page), 'select_test'))
+
+    def test_clicks_only_the_checkboxes_in_another_state(self):
+        page = _Checkboxes({'read': True, 'write': True, 'admin': False})
+        self._select(page).set_checkboxes({'#read': True, '#write': False, '#admin': True})
+        self.assertEqual({'read': True, 'write': False, 'admin': True}, page.checked)
+        page.elements['read'].click.assert_not_called()
+
+    def test_waits_for_all_checkboxes_to_be_present(self):
+        page = _Checkboxes({'read': False}, delay=2)
+        self._select(page).set_checkboxes({'#read': True}, timeout=5)
+        self.assertTrue(page.checked['read'])
+
+    def test_times_out_when_a_checkbox_is_missing(self):
+        page = _Checkboxes({'read': False})
+        with self.assertRaises(Exception) as error:
+            self._select(page).set_checkboxes({'#read': True, '#missing': True}, timeout=0.3)
+        self.assertIn('waiting for the checkboxes', str(error.exception))
+        page.elements['read'].click.assert_not_called()
+
+    def test_rejects_empty_states(self):
+        with self.assertRaises(ValueError):
+            self._select(_Checkboxes({})).set_checkboxes({})
@@ -0,0 +1,92 @@
+import logging
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from ui_automation_core.helpers.actions.action import Actions
+from ui_automation_core.helpers.actions.mouse_action import ClickMethod, MouseAction
+from ui_automation_core.helpers.web_element.stale_retry import StaleElementRetry
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class StaleElementRetryTest(TestCase):
+
+    def setUp(self):
+        self.context = SimpleNamespace(logger=logging.getLogger('stale_retry_test'))
+        StaleElementRetry.reset()
+        self.addCleanup(StaleElementRetry.reset)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_re_resolves_stale_element_with_short_wait(self, mock_locator):
+        stale, fresh = MagicMock(), MagicMock()
+        stale.click.side_effect = StaleElementReferenceException('stale')
+        mock_locator.return_value.get_element.side_effect = [stale, fresh]
+        StaleElementRetry(self.context).run('#submit', lambda element: element.click(), timeout=20)
+
+        fresh.click.assert_called_once()
+        retry_timeout = mock_locator.return_value.get_element.call_args_list[1][0][3]
+        self.assertEqual(StaleElementRetry.retry_wait, retry_timeout)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_raises_after_max_attempts(self, mock_locator):
+        stale = MagicMock()
+        stale.click.side_effect = StaleElementReferenceException('stale')
+        mock_locator.return_value.get_element.return_value = stale
+
+        with self.assertRaises(StaleElementReferenceException):
+            StaleElementRetry(self.context).run('#submit', lambda element: element.click())
+        self.assertEqual(StaleElementRetry.max_attempts, stale.click.call_count)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_run_all_re_resolves_every_element_within_one_retry_scope(self, mock_locator):
+        source, target = MagicMock(), MagicMock()
+        mock_locator.return_value.get_element.return_value = source
+        action = MagicMock(side_effect=StaleElementReferenceException('stale'))
+
+        with self.assertRaises(StaleElementReferenceException):
+            StaleElementRetry(self.context).run_all(['#source', '#target'], action)
+        self.assertEqual(StaleElementRetry.max_attempts, action.call_count)
+        self.assertEqual(2 * StaleElementRetry.max_attempts, mock_locator.return_value.get_element.call_count)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_run_all_passes_web_elements_through(self, mock_locator):
+        target = MagicMock()
+        mock_locator.return_value.get_element.return_value = target
+        source = WebElement(SimpleNamespace(session_id='s'), 'source')
+
+        result = StaleElementRetry(self.context).run_all([source, '#target'], lambda src, trg: (src, trg))
+        self.assertEqual((source, target), result)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_javascript_click_re_resolves_stale_element(self, mock_locator):
+        stale, fresh = MagicMock(), MagicMock()
+        mock_locator.return_value.get_element.side_effect = [stale, fresh]
+
+        def click(element):
+            if element is stale:
+                raise StaleElementReferenceException('stale')
+
+        driver = FakeDriver().answer('click', click)
+        mouse_action = MouseAction(fake_context(driver, 'stale_retry_test'))
+        mouse_action.click_web_element('#submit', ClickMethod.JAVA_SCRIPT_CLICK)
+        self.assertEqual([('click', [stale]), ('click', [fresh])], driver.helper_calls)
+
+    @patch('ui_automation_core.helpers.web_element.stale_retry.Locator')
+    def test_retries_are_counted_across_actions(self, mock_locator):
+        stale_button, button, stale_field, field = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        stale_button.click.side_effect = StaleElementReferenceException('stale')
+        stale_field.send_keys.side_effect = StaleElementReferenceException('stale')
+        mock_locator.return_value.get_element.side_effect = [stale_button, button, stale_field, field]
+        context = fake_context(FakeDriver(), 'stale_retry_test')
+
+        with self.assertLogs('stale_retry_test', 'WARNING') as logs:
+            MouseAction(context).click_web_element('#submit')
+            self.assertEqual(1, StaleElementRetry.retry_total())
+            Actions(context).set_text('#name', 'Jane')
+        self.assertEqual(2, StaleElementRetry.retry_total())
+        self.assertIn('2 stale re-resolutions so far', logs.output[-1])
+        button.click.assert_called_once()
+        field.send_keys.assert_called_once_with('Jane')
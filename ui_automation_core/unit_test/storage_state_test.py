@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from ui_automation_core.helpers.browser.storage_state import StorageState
+from ui_automation_core.unit_test.fakes import FakeDriver, fake_context
+
+
+class _FakeBrowser(FakeDriver):
+    """
+    Keeps cookies and storage of a single origin and answers the storage helpers.
+    """
+
+    def __init__(self, url):
+        super().__init__(url)
+        self.local = {}
+        self.session = {}
+        self.answer('storageSnapshot', lambda: {'origin': 'https://app.example.com', 'local': dict(self.local),
+                                                'session': dict(self.session)})
+        self.answer('storageRestore', self._restore)
+
+    def _restore(self, local, session):
+        self.local.update(local)
+        self.session.update(session)
+
+    @property
+    def refreshed(self):
+        return 'refresh' in self.visited
+
+
+class StorageStateTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _state(self, browser):
+        return StorageState(fake_context(browser, 'storage_state_test'), self.tmp_dir.name)
+
+    def test_saved_state_is_restored_in_a_new_browser(self):
+        browser = _FakeBrowser('https://app.example.com/dashboard')
+        browser.cookies = [{'name': 'session_id', 'value': 's3cr3t', 'domain': 'app.example.com'},
+                           {'name': 'sso', 'value': 'x', 'domain': 'login.other.com'}]
+        browser.local = {'token': 'abc'}
+        browser.session = {'tab': '1'}
+        self._state(browser).save('alice', 'admin')
+        self.assertEqual(0o600, os.stat(self._state(browser).path_for('alice', 'admin')).st_mode & 0o777)
+
+        fresh = _FakeBrowser('about:blank')
+        self.assertTrue(self._state(fresh).restore('alice', 'admin'))
+        self.assertEqual('https://app.example.com/', fresh.current_url)
+        self.assertEqual(['session_id'], [cookie['name'] for cookie in fresh.cookies])
+        self.assertEqual({'token': 'abc'}, fresh.local)
+        self.assertEqual({'tab': '1'}, fresh.session)
+        self.assertTrue(fresh.refreshed)
+
+    def test_secrets_are_not_logged(self):
+        browser = _FakeBrowser('https://app.example.com/dashboard')
+        browser.cookies = [{'name': 'session_id', 'value': 's3cr3t', 'domain': 'app.example.com'}]
+        browser.local = {'token': 't0k3n'}
+        with self.assertLogs('storage_state_test', 'DEBUG') as logs:
+            self._state(browser).save('alice', 'admin')
+            self._state(_FakeBrowser('about:blank')).restore('alice', 'admin')
+        self.assertFalse([line for line in logs.output if 's3cr3t' in line or 't0k3n' in line])
+
+    def test_state_expires_with_the_auth_cookie(self):
+        browser = _FakeBrowser('https://app.example.com/')
+        browser.cookies = [{'name': 'session_id', 'value': 's', 'domain': 'app.example.com',
+                            'expiry': int(time.time()) - 1}]
+        state = self._state(browser)
+        state.save('bob', 'viewer', auth_cookie='session_id')
+        self.assertFalse(state.restore('bob', 'viewer'))
+        self.assertFalse(os.path.exists(state.path_for('bob', 'viewer')))
+
+    def test_missing_state_is_not_restored(self):
+        self.assertFalse(self._state(_FakeBrowser('about:blank')).restore('nobody', 'guest'))
@@ -36,9 +36,14 @@ class LogUtils:
             logging.root.removeHandler(handler)
 
     def setup_logging(self, log_file: str):
-        """Use the LOG_SETTINGS defined above and initialize the logger
+        """Use the LOG_SETTINGS defined above and initialize the logger.
+        In a worker of the ParallelRunner the worker id is added to the file name, e.g. test_worker_3.log
         :return: None
         """
+        worker_id = os.environ.get('UIAC_WORKER_ID')
+        if worker_id is not None:
+            name, extension = os.path.splitext(log_file)
+            log_file = f'{name}_worker_{worker_id}{extension}'
         self.log_file = self.log_dir + log_file
         self.create_log_directory()
         self.remove_handlers()
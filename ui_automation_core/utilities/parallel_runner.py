@@ -0,0 +1,354 @@
+import argparse
+import glob
+import heapq
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+from ui_automation_core.helpers.browser.page_metrics import SAMPLES_DIR_ENV, PageMetrics
+
+# Environment variable telling a behave worker process its id, see LogUtils.setup_logging
+WORKER_ID_ENV = 'UIAC_WORKER_ID'
+
+_SCENARIO_REGEX = re.compile(r'^\s*(Scenario|Example):')
+_OUTLINE_REGEX = re.compile(r'^\s*(Scenario Outline|Scenario Template):')
+_EXAMPLES_REGEX = re.compile(r'^\s*(Examples|Scenarios):')
+_SECTION_REGEX = re.compile(r'^\s*(Feature|Rule|Background):')
+
+
+def _scenario_lines(lines):
+    """
+    Yields the line numbers behave runs a single scenario by: the scenario lines and, for scenario outlines, the
+    line of each examples row, as the outline line would run the wrong scenario.
+    """
+    in_outline = False
+    table_line = None
+    for line_number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if _SCENARIO_REGEX.match(line):
+            in_outline = False
+            table_line = None
+            yield line_number
+        elif _OUTLINE_REGEX.match(line) or _SECTION_REGEX.match(line):
+            in_outline = bool(_OUTLINE_REGEX.match(line))
+            table_line = None
+        elif in_outline and _EXAMPLES_REGEX.match(line):
+            table_line = 0
+        elif table_line is not None and stripped.startswith('|'):
+            # The first row of an examples table is its header
+            if table_line:
+                yield line_number
+            table_line += 1
+        elif table_line and stripped and not stripped.startswith(('#', '@')):
+            table_line = None
+
+
+def _normalize_location(location):
+    # Items and behave result locations are compared as paths relative to the working directory
+    path, separator, line = location.rpartition(':')
+    if not separator or not line.isdigit():
+        return os.path.relpath(location)
+    return f'{os.path.relpath(path)}:{line}'
+
+
+class DurationStore:
+    """
+    Keeps the last measured duration in seconds of each feature file or scenario (path:line) in a local
+    JSON file, used to balance the shards of the next runs.
+    """
+    default_path = '.ui_automation/durations.json'
+
+    def __init__(self, path=None):
+        self.path = self.default_path if path is None else path
+        self.durations = {}
+        if os.path.isfile(self.path):
+            with open(self.path, 'r') as f:
+                self.durations = json.load(f)
+
+    def get(self, item, default):
+        return self.durations.get(item, default)
+
+    def update(self, durations):
+        self.durations.update(durations)
+
+    def save(self):
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.durations, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ParallelRunner:
+    """
+    Runs behave feature files or scenarios across worker processes. Each worker is a separate behave
+    process, so it launches its own driver, and gets its worker id in the UIAC_WORKER_ID environment variable
+    so that LogUtils writes to a log file of its own. Items are assigned longest first to the least loaded
+    worker using the durations of the previous runs. At the end the behave JSON results are merged into
+    <results_dir>/behave.json and the allure results of all workers into <results_dir>/allure-results.
+    Page metrics the workers recorded with PageMetrics are aggregated into <results_dir>/page_metrics.json,
+    exceeding one of the `metrics_thresholds` fails the run. An item without a result in the merged behave JSON
+    also fails the run.
+
+    USAGE: python -m ui_automation_core.utilities.parallel_runner features --workers 8 --shard scenario \
+               -- --tags @smoke
+    """
+    # Duration assumed for items that never ran, if no item has a known duration
+    default_duration = 10.0
+
+    def __init__(self, paths, workers=None, shard='feature', results_dir='reports/parallel', durations=None,
+                 behave_args=None, allure=True, metrics_thresholds=None, logger=None, metrics_samples_dir=None):
+        """
+        :param paths: feature files or directories holding them.
+        :param workers: number of worker processes. If None, the number of CPUs.
+        :param shard: 'feature' to distribute feature files, 'scenario' to distribute single scenarios.
+        :param results_dir: directory of the worker outputs and the merged results.
+        :param durations: DurationStore. If None, the default store is used.
+        :param behave_args: extra behave command line arguments, e.g. ['--tags', '@smoke'].
+        :param allure: False to not write allure results.
+        :param metrics_thresholds: page metric thresholds, see PageMetrics.check_thresholds.
+        :param logger: logger of the progress. If None, the logger of this module is used.
+        :param metrics_samples_dir: directory of the page metric samples of the workers, passed to them in the
+                UIAC_PAGE_METRICS_DIR environment variable. If None, `samples_dir` of PageMetrics is used.
+        """
+        if shard not in ('feature', 'scenario'):
+            raise ValueError(f'Unsupported shard mode `{shard}`, use `feature` or `scenario`.')
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.workers = workers or os.cpu_count() or 1
+        self.shard = shard
+        self.results_dir = results_dir
+        self.durations = DurationStore() if durations is None else durations
+        self.behave_args = list(behave_args or [])
+        self.allure = allure
+        self.metrics_thresholds = metrics_thresholds
+        self.logger = logging.getLogger(__name__) if logger is None else logger
+        self.metrics_samples_dir = PageMetrics.samples_dir if metrics_samples_dir is None else metrics_samples_dir
+
+    def discover(self):
+        """
+        Returns the feature files, or the scenarios as path:line, found under the paths. Scenario outlines are
+        returned as one path:line per examples row.
+        """
+        feature_files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                feature_files.extend(sorted(glob.glob(os.path.join(path, '**', '*.feature'), recursive=True)))
+            else:
+                feature_files.append(path)
+        feature_files = [os.path.relpath(feature_file) for feature_file in feature_files]
+        if self.shard == 'feature':
+            return feature_files
+        scenarios = []
+        for feature_file in feature_files:
+            with open(feature_file, 'r', encoding='utf-8') as f:
+                scenarios.extend(f'{feature_file}:{line_number}' for line_number in _scenario_lines(f))
+        return scenarios
+
+    def plan(self, items):
+        """
+        Splits the items into shards of about equal expected duration.
+
+        :param items: feature files or scenarios.
+        :return: list of shards, each a list of items
+        """
+        known = sorted(duration for duration in (self.durations.get(item, None) for item in items)
+                       if duration is not None)
+        fallback = known[len(known) // 2] if known else self.default_duration
+        expected = sorted(((self.durations.get(item, fallback), item) for item in items), reverse=True)
+        shard_count = max(1, min(self.workers, len(items)))
+        heap = [(0.0, index) for index in range(shard_count)]
+        shards = [[] for _ in range(shard_count)]
+        for duration, item in expected:
+            load, index = heapq.heappop(heap)
+            shards[index].append(item)
+            heapq.heappush(heap, (load + duration, index))
+        return shards
+
+    def _worker_command(self, worker_id, items):
+        worker_dir = os.path.join(self.results_dir, f'worker_{worker_id}')
+        command = [sys.executable, '-m', 'behave', '--no-capture', '--format', 'json.pretty',
+                   '--outfile', os.path.join(worker_dir, 'behave.json')]
+        if self.allure:
+            command += ['--format', 'allure_behave.formatter:AllureFormatter',
+                        '--outfile', os.path.join(worker_dir, 'allure-results')]
+        # Formats without an outfile write to stdout, they must come after the ones with an outfile
+        return command + ['--format', 'progress'] + self.behave_args + items
+
+    def run(self):
+        """
+        Runs all the shards in parallel and merges their results.
+
+        :return: A dictionary with the keys passed, elapsed, missing (the items without a result) and workers,
+         a list of dictionaries with the keys worker, items, returncode, elapsed and output (path of the console
+         output of the worker)
+        """
+        start = time.monotonic()
+        shards = self.plan(self.discover())
+        if os.path.isdir(self.results_dir):
+            shutil.rmtree(self.results_dir)
+        if os.path.isdir(self.metrics_samples_dir):
+            shutil.rmtree(self.metrics_samples_dir)
+        processes = []
+        for worker_id, items in enumerate(shards):
+            if not items:
+                continue
+            worker_dir = os.path.join(self.results_dir, f'worker_{worker_id}')
+            os.makedirs(worker_dir)
+            output_path = os.path.join(worker_dir, 'output.txt')
+            output = open(output_path, 'w')
+            env = dict(os.environ, **{WORKER_ID_ENV: str(worker_id), SAMPLES_DIR_ENV: self.metrics_samples_dir})
+            process = subprocess.Popen(self._worker_command(worker_id, items), stdout=output,
+                                       stderr=subprocess.STDOUT, env=env)
+            processes.append((worker_id, items, process, output, output_path, time.monotonic()))
+            self.logger.info(f'Started worker {worker_id} with {len(items)} items.')
+
+        workers = []
+        while processes:
+            for running in list(processes):
+                worker_id, items, process, output, output_path, started = running
+                returncode = process.poll()
+                if returncode is None:
+                    continue
+                processes.remove(running)
+                output.close()
+                workers.append({'worker': worker_id, 'items': items, 'returncode': returncode,
+                                'elapsed': round(time.monotonic() - started, 3), 'output': output_path})
+                self.logger.info(f'Worker {worker_id} finished with exit code {returncode} '
+                                 f'in {workers[-1]["elapsed"]} seconds.')
+            if processes:
+                time.sleep(0.1)
+        workers.sort(key=lambda worker: worker['worker'])
+
+        missing = self.merge_results(workers)
+        report = {'passed': not missing and all(worker['returncode'] == 0 for worker in workers),
+                  'elapsed': round(time.monotonic() - start, 3), 'workers': workers, 'missing': missing}
+        if missing:
+            self.logger.error(f'{len(missing)} items have no result in the merged behave results: {missing}')
+        if PageMetrics.load_samples(self.metrics_samples_dir) or self.metrics_thresholds:
+            metrics = PageMetrics.write_report(self.metrics_samples_dir,
+                                               os.path.join(self.results_dir, 'page_metrics.json'),
+                                               self.metrics_thresholds)
+            report['page_metrics_passed'] = metrics['passed']
+            report['passed'] = report['passed'] and metrics['passed']
+            for violation in metrics['violations']:
+                self.logger.error(f'Page metric {violation["metric"]} {violation["statistic"]} of '
+                                  f'{violation["page"]} is {violation["value"]}, above the threshold of '
+                                  f'{violation["threshold"]}.')
+        with open(os.path.join(self.results_dir, 'summary.json'), 'w') as f:
+            json.dump(report, f, indent=1)
+        return report
+
+    def merge_results(self, workers):
+        """
+        Merges the behave JSON and allure results of the workers and records the measured durations.
+        With scenario sharding, the scenarios a worker skipped because they were assigned to another worker
+        are left out.
+
+        :param workers: dictionaries with the keys worker (id) and items of the workers that ran.
+        :return: the items of the workers that have no result in the merged behave JSON
+        """
+        features = []
+        allure_dir = os.path.join(self.results_dir, 'allure-results')
+        for worker in workers:
+            worker_dir = os.path.join(self.results_dir, f'worker_{worker["worker"]}')
+            json_path = os.path.join(worker_dir, 'behave.json')
+            if os.path.isfile(json_path) and os.path.getsize(json_path):
+                with open(json_path, 'r') as f:
+                    worker_features = json.load(f)
+                if self.shard == 'scenario':
+                    items = {_normalize_location(item) for item in worker['items']}
+                    for feature in worker_features:
+                        feature['elements'] = [element for element in feature.get('elements', [])
+                                               if element.get('type') != 'scenario'
+                                               or _normalize_location(element['location']) in items]
+                features.extend(feature for feature in worker_features if feature.get('elements'))
+            worker_allure_dir = os.path.join(worker_dir, 'allure-results')
+            if os.path.isdir(worker_allure_dir):
+                shutil.copytree(worker_allure_dir, allure_dir, dirs_exist_ok=True)
+        if self.shard == 'scenario' and os.path.isdir(allure_dir):
+            self._drop_duplicate_skipped_allure_results(allure_dir)
+        with open(os.path.join(self.results_dir, 'behave.json'), 'w') as f:
+            json.dump(features, f, indent=1)
+        self.durations.update(self.measured_durations(features))
+        self.durations.save()
+        return self.missing_items([item for worker in workers for item in worker['items']], features)
+
+    def missing_items(self, items, features):
+        """
+        Returns the items that have no feature or scenario in the behave JSON results.
+        """
+        if self.shard == 'scenario':
+            found = {_normalize_location(element['location'])
+                     for feature in features for element in feature.get('elements', [])
+                     if element.get('type') == 'scenario'}
+        else:
+            found = {_normalize_location(feature['location']).rsplit(':', 1)[0] for feature in features}
+        return [item for item in items if _normalize_location(item) not in found]
+
+    @staticmethod
+    def _drop_duplicate_skipped_allure_results(allure_dir):
+        # Each worker reports the scenarios of its feature files assigned to other workers as skipped
+        results = []
+        for result_path in glob.glob(os.path.join(allure_dir, '*-result.json')):
+            with open(result_path, 'r') as f:
+                result = json.load(f)
+            results.append((result_path, result.get('fullName'), result.get('status')))
+        executed = {full_name for _, full_name, status in results if status != 'skipped'}
+        for result_path, full_name, status in results:
+            if status == 'skipped' and full_name in executed:
+                os.remove(result_path)
+
+    def measured_durations(self, features):
+        """
+        Returns the duration of each feature file or scenario (path:line) from behave JSON results.
+        """
+        durations = {}
+        for feature in features:
+            feature_file = _normalize_location(feature['location']).rsplit(':', 1)[0]
+            for element in feature.get('elements', []):
+                if element.get('type') != 'scenario':
+                    continue
+                duration = sum(step.get('result', {}).get('duration', 0) for step in element.get('steps', []))
+                key = _normalize_location(element['location']) if self.shard == 'scenario' else feature_file
+                durations[key] = durations.get(key, 0) + duration
+        return {key: round(duration, 3) for key, duration in durations.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Runs behave features across worker processes.')
+    parser.add_argument('paths', nargs='*', default=['features'], help='feature files or directories')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--shard', choices=('feature', 'scenario'), default='feature')
+    parser.add_argument('--results-dir', default='reports/parallel')
+    parser.add_argument('--durations', default=DurationStore.default_path, help='durations file')
+    parser.add_argument('--no-allure', action='store_true', help='do not write allure results')
+    parser.add_argument('--metrics-samples-dir', default=None,
+                        help='directory of the page metric samples of the workers')
+    parser.add_argument('--metrics-thresholds', default=None,
+                        help='JSON file of page metric thresholds, e.g. {"lcp": 2500, "ttfb.p50": 400}')
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Arguments after `--` are passed to behave, e.g. -- --tags @smoke
+    behave_args = argv[argv.index('--') + 1:] if '--' in argv else []
+    args = parser.parse_args(argv[:argv.index('--')] if '--' in argv else argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    metrics_thresholds = None
+    if args.metrics_thresholds:
+        with open(args.metrics_thresholds, 'r') as f:
+            metrics_thresholds = json.load(f)
+    report = ParallelRunner(args.paths, args.workers, args.shard, args.results_dir, DurationStore(args.durations),
+                            behave_args, not args.no_allure, metrics_thresholds,
+                            metrics_samples_dir=args.metrics_samples_dir).run()
+    logging.getLogger(__name__).info(f'Finished {len(report["workers"])} workers in {report["elapsed"]} seconds, '
+                                     f'{"all passed" if report["passed"] else "some failed"}.')
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())